@@ -8,15 +8,18 @@ Architecture:
   - JSON file persistence (Railway: ephemeral → PostgreSQL migration path)
   - IIN (Income Increase Neutralization) automation engine
 
-Deploy: Railway with gunicorn
-  gunicorn "app:create_app()" --bind 0.0.0.0:$PORT --workers 2
+Deploy: Railway with gunicorn (threaded workers, see gunicorn.conf.py)
+  gunicorn -c gunicorn.conf.py "app:create_app()"
 """
 
+import asyncio
 import json
 import os
-from collections import defaultdict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, partial, wraps
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -31,35 +34,72 @@ DEV_MODE = os.getenv("DEV_MODE", "true").lower() == "true"
 AUTOMATION_MODE = os.getenv("AUTOMATION_MODE", "manual")
 ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY", "")
 FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID", "money-planner-ca2c0")
+PLAID_IO_THREADS = int(os.getenv("PLAID_IO_THREADS", "16"))
+# Larger uploads are imported by a background job rather than in the request
+# (when a job worker is running; see offload() in create_app)
+IMPORT_INLINE_MAX_BYTES = int(os.getenv("IMPORT_INLINE_MAX_BYTES", str(2 * 1024 * 1024)))
+# Users whose transaction store is larger get their exports from a background job
+# (when a job worker is running)
+EXPORT_INLINE_MAX_BYTES = int(os.getenv("EXPORT_INLINE_MAX_BYTES", str(8 * 1024 * 1024)))
+ADMIN_USER_IDS = {u for u in os.getenv("ADMIN_USER_IDS", "").split(",") if u}
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")  # If set, /metrics requires it as a Bearer token
+
+
+def is_admin(user_id: str) -> bool:
+    """Admin endpoints and X-Profile are open to everyone in DEV_MODE."""
+    return DEV_MODE or user_id in ADMIN_USER_IDS
 
 APP_DIR = Path(__file__).parent
-DATA_DIR = APP_DIR / "data"
+DATA_DIR = Path(os.getenv("DATA_DIR", APP_DIR / "data"))
 DATA_DIR.mkdir(exist_ok=True)
 
 # --- Plaid Client ---
-import plaid
-from plaid.api import plaid_api
-from plaid.model.link_token_create_request import LinkTokenCreateRequest
-from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
-from plaid.model.item_public_token_exchange_request import (
-    ItemPublicTokenExchangeRequest,
-)
-from plaid.model.transactions_sync_request import TransactionsSyncRequest
-from plaid.model.accounts_get_request import AccountsGetRequest
-from plaid.model.country_code import CountryCode
-from plaid.model.products import Products
-
-env_map = {
-    "sandbox": plaid.Environment.Sandbox,
-    "production": plaid.Environment.Production,
-}
-
-configuration = plaid.Configuration(
-    host=env_map.get(PLAID_ENV, plaid.Environment.Sandbox),
-    api_key={"clientId": PLAID_CLIENT_ID, "secret": PLAID_SECRET},
-)
-api_client = plaid.ApiClient(configuration)
-plaid_client = plaid_api.PlaidApi(api_client)
+# Heavy SDKs (plaid's generated model tree, firebase_admin, cryptography) load
+# on first use so cold starts stay fast. Under gunicorn --preload the master
+# calls preload_heavy_modules() once and forked workers share the pages.
+
+plaid_client = None
+_plaid_lock = threading.Lock()
+
+
+def get_plaid_client():
+    """Build the Plaid client on first use."""
+    global plaid_client
+    if plaid_client is None:
+        with _plaid_lock:
+            if plaid_client is None:
+                import plaid
+                from plaid.api import plaid_api
+
+                env_map = {
+                    "sandbox": plaid.Environment.Sandbox,
+                    "production": plaid.Environment.Production,
+                }
+                configuration = plaid.Configuration(
+                    host=env_map.get(PLAID_ENV, plaid.Environment.Sandbox),
+                    api_key={"clientId": PLAID_CLIENT_ID, "secret": PLAID_SECRET},
+                )
+                plaid_client = plaid_api.PlaidApi(plaid.ApiClient(configuration))
+    return plaid_client
+
+
+def plaid_call(operation: str, req):
+    """Call a Plaid API method by name, recording its latency."""
+    with metrics.plaid_timer(operation):
+        return getattr(get_plaid_client(), operation)(req)
+
+
+def preload_heavy_modules():
+    """Import the lazily loaded SDKs up front (gunicorn master, before fork)."""
+    import plaid.api.plaid_api  # noqa: F401
+    import plaid.model.accounts_get_request  # noqa: F401
+    import plaid.model.item_public_token_exchange_request  # noqa: F401
+    import plaid.model.item_remove_request  # noqa: F401
+    import plaid.model.link_token_create_request  # noqa: F401
+    import plaid.model.transactions_sync_request  # noqa: F401
+    import cryptography.fernet  # noqa: F401
+    from firebase_admin import auth  # noqa: F401
+
 
 # --- Category mapping ---
 from services.categories import (
@@ -68,25 +108,38 @@ from services.categories import (
     BUDGET_ENVELOPES,
     map_category,
 )
+from services import jobs, metrics, profiling
+from services.persistence import bump_version, collection_path, locked, read_json, write_json
+from services.token_cache import (
+    ExpiredTokenError,
+    InvalidTokenError,
+    RevokedTokenError,
+    TokenVerifier,
+)
 
 # --- Firebase Admin SDK ---
-import firebase_admin
-from firebase_admin import credentials, auth as firebase_auth
 
 _firebase_initialized = False
+# Verifies ID tokens with a claims cache; None when Firebase isn't configured
+# (DEV_MODE), in which case requests fall back to the dev user.
+token_verifier = None
 
 
 def init_firebase():
-    global _firebase_initialized
+    global _firebase_initialized, token_verifier
     if _firebase_initialized:
         return
 
     # Option 1: JSON string (Railway env var)
     json_str = os.getenv("FIREBASE_SERVICE_ACCOUNT_JSON")
     if json_str:
+        import firebase_admin
+        from firebase_admin import credentials
+
         cred_dict = json.loads(json_str)
         cred = credentials.Certificate(cred_dict)
         firebase_admin.initialize_app(cred, {"projectId": FIREBASE_PROJECT_ID})
+        token_verifier = TokenVerifier(FIREBASE_PROJECT_ID)
         _firebase_initialized = True
         return
 
@@ -94,8 +147,12 @@ def init_firebase():
     key_path = os.getenv("FIREBASE_SERVICE_ACCOUNT", "config/firebase-service-account.json")
     full_path = APP_DIR / key_path
     if full_path.exists():
+        import firebase_admin
+        from firebase_admin import credentials
+
         cred = credentials.Certificate(str(full_path))
         firebase_admin.initialize_app(cred, {"projectId": FIREBASE_PROJECT_ID})
+        token_verifier = TokenVerifier(FIREBASE_PROJECT_ID)
         _firebase_initialized = True
         return
 
@@ -109,12 +166,14 @@ def init_firebase():
 
 
 # --- Encryption (for Plaid access tokens at rest) ---
-from cryptography.fernet import Fernet
 import base64
 import hashlib
 
 
-def _get_fernet() -> Fernet:
+@lru_cache(maxsize=1)
+def _get_fernet() -> "Fernet":
+    from cryptography.fernet import Fernet
+
     if not ENCRYPTION_KEY:
         # Dev fallback — NOT SECURE for production
         key = base64.urlsafe_b64encode(b"dev-key-not-secure-0000000000000000"[:32])
@@ -136,41 +195,37 @@ def decrypt(ciphertext: str) -> str:
 # --- Plaid Token/Transaction Storage (per-user) ---
 
 def _tokens_file(user_id: str) -> Path:
-    d = DATA_DIR / user_id
-    d.mkdir(exist_ok=True)
-    return d / "tokens.json"
+    return collection_path(user_id, "tokens")
 
 
 def _txn_file(user_id: str) -> Path:
-    d = DATA_DIR / user_id
-    d.mkdir(exist_ok=True)
-    return d / "transactions.json"
+    return collection_path(user_id, "transactions")
 
 
 def load_tokens(user_id: str) -> dict:
     f = _tokens_file(user_id)
     if f.exists():
-        return json.loads(f.read_text())
+        return read_json(f)
     return {}
 
 
 def save_tokens(tokens: dict, user_id: str):
     f = _tokens_file(user_id)
-    f.write_text(json.dumps(tokens, indent=2))
-    os.chmod(f, 0o600)
+    write_json(f, tokens)
+    bump_version("tokens", user_id)
 
 
 def load_transactions(user_id: str) -> dict:
     f = _txn_file(user_id)
     if f.exists():
-        return json.loads(f.read_text())
+        return read_json(f)
     return {}
 
 
 def save_transactions(txns: dict, user_id: str):
     f = _txn_file(user_id)
-    f.write_text(json.dumps(txns, indent=2))
-    os.chmod(f, 0o600)
+    write_json(f, txns)
+    bump_version("transactions", user_id)
 
 
 def txn_to_dict(t) -> dict:
@@ -197,75 +252,290 @@ def txn_to_dict(t) -> dict:
 
 # --- Sync ---
 
-def sync_transactions(item_id: str, user_id: str) -> dict:
-    tokens = load_tokens(user_id)
-    if item_id not in tokens:
-        raise ValueError(f"Account {item_id} not found")
-
-    access_token = decrypt(tokens[item_id]["access_token"])
-    cursor = tokens[item_id].get("cursor", "")
+def _fetch_item_changes(access_token: str, cursor: str) -> tuple[list, list, list, str]:
+    """Page through /transactions/sync from cursor (network only, no storage).
 
-    all_txns = load_transactions(user_id)
-    item_txns = all_txns.get(item_id, [])
-    txn_index = {t["transaction_id"]: i for i, t in enumerate(item_txns)}
+    Returns (added, modified, removed_ids, next_cursor).
+    """
+    from plaid.model.transactions_sync_request import TransactionsSyncRequest
 
-    added_count = modified_count = removed_count = 0
+    added, modified, removed = [], [], []
     has_more = True
-
+    pages = 0
     while has_more:
         req = TransactionsSyncRequest(access_token=access_token, cursor=cursor)
-        response = plaid_client.transactions_sync(req)
-
-        for t in response.added:
-            td = txn_to_dict(t)
-            if td["transaction_id"] not in txn_index:
-                item_txns.append(td)
-                txn_index[td["transaction_id"]] = len(item_txns) - 1
-                added_count += 1
-
-        for t in response.modified:
-            td = txn_to_dict(t)
-            if td["transaction_id"] in txn_index:
-                item_txns[txn_index[td["transaction_id"]]] = td
-                modified_count += 1
-
-        for t in response.removed:
-            tid = t.transaction_id
-            if tid in txn_index:
-                item_txns[txn_index[tid]] = None
-                removed_count += 1
-
+        response = plaid_call("transactions_sync", req)
+        added.extend(txn_to_dict(t) for t in response.added)
+        modified.extend(txn_to_dict(t) for t in response.modified)
+        removed.extend(t.transaction_id for t in response.removed)
         cursor = response.next_cursor
         has_more = response.has_more
+        pages += 1
+    metrics.observe_sync(pages, len(added), len(modified), len(removed))
+    return added, modified, removed, cursor
+
+
+def _merge_item_changes(item_txns: list, added: list, modified: list, removed: list) -> tuple[list, dict]:
+    txn_index = {t["transaction_id"]: i for i, t in enumerate(item_txns)}
+    added_count = modified_count = removed_count = 0
+
+    for td in added:
+        if td["transaction_id"] not in txn_index:
+            item_txns.append(td)
+            txn_index[td["transaction_id"]] = len(item_txns) - 1
+            added_count += 1
+
+    for td in modified:
+        if td["transaction_id"] in txn_index:
+            item_txns[txn_index[td["transaction_id"]]] = td
+            modified_count += 1
+
+    for tid in removed:
+        if tid in txn_index:
+            item_txns[txn_index[tid]] = None
+            removed_count += 1
 
     item_txns = [t for t in item_txns if t is not None]
-    all_txns[item_id] = item_txns
-    save_transactions(all_txns, user_id)
+    return item_txns, {"added": added_count, "modified": modified_count, "removed": removed_count}
+
 
-    tokens[item_id]["cursor"] = cursor
-    tokens[item_id]["last_sync"] = datetime.now().isoformat()
-    save_tokens(tokens, user_id)
+def _store_item_changes(user_id: str, fetched: dict) -> dict:
+    """Fold fetched changes for several items into storage: one load/save each.
 
-    return {"added": added_count, "modified": modified_count, "removed": removed_count}
+    `fetched` maps item_id → _fetch_item_changes() result or an Exception.
+    Returns item_id → counts (or the exception).
+    """
+    results = {}
+    # Serialize concurrent syncs for a user; reload tokens under the lock so
+    # items linked or removed while we were fetching aren't overwritten.
+    with locked("transactions", user_id):
+        # Copies: under read_memo() the parses are shared with other readers
+        tokens = dict(load_tokens(user_id))
+        all_txns = dict(load_transactions(user_id))
+        for item_id, changes in fetched.items():
+            if isinstance(changes, Exception):
+                results[item_id] = changes
+                continue
+            if item_id not in tokens:
+                results[item_id] = ValueError(f"Account {item_id} was disconnected")
+                continue
+            added, modified, removed, cursor = changes
+            all_txns[item_id], results[item_id] = _merge_item_changes(
+                all_txns.get(item_id, []), added, modified, removed
+            )
+            tokens[item_id] = {**tokens[item_id], "cursor": cursor, "last_sync": datetime.now().isoformat()}
+        save_transactions(all_txns, user_id)
+        save_tokens(tokens, user_id)
+    return results
+
+
+def _fetch_for_item(tokens: dict, item_id: str):
+    try:
+        access_token = decrypt(tokens[item_id]["access_token"])
+        return _fetch_item_changes(access_token, tokens[item_id].get("cursor", ""))
+    except Exception as e:
+        return e
+
+
+def _sync_summary(tokens: dict, results: dict) -> dict:
+    summary = {}
+    for item_id, result in results.items():
+        institution = tokens[item_id].get("institution_name", item_id)
+        if isinstance(result, Exception):
+            summary[item_id] = {"institution": institution, "error": str(result)}
+        else:
+            summary[item_id] = {"institution": institution, **result}
+    return summary
+
+
+def sync_transactions(item_id: str, user_id: str) -> dict:
+    tokens = load_tokens(user_id)
+    if item_id not in tokens:
+        raise ValueError(f"Account {item_id} not found")
+
+    changes = _fetch_for_item(tokens, item_id)
+    if isinstance(changes, Exception):
+        raise changes
+    return _store_item_changes(user_id, {item_id: changes})[item_id]
 
 
 def sync_all(user_id: str) -> dict:
+    tokens = load_tokens(user_id)
+    fetched = {item_id: _fetch_for_item(tokens, item_id) for item_id in tokens}
+    return _sync_summary(tokens, _store_item_changes(user_id, fetched))
+
+
+# --- Async Plaid path ---
+# Plaid calls are network-bound: async views fan out per item concurrently and
+# push blocking SDK calls and file I/O onto a shared thread pool, so a worker
+# thread waiting on Plaid isn't also serializing its items.
+
+_io_pool: ThreadPoolExecutor | None = None
+_io_pool_lock = threading.Lock()
+
+
+def _io_executor() -> ThreadPoolExecutor:
+    global _io_pool
+    if _io_pool is None:
+        with _io_pool_lock:  # Concurrent first requests must not each start a pool
+            if _io_pool is None:
+                _io_pool = ThreadPoolExecutor(max_workers=PLAID_IO_THREADS, thread_name_prefix="plaid-io")
+    return _io_pool
+
+
+def _reset_io_pool():
+    # A pool inherited over fork has no threads in the child (and the lock
+    # may be held by a parent thread), so the child starts its own
+    global _io_pool, _io_pool_lock
+    _io_pool, _io_pool_lock = None, threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_io_pool)
+
+
+async def _offload(fn, *args):
+    """Run a blocking call (Plaid SDK, file I/O) on the I/O thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_io_executor(), partial(fn, *args))
+
+
+async def sync_all_async(user_id: str) -> dict:
+    tokens = await _offload(load_tokens, user_id)
+    item_ids = list(tokens)
+    fetched = await asyncio.gather(*(_offload(_fetch_for_item, tokens, i) for i in item_ids))
+    results = await _offload(_store_item_changes, user_id, dict(zip(item_ids, fetched)))
+    return _sync_summary(tokens, results)
+
+
+async def sync_transactions_async(item_id: str, user_id: str) -> dict:
+    return await _offload(sync_transactions, item_id, user_id)
+
+
+def _item_accounts(item_id: str, info: dict) -> list[dict]:
+    from plaid.model.accounts_get_request import AccountsGetRequest
+
+    try:
+        access_token = decrypt(info["access_token"])
+        resp = plaid_call("accounts_get", AccountsGetRequest(access_token=access_token))
+        return [{
+            "id": a.account_id,
+            "item_id": item_id,
+            "name": a.name,
+            "type": a.type.value,
+            "subtype": str(a.subtype) if a.subtype else None,
+            "mask": a.mask,
+            "institution_name": info["institution_name"],
+            "current_balance": a.balances.current,
+            "available_balance": a.balances.available,
+        } for a in resp.accounts]
+    except Exception as e:
+        return [{
+            "item_id": item_id,
+            "institution_name": info.get("institution_name", "Unknown"),
+            "error": str(e),
+        }]
+
+
+async def accounts_async(user_id: str) -> list[dict]:
+    tokens = await _offload(load_tokens, user_id)
+    per_item = await asyncio.gather(
+        *(_offload(_item_accounts, item_id, info) for item_id, info in tokens.items())
+    )
+    return [a for accounts in per_item for a in accounts]
+
+
+def disconnect_item(item_id: str, user_id: str) -> bool:
+    """Revoke an item at Plaid and drop its token and transactions. False if unknown."""
+    tokens = load_tokens(user_id)
+    if item_id not in tokens:
+        return False
+
+    try:
+        from plaid.model.item_remove_request import ItemRemoveRequest
+        access_token = decrypt(tokens[item_id]["access_token"])
+        plaid_call("item_remove", ItemRemoveRequest(access_token=access_token))
+    except Exception as e:
+        print(f"Plaid revoke warning: {e}")
+
+    with locked("transactions", user_id):
+        tokens = dict(load_tokens(user_id))
+        tokens.pop(item_id, None)
+        save_tokens(tokens, user_id)
+
+        all_txns = dict(load_transactions(user_id))
+        all_txns.pop(item_id, None)
+        save_transactions(all_txns, user_id)
+    return True
+
+
+# --- Background jobs (run by tools/job_worker.py) ---
+
+@jobs.job_handler("plaid_sync")
+def _sync_job(user_id: str, payload: dict, progress) -> dict:
+    """Sync one item (payload item_id) or all of them, item by item with progress."""
+    if payload.get("item_id"):
+        return {"results": {payload["item_id"]: sync_transactions(payload["item_id"], user_id)}}
+
     tokens = load_tokens(user_id)
     results = {}
-    for item_id, info in tokens.items():
-        institution = info.get("institution_name", item_id)
+    for i, item_id in enumerate(tokens):
+        institution = tokens[item_id].get("institution_name", item_id)
+        progress(i / len(tokens), f"Syncing {institution}")
         try:
-            result = sync_transactions(item_id, user_id)
-            results[item_id] = {"institution": institution, **result}
+            results[item_id] = {"institution": institution, **sync_transactions(item_id, user_id)}
         except Exception as e:
             results[item_id] = {"institution": institution, "error": str(e)}
-    return results
+    if results and all("error" in r for r in results.values()):
+        # Nothing synced — fail the attempt so it's retried
+        raise RuntimeError("; ".join(r["error"] for r in results.values()))
+    return {"results": results}
+
+
+@jobs.job_handler("plaid_disconnect")
+def _disconnect_job(user_id: str, payload: dict, progress) -> dict:
+    if not disconnect_item(payload["item_id"], user_id):
+        raise ValueError(f"Account {payload['item_id']} not found")
+    return {"status": "disconnected"}
+
+
+@jobs.job_handler("weekly_review")
+def _weekly_review_job(user_id: str, payload: dict, progress) -> dict:
+    from services.monitoring_service import generate_weekly_review
+    return generate_weekly_review(user_id, payload.get("week_ending"))
+
+
+@jobs.job_handler("weekly_reviews")
+def _weekly_reviews_job(user_id: str, payload: dict, progress) -> dict:
+    from services.monitoring_service import generate_weekly_reviews
+    return generate_weekly_reviews(week_ending=payload.get("week_ending"))
+
+
+def _delete_upload(payload: dict):
+    Path(payload["path"]).unlink(missing_ok=True)
+
+
+@jobs.job_handler("transactions_import", cleanup=_delete_upload)
+def _import_job(user_id: str, payload: dict, progress) -> dict:
+    """Import an upload saved under DATA_DIR/_imports; it's deleted once the job is finished for good."""
+    from services.transaction_import import import_transactions
+    return import_transactions(user_id, Path(payload["path"]), payload.get("format"),
+                               sign=payload.get("sign", "bank"), progress=progress)
+
+
+@jobs.job_handler("export")
+def _export_job(user_id: str, payload: dict, progress) -> dict:
+    """Write a transactions export to EXPORTS_DIR (served by /api/jobs/<id>/download)."""
+    from services.exports import export_path, write_transactions
+    fmt = payload["format"]
+    path = export_path(fmt)
+    rows = write_transactions(path, fmt, user_id, payload.get("start_date"), payload.get("end_date"),
+                              progress=lambda fraction: progress(fraction, "Exporting transactions"))
+    return {"file": path.name, "format": fmt, "rows": rows}
 
 
 # --- Flask App ---
 
 def create_app():
-    from flask import Flask, jsonify, request
+    from flask import Flask, g, jsonify, make_response, request, send_file
     from flask_cors import CORS
 
     app = Flask(__name__)
@@ -277,53 +547,234 @@ def create_app():
 
     # Initialize Firebase on startup
     init_firebase()
+    if token_verifier is not None:
+        token_verifier.start()  # Prefetch signing certs
+
+    # --- Request metrics ---
+
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.pop("request_start", None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            metrics.observe_request(
+                request.method, route, response.status_code, time.perf_counter() - start
+            )
+        if g.get("profile_id"):
+            response.headers["X-Profile-Id"] = g.profile_id
+        return response
 
     # --- Auth Middleware ---
 
-    def verify_firebase_token_or_dev(f):
-        """Verify Firebase ID token. In DEV_MODE, fall back to 'user-1'."""
+    def verify_firebase_token_or_dev(f=None, *, check_revoked=False):
+        """Verify Firebase ID token. In DEV_MODE, fall back to 'user-1'.
+
+        Claims are cached until the token expires (services.token_cache). Use
+        @verify_firebase_token_or_dev(check_revoked=True) on routes where a
+        revoked session must be refused immediately; those skip the cache and
+        ask Firebase. Works for sync and async views (via ensure_sync).
+        """
+        if f is None:
+            return lambda view: verify_firebase_token_or_dev(view, check_revoked=check_revoked)
+
+        def verify_token(token):
+            if not check_revoked:
+                return token_verifier.verify(token)
+            from firebase_admin import auth as firebase_auth
+
+            try:
+                return firebase_auth.verify_id_token(token, check_revoked=True)
+            except firebase_auth.ExpiredIdTokenError as e:
+                raise ExpiredTokenError(str(e)) from e
+            except firebase_auth.RevokedIdTokenError as e:
+                raise RevokedTokenError(str(e)) from e
+            except Exception as e:
+                raise InvalidTokenError(str(e)) from e
 
         @wraps(f)
         def decorated(*args, **kwargs):
-            if DEV_MODE:
-                # Check for token first, fall back to user-1
-                auth_header = request.headers.get("Authorization", "")
-                if auth_header.startswith("Bearer "):
-                    token = auth_header.split("Bearer ")[1]
-                    try:
-                        decoded = firebase_auth.verify_id_token(token)
-                        request.uid = decoded["uid"]
-                        request.user_email = decoded.get("email", "")
-                        return f(*args, **kwargs)
-                    except Exception:
-                        pass  # Fall through to dev mode
+            auth_header = request.headers.get("Authorization", "")
+            decoded = None
+            if auth_header.startswith("Bearer ") and token_verifier is not None:
+                token = auth_header.split("Bearer ")[1]
+                try:
+                    decoded = verify_token(token)
+                except InvalidTokenError as e:
+                    if not DEV_MODE:
+                        if isinstance(e, ExpiredTokenError):
+                            return jsonify({"error": "Token expired"}), 401
+                        if isinstance(e, RevokedTokenError):
+                            return jsonify({"error": "Token revoked"}), 401
+                        return jsonify({"error": f"Invalid token: {str(e)}"}), 401
+            elif not DEV_MODE:
+                return jsonify({"error": "Missing authorization header"}), 401
 
+            if decoded is not None:
+                request.uid = decoded["uid"]
+                request.user_email = decoded.get("email", "")
+            else:
                 # Dev mode fallback
                 request.uid = request.headers.get("X-Dev-User-Id", "user-1")
                 request.user_email = "dev@localhost"
-                return f(*args, **kwargs)
 
-            # Production: require valid token
-            auth_header = request.headers.get("Authorization", "")
-            if not auth_header.startswith("Bearer "):
-                return jsonify({"error": "Missing authorization header"}), 401
+            trigger = profiling.trigger_for(request.headers.get("X-Profile"), is_admin(request.uid))
+            if trigger:
+                result, g.profile_id = profiling.profile_call(
+                    lambda: app.ensure_sync(f)(*args, **kwargs),
+                    route=request.url_rule.rule, method=request.method,
+                    user_id=request.uid, trigger=trigger,
+                )
+                return result
+            return app.ensure_sync(f)(*args, **kwargs)
 
-            token = auth_header.split("Bearer ")[1]
-            try:
-                decoded = firebase_auth.verify_id_token(token)
-                request.uid = decoded["uid"]
-                request.user_email = decoded.get("email", "")
-            except firebase_auth.ExpiredIdTokenError:
-                return jsonify({"error": "Token expired"}), 401
-            except firebase_auth.RevokedIdTokenError:
-                return jsonify({"error": "Token revoked"}), 401
-            except Exception as e:
-                return jsonify({"error": f"Invalid token: {str(e)}"}), 401
+        return decorated
+
+    def require_admin(f):
+        """Restrict to ADMIN_USER_IDS (any user in DEV_MODE). Apply below auth."""
 
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not is_admin(request.uid):
+                return jsonify({"error": "Admin access required"}), 403
             return f(*args, **kwargs)
 
         return decorated
 
+    # --- Conditional GET ---
+
+    from services.admission import (
+        ADMISSION_ENABLED,
+        limiter,
+        retry_after_header,
+        single_flight,
+    )
+    from services.http_cache import compute_etag, phase_window, utc_day
+    from services.view_cache import view_cache
+
+    def etag_from_versions(*collections, extra=None, prepare=None):
+        """Answer 304 when If-None-Match matches the versions the view reads.
+
+        Apply below the auth decorator. `extra` returns any time component
+        the payload depends on (see services.http_cache). The ETag is read
+        before the view runs, so a write that lands meanwhile can only make
+        it older than the body, never newer; `prepare(uid)` makes any
+        default state the view would create (and bump) before that read.
+        """
+
+        def wrap(f):
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                if prepare:
+                    prepare(request.uid)
+                etag = compute_etag(request.uid, collections, extra() if extra else "")
+                hit = request.if_none_match.contains(etag)
+                metrics.record_cache("etag", hit)
+                if hit:
+                    resp = app.response_class(status=304)
+                else:
+                    resp = make_response(f(*args, **kwargs))
+                    if resp.status_code != 200:
+                        return resp
+                resp.set_etag(etag)
+                resp.headers["Cache-Control"] = "private, no-cache"
+                return resp
+
+            return decorated
+
+        return wrap
+
+    # --- Admission control ---
+
+    def admission(bucket, coalesce=True):
+        """Per-user token bucket for an expensive route (429 + Retry-After when
+        empty); identical requests already in flight for the user share one
+        execution (services.admission). Apply below auth and any ETag check.
+        """
+
+        def wrap(f):
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                if not ADMISSION_ENABLED:
+                    return app.ensure_sync(f)(*args, **kwargs)
+
+                def admit_and_run():
+                    wait = limiter.acquire(request.uid, bucket)
+                    if wait:
+                        metrics.record_admission(bucket, "throttled")
+                        resp = jsonify({"error": "Too many requests", "retry_after": round(wait, 1)})
+                        resp.status_code = 429
+                        resp.headers["Retry-After"] = retry_after_header(wait)
+                        return resp
+                    metrics.record_admission(bucket, "admitted")
+                    return make_response(app.ensure_sync(f)(*args, **kwargs))
+
+                if not coalesce:
+                    return admit_and_run()
+
+                def run_frozen():
+                    # Followers get their own copy of the leader's response
+                    resp = admit_and_run()
+                    return resp.get_data(), resp.status_code, list(resp.headers.items())
+
+                key = (request.uid, request.method, request.full_path, request.get_data())
+                (body, status, headers), shared = single_flight.do(key, run_frozen)
+                if shared:
+                    metrics.record_admission(bucket, "coalesced")
+                return app.response_class(body, status=status, headers=headers)
+
+            return decorated
+
+        return wrap
+
+    # --- Background jobs ---
+
+    def wants_job():
+        """?async=1 — queue the work for tools/job_worker.py instead of running it inline."""
+        return request.args.get("async", "").lower() in ("1", "true")
+
+    def offload(size, inline_max_bytes):
+        """Queue work on `size` bytes? With ?async=1; or over the limit, if a job worker is up.
+
+        Without a live worker a queued job would never run, so the request
+        does the work inline however large it is.
+        """
+        return wants_job() or (size > inline_max_bytes and jobs.live_workers() > 0)
+
+    def submit_job(kind, payload=None):
+        job = jobs.submit(kind, request.uid, payload)
+        return jsonify({
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": f"/api/jobs/{job['id']}",
+        }), 202
+
+    @app.route("/api/jobs/<job_id>")
+    @verify_firebase_token_or_dev
+    def api_job_status(job_id):
+        job = jobs.get_job(job_id, user_id=request.uid)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job)
+
+    @app.route("/api/jobs/<job_id>/download")
+    @verify_firebase_token_or_dev
+    def api_job_download(job_id):
+        """The file a finished export job produced."""
+        from services.exports import CONTENT_TYPES, EXPORTS_DIR
+        job = jobs.get_job(job_id, user_id=request.uid)
+        result = job.get("result") if job else None
+        if job is None or job["status"] != jobs.SUCCEEDED or not isinstance(result, dict) or "file" not in result:
+            return jsonify({"error": "No download for this job"}), 404
+        path = EXPORTS_DIR / result["file"]
+        if not path.exists():
+            return jsonify({"error": "Export has expired"}), 410
+        return send_file(path, mimetype=CONTENT_TYPES[result["format"]], as_attachment=True,
+                         download_name=f"transactions.{result['format']}")
+
     # --- Health ---
 
     @app.route("/health")
@@ -344,11 +795,51 @@ def create_app():
             "authenticated": True,
         })
 
+    @app.route("/metrics")
+    def prometheus_metrics():
+        if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+            return jsonify({"error": "Unauthorized"}), 401
+        body, content_type = metrics.render()
+        return app.response_class(body, content_type=content_type)
+
+    # --- Admin ---
+
+    @app.route("/api/admin/cache")
+    @verify_firebase_token_or_dev
+    @require_admin
+    def api_admin_cache():
+        stats = view_cache.stats()
+        if token_verifier is not None:
+            stats["token_cache"] = token_verifier.stats()
+        return jsonify(stats)
+
+    @app.route("/api/admin/profiles")
+    @verify_firebase_token_or_dev
+    @require_admin
+    def api_admin_profiles():
+        """Slowest stored request profiles (send X-Profile: 1 to record one)."""
+        limit = request.args.get("limit", 20, type=int)
+        return jsonify({"profiles": profiling.list_profiles(limit, request.args.get("route"))})
+
+    @app.route("/api/admin/profiles/<profile_id>")
+    @verify_firebase_token_or_dev
+    @require_admin
+    def api_admin_profile(profile_id):
+        profile = profiling.get_profile(profile_id, request.args.get("lines", 40, type=int))
+        if profile is None:
+            return jsonify({"error": "Profile not found"}), 404
+        return jsonify(profile)
+
     # --- Plaid Routes ---
 
     @app.route("/api/plaid/create-link-token", methods=["POST"])
     @verify_firebase_token_or_dev
-    def api_create_link_token():
+    async def api_create_link_token():
+        from plaid.model.country_code import CountryCode
+        from plaid.model.link_token_create_request import LinkTokenCreateRequest
+        from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+        from plaid.model.products import Products
+
         try:
             req = LinkTokenCreateRequest(
                 products=[Products("transactions")],
@@ -358,26 +849,30 @@ def create_app():
                 user=LinkTokenCreateRequestUser(client_user_id=request.uid),
                 webhook=os.getenv("PLAID_WEBHOOK_URL"),
             )
-            response = plaid_client.link_token_create(req)
+            response = await _offload(plaid_call, "link_token_create", req)
             return jsonify({"link_token": response.link_token})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
     @app.route("/api/plaid/exchange-token", methods=["POST"])
-    @verify_firebase_token_or_dev
+    @verify_firebase_token_or_dev(check_revoked=True)
     def api_exchange_token():
+        from plaid.model.item_public_token_exchange_request import (
+            ItemPublicTokenExchangeRequest,
+        )
+
         try:
             data = request.get_json()
             public_token = data.get("public_token")
             metadata = data.get("metadata", {})
 
             req = ItemPublicTokenExchangeRequest(public_token=public_token)
-            response = plaid_client.item_public_token_exchange(req)
+            response = plaid_call("item_public_token_exchange", req)
 
             # Encrypt access token before storing
             encrypted_token = encrypt(response.access_token)
 
-            tokens = load_tokens(request.uid)
+            tokens = dict(load_tokens(request.uid))
             tokens[response.item_id] = {
                 "access_token": encrypted_token,
                 "institution_name": metadata.get("institution", {}).get("name", "Unknown"),
@@ -398,68 +893,47 @@ def create_app():
 
     @app.route("/api/plaid/accounts")
     @verify_firebase_token_or_dev
-    def api_plaid_accounts():
+    @admission("plaid_read")
+    async def api_plaid_accounts():
         try:
-            tokens = load_tokens(request.uid)
-            all_accounts = []
-            for item_id, info in tokens.items():
-                try:
-                    access_token = decrypt(info["access_token"])
-                    resp = plaid_client.accounts_get(
-                        AccountsGetRequest(access_token=access_token)
-                    )
-                    for a in resp.accounts:
-                        all_accounts.append({
-                            "id": a.account_id,
-                            "item_id": item_id,
-                            "name": a.name,
-                            "type": a.type.value,
-                            "subtype": str(a.subtype) if a.subtype else None,
-                            "mask": a.mask,
-                            "institution_name": info["institution_name"],
-                            "current_balance": a.balances.current,
-                            "available_balance": a.balances.available,
-                        })
-                except Exception as e:
-                    all_accounts.append({
-                        "item_id": item_id,
-                        "institution_name": info.get("institution_name", "Unknown"),
-                        "error": str(e),
-                    })
-
-            return jsonify({"accounts": all_accounts})
+            return jsonify({"accounts": await accounts_async(request.uid)})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
     @app.route("/api/plaid/sync", methods=["POST"])
     @verify_firebase_token_or_dev
-    def api_sync_all():
+    @admission("plaid_sync")
+    async def api_sync_all():
+        if wants_job():
+            return submit_job("plaid_sync")
         try:
-            results = sync_all(request.uid)
+            results = await sync_all_async(request.uid)
             return jsonify({"status": "ok", "results": results})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
     @app.route("/api/plaid/sync/<item_id>", methods=["POST"])
     @verify_firebase_token_or_dev
-    def api_sync_item(item_id):
+    @admission("plaid_sync")
+    async def api_sync_item(item_id):
+        if wants_job():
+            return submit_job("plaid_sync", {"item_id": item_id})
         try:
-            result = sync_transactions(item_id, request.uid)
+            result = await sync_transactions_async(item_id, request.uid)
             return jsonify({"status": "ok", **result})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
     @app.route("/api/plaid/transactions", methods=["POST"])
     @verify_firebase_token_or_dev
+    @admission("compute")
     def api_transactions():
         all_txns = load_transactions(request.uid)
         # Flatten all items' transactions
         flat = []
         for item_id, txns in all_txns.items():
             for t in txns:
-                t["budget_category"] = map_category(t)
-                t["item_id"] = item_id
-                flat.append(t)
+                flat.append({**t, "budget_category": map_category(t), "item_id": item_id})
 
         # Sort newest first
         flat.sort(key=lambda x: x["date"], reverse=True)
@@ -477,56 +951,25 @@ def create_app():
 
     @app.route("/api/plaid/income")
     @verify_firebase_token_or_dev
+    @admission("compute")
     def api_plaid_income():
         """Detect income streams from transaction patterns."""
-        all_txns = load_transactions(request.uid)
-        income_txns = []
-        for item_id, txns in all_txns.items():
-            for t in txns:
-                if t["amount"] < 0 and abs(t["amount"]) > 200:
-                    t["budget_category"] = map_category(t)
-                    if t["budget_category"] in ("Income", "E-Transfers In"):
-                        income_txns.append(t)
-
-        # Group by merchant/name to find recurring patterns
-        patterns = defaultdict(list)
-        for t in income_txns:
-            key = t.get("merchant") or t.get("name", "Unknown")
-            patterns[key].append(abs(t["amount"]))
-
-        income_streams = []
-        for name, amounts in patterns.items():
-            income_streams.append({
-                "name": name,
-                "amount": round(sum(amounts) / len(amounts), 2),
-                "frequency": "monthly" if len(amounts) >= 2 else "one-time",
-                "occurrences": len(amounts),
-                "is_active": True,
-            })
-
-        return jsonify({"income_streams": income_streams})
+        from services.budget_service import detect_income_streams
+        streams = view_cache.get_or_compute(
+            request.uid, "income_streams", ("transactions",),
+            lambda: detect_income_streams(load_transactions(request.uid)),
+        )
+        return jsonify({"income_streams": streams})
 
     @app.route("/api/plaid/disconnect/<item_id>", methods=["POST"])
-    @verify_firebase_token_or_dev
+    @verify_firebase_token_or_dev(check_revoked=True)
     def api_disconnect(item_id):
-        tokens = load_tokens(request.uid)
-        if item_id not in tokens:
+        if wants_job():
+            if item_id not in load_tokens(request.uid):
+                return jsonify({"error": "Account not found"}), 404
+            return submit_job("plaid_disconnect", {"item_id": item_id})
+        if not disconnect_item(item_id, request.uid):
             return jsonify({"error": "Account not found"}), 404
-
-        try:
-            from plaid.model.item_remove_request import ItemRemoveRequest
-            access_token = decrypt(tokens[item_id]["access_token"])
-            plaid_client.item_remove(ItemRemoveRequest(access_token=access_token))
-        except Exception as e:
-            print(f"Plaid revoke warning: {e}")
-
-        del tokens[item_id]
-        save_tokens(tokens, request.uid)
-
-        all_txns = load_transactions(request.uid)
-        all_txns.pop(item_id, None)
-        save_transactions(all_txns, request.uid)
-
         return jsonify({"status": "disconnected"})
 
     # --- Plaid Webhook (no auth — called by Plaid) ---
@@ -540,19 +983,31 @@ def create_app():
 
     # --- Phase Endpoints ---
 
-    @app.route("/api/phase")
-    @verify_firebase_token_or_dev
-    def api_phase():
+    def ensure_phase(uid):
+        from services.phase_service import get_user_phase
+        get_user_phase(uid)  # Saves the default state on first read
+
+    def phase_view(uid):
         from services.phase_service import (
             get_user_phase, get_unlocked_features, get_next_transition_info,
         )
-        state = get_user_phase(request.uid)
-        info = get_next_transition_info(request.uid)
-        return jsonify({
+        state = get_user_phase(uid)
+        info = view_cache.get_or_compute(
+            uid, "phase_transition", ("user_phase", "income_events"),
+            lambda: get_next_transition_info(uid),
+            extra=phase_window(),
+        )
+        return {
             "phase": state.to_dict(),
             "unlocked_features": get_unlocked_features(state.current_phase),
             "transition": info,
-        })
+        }
+
+    @app.route("/api/phase")
+    @verify_firebase_token_or_dev
+    @etag_from_versions("user_phase", "income_events", extra=phase_window, prepare=ensure_phase)
+    def api_phase():
+        return jsonify(phase_view(request.uid))
 
     @app.route("/api/phase/advance", methods=["POST"])
     @verify_firebase_token_or_dev
@@ -645,15 +1100,15 @@ def create_app():
     def api_savings():
         from models.savings import ManualSavingsLog
         from models.income import IncomeEvent
-        from models.auto_transfer import AutoTransfer
-        from services.persistence import load_all, append_one
+        from services.automation_service import get_user_transfer
+        from services.persistence import load_latest, append_one
 
         data = request.get_json(force=True)
-        income_events = load_all("income_events", IncomeEvent.from_dict, user_id=request.uid)
+        income_events = load_latest("income_events", IncomeEvent.from_dict, user_id=request.uid)
         latest_income = income_events[-1].amount if income_events else 0
 
-        transfers = load_all("auto_transfers", AutoTransfer.from_dict, user_id=request.uid)
-        target_rate = transfers[-1].savings_rate_pct / 100.0 if transfers else 0.10
+        transfer = get_user_transfer(request.uid)
+        target_rate = transfer.savings_rate_pct / 100.0 if transfer else 0.10
 
         amount = float(data.get("amount", 0))
         adherence = ManualSavingsLog.compute_adherence(amount, latest_income, target_rate)
@@ -671,29 +1126,40 @@ def create_app():
 
     # --- IIN (Automation) ---
 
+    def iin_config_view(uid):
+        from services.automation_service import get_user_transfer
+        transfer = get_user_transfer(uid)
+        return {"config": transfer.to_dict() if transfer else None}
+
     @app.route("/api/iin/config")
     @verify_firebase_token_or_dev
+    @etag_from_versions("iin_ledger")
     def api_iin_config():
-        from services.automation_service import get_user_transfer
-        transfer = get_user_transfer(request.uid)
-        return jsonify({"config": transfer.to_dict() if transfer else None})
+        return jsonify(iin_config_view(request.uid))
 
     @app.route("/api/iin/config", methods=["PUT"])
     @verify_firebase_token_or_dev
     def api_iin_config_update():
-        from models.auto_transfer import AutoTransfer
-        from services.persistence import append_one
+        from services.automation_service import set_transfer
 
         data = request.get_json(force=True)
-        transfer = AutoTransfer(
-            user_id=request.uid,
+        transfer = set_transfer(
+            request.uid,
             savings_rate_pct=float(data.get("savings_rate_pct", 10.0)),
             destination=data.get("destination", "savings"),
             is_active=data.get("is_active", True),
         )
-        append_one("auto_transfers", transfer, user_id=request.uid)
         return jsonify({"success": True, "config": transfer.to_dict()})
 
+    @app.route("/api/iin/history")
+    @verify_firebase_token_or_dev
+    @etag_from_versions("iin_ledger")
+    def api_iin_history():
+        """Rate change events, oldest first; ?since= / ?until= ISO dates bound them."""
+        from services.iin_ledger import history
+        events = list(history(request.uid, request.args.get("since"), request.args.get("until")))
+        return jsonify({"events": events, "count": len(events)})
+
     @app.route("/api/iin/escalation/accept", methods=["POST"])
     @verify_firebase_token_or_dev
     def api_accept_escalation():
@@ -714,83 +1180,46 @@ def create_app():
 
     # --- Budget ---
 
+    def budget_summary_view(uid):
+        from services.budget_service import compute_budget_summary
+        return view_cache.get_or_compute(
+            uid, "budget_summary", ("transactions",),
+            lambda: compute_budget_summary(load_transactions(uid)),
+        )
+
     @app.route("/api/budget/summary")
     @verify_firebase_token_or_dev
+    @etag_from_versions("transactions")
+    @admission("compute")
     def api_budget_summary():
-        all_txns = load_transactions(request.uid)
-        flat = []
-        for item_id, txns in all_txns.items():
-            for t in txns:
-                t["budget_category"] = map_category(t)
-                flat.append(t)
-
-        # Group by month
-        months = defaultdict(list)
-        for t in flat:
-            months[t["date"][:7]].append(t)
-
-        num_months = max(len(months), 1)
-
-        # Category aggregation
-        by_category = defaultdict(lambda: {"total": 0.0, "count": 0})
-        total_income = 0
-        total_expense = 0
-
-        for t in flat:
-            cat = t["budget_category"]
-            if cat in ("Income", "E-Transfers In"):
-                total_income += abs(t["amount"])
-            elif t["amount"] > 0:
-                by_category[cat]["total"] += t["amount"]
-                by_category[cat]["count"] += 1
-                total_expense += t["amount"]
-
-        # Build envelope summaries
-        envelopes = []
-        for env in BUDGET_ENVELOPES:
-            cats = []
-            env_total = 0
-            for cat_name in env["categories"]:
-                data = by_category.get(cat_name, {"total": 0, "count": 0})
-                if data["total"] > 0:
-                    avg = data["total"] / num_months
-                    cats.append({
-                        "name": cat_name,
-                        "monthly_avg": round(avg, 2),
-                        "total": round(data["total"], 2),
-                        "count": data["count"],
-                    })
-                    env_total += avg
-
-            envelopes.append({
-                "name": env["name"],
-                "categories": cats,
-                "subtotal": round(env_total, 2),
-            })
-
-        return jsonify({
-            "monthly_income": round(total_income / num_months, 2),
-            "monthly_expense": round(total_expense / num_months, 2),
-            "monthly_balance": round(
-                (total_income - total_expense) / num_months, 2
-            ),
-            "months_analyzed": num_months,
-            "envelopes": envelopes,
-        })
+        return jsonify(budget_summary_view(request.uid))
 
     # --- Monitoring ---
 
+    def safe_to_spend_view(uid):
+        from services.monitoring_service import compute_safe_to_spend
+        return view_cache.get_or_compute(
+            uid, "safe_to_spend",
+            ("income_events", "budget_config", "transactions"),
+            lambda: compute_safe_to_spend(uid),
+            extra=utc_day(),
+        )
+
     @app.route("/api/safe-to-spend")
     @verify_firebase_token_or_dev
+    @etag_from_versions("income_events", "budget_config", "transactions", extra=utc_day)
+    @admission("compute")
     def api_safe_to_spend():
-        from services.monitoring_service import compute_safe_to_spend
-        return jsonify(compute_safe_to_spend(request.uid))
+        return jsonify(safe_to_spend_view(request.uid))
 
     @app.route("/api/reviews/weekly")
     @verify_firebase_token_or_dev
     def api_weekly_review():
-        from services.monitoring_service import generate_weekly_review
-        return jsonify(generate_weekly_review(request.uid))
+        from services.monitoring_service import get_weekly_review, stored_weekly_review
+        if wants_job():
+            review = stored_weekly_review(request.uid)
+            return jsonify(review) if review else submit_job("weekly_review")
+        return jsonify(get_weekly_review(request.uid))
 
     @app.route("/api/reviews/weekly/acknowledge", methods=["POST"])
     @verify_firebase_token_or_dev
@@ -829,13 +1258,68 @@ def create_app():
             monthly_income=float(request.args.get("monthly_income", 5000)),
         ))
 
+    @app.route("/api/escalation/forecast/grid", methods=["POST"])
+    @verify_firebase_token_or_dev
+    @admission("compute")
+    def api_escalation_forecast_grid():
+        from services.accountability_service import compute_forecast_grid
+        data = request.get_json(force=True)
+        try:
+            return jsonify(compute_forecast_grid(
+                rates=data.get("rates", []),
+                years=data.get("years", []),
+                annual_returns=data.get("annual_returns"),
+                income_growth=data.get("income_growth"),
+                monthly_income=float(data.get("monthly_income", 5000)),
+                path_interval=int(data.get("path_interval", 0)),
+            ))
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+
     # --- Safeguards (Phase 5+) ---
 
     @app.route("/api/safeguards")
     @verify_firebase_token_or_dev
     def api_safeguards():
+        return jsonify(safeguards_view(request.uid))
+
+    def safeguards_view(uid):
         from services.safeguards_service import get_user_safeguard_status
-        return jsonify(get_user_safeguard_status(request.uid))
+        return get_user_safeguard_status(uid)
+
+    # --- Dashboard ---
+
+    dashboard_sections = {
+        "phase": phase_view,
+        "safe_to_spend": safe_to_spend_view,
+        "budget_summary": budget_summary_view,
+        "iin_config": iin_config_view,
+        "safeguards": safeguards_view,
+    }
+
+    @app.route("/api/dashboard")
+    @verify_firebase_token_or_dev
+    @admission("compute")
+    def api_dashboard():
+        """The views the app opens with, in one round trip.
+
+        ?sections=phase,safe_to_spend (default: all). Each underlying
+        collection is read once and the sections are computed in parallel
+        (services.dashboard); timings_ms reports each section's time.
+        """
+        from services.dashboard import compute_sections
+        names = [s.strip() for s in request.args.get("sections", "").split(",") if s.strip()]
+        names = list(dict.fromkeys(names)) or list(dashboard_sections)
+        unknown = [n for n in names if n not in dashboard_sections]
+        if unknown:
+            return jsonify({
+                "error": f"Unknown sections: {', '.join(unknown)}",
+                "available": list(dashboard_sections),
+            }), 400
+        uid = request.uid
+        return jsonify(compute_sections({
+            name: partial(dashboard_sections[name], uid) for name in names
+        }))
 
     @app.route("/api/safeguards/gamification/holiday", methods=["POST"])
     @verify_firebase_token_or_dev
@@ -844,6 +1328,93 @@ def create_app():
         return jsonify(start_gamification_holiday(request.uid))
 
 
+    # --- Transaction Import ---
+
+    @app.route("/api/transactions/import", methods=["POST"])
+    @verify_firebase_token_or_dev
+    @admission("compute", coalesce=False)
+    def api_import_transactions():
+        """Bulk-import a bank export: multipart `file` (CSV, OFX/QFX or XLSX).
+
+        Optional form fields: format (default: the file extension) and sign
+        ("bank", the default: negative amounts are spending; "plaid": positive
+        are). Files over IMPORT_INLINE_MAX_BYTES (while a job worker is running),
+        or any with ?async=1, are imported by a background job (202 + job id).
+        """
+        from services.transaction_import import SIGNS, detect_format, import_transactions, upload_path
+        upload = request.files.get("file")
+        if upload is None or not upload.filename:
+            return jsonify({"error": "file required"}), 400
+        fmt = request.form.get("format")
+        sign = request.form.get("sign", "bank")
+        if sign not in SIGNS:
+            return jsonify({"error": f"sign must be one of: {', '.join(SIGNS)}"}), 400
+        try:
+            fmt = detect_format(Path(upload.filename), fmt)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        path = upload_path(upload.filename)
+        upload.save(path)
+        if offload(path.stat().st_size, IMPORT_INLINE_MAX_BYTES):
+            return submit_job("transactions_import", {"path": str(path), "format": fmt, "sign": sign})
+        try:
+            return jsonify(import_transactions(request.uid, path, fmt, sign=sign))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        finally:
+            path.unlink(missing_ok=True)
+
+    # --- Exports ---
+
+    def send_export(columns, rows, fmt, name):
+        """CSV streamed from a generator; XLSX written (write-only) to a file then sent."""
+        from services.exports import CONTENT_TYPES, csv_stream, export_path, write_xlsx
+        download_name = f"{name}.{fmt}"
+        if fmt == "csv":
+            return app.response_class(
+                csv_stream(columns, rows), mimetype=CONTENT_TYPES["csv"],
+                headers={"Content-Disposition": f'attachment; filename="{download_name}"'},
+            )
+        path = export_path(fmt)
+        write_xlsx(path, {name.replace("_", " ").title(): (columns, rows)})
+        fh = open(path, "rb")
+        path.unlink()  # The open handle keeps it readable until the response is sent
+        return send_file(fh, mimetype=CONTENT_TYPES[fmt], as_attachment=True, download_name=download_name)
+
+    @app.route("/api/export/transactions")
+    @verify_firebase_token_or_dev
+    @admission("compute", coalesce=False)
+    def api_export_transactions():
+        """Full transaction history as a spreadsheet, categories applied.
+
+        ?format=csv (default) or xlsx; optional start_date/end_date. Users with
+        a large history (while a job worker is running), or any with ?async=1,
+        get a 202 + job id; the file is then at /api/jobs/<job_id>/download.
+        """
+        from services.exports import FORMATS, TRANSACTION_COLUMNS, transaction_rows
+        fmt = request.args.get("format", "csv")
+        if fmt not in FORMATS:
+            return jsonify({"error": f"format must be one of: {', '.join(FORMATS)}"}), 400
+        start_date = request.args.get("start_date")
+        end_date = request.args.get("end_date")
+        store = _txn_file(request.uid)
+        if offload(store.stat().st_size if store.exists() else 0, EXPORT_INLINE_MAX_BYTES):
+            return submit_job("export", {"format": fmt, "start_date": start_date, "end_date": end_date})
+        rows = transaction_rows(request.uid, start_date, end_date)
+        return send_export(TRANSACTION_COLUMNS, rows, fmt, "transactions")
+
+    @app.route("/api/export/budget-summary")
+    @verify_firebase_token_or_dev
+    @admission("compute", coalesce=False)
+    def api_export_budget_summary():
+        """The budget summary (envelopes, categories, monthly totals) as ?format=csv|xlsx."""
+        from services.exports import FORMATS, SUMMARY_COLUMNS, summary_rows
+        fmt = request.args.get("format", "csv")
+        if fmt not in FORMATS:
+            return jsonify({"error": f"format must be one of: {', '.join(FORMATS)}"}), 400
+        return send_export(SUMMARY_COLUMNS, summary_rows(budget_summary_view(request.uid)), fmt, "budget_summary")
+
     # --- Transaction Category Override (Function 3) ---
 
     @app.route("/api/transactions/<transaction_id>/category", methods=["PUT"])
@@ -854,61 +1425,66 @@ def create_app():
         category = body.get("category")
         if not category:
             return jsonify({"error": "category required"}), 400
-        overrides_file = DATA_DIR / f"category_overrides_{request.uid}.json"
+        overrides_file = collection_path(request.uid, "category_overrides")
         overrides = {}
         if overrides_file.exists():
             try:
-                overrides = json.loads(overrides_file.read_text())
+                overrides = dict(read_json(overrides_file))
             except Exception:
                 overrides = {}
         overrides[transaction_id] = {"category": category, "overridden_at": datetime.utcnow().isoformat()}
-        overrides_file.write_text(json.dumps(overrides, indent=2))
+        write_json(overrides_file, overrides)
+        bump_version("category_overrides", request.uid)
         return jsonify({"transaction_id": transaction_id, "category": category, "status": "updated"})
 
     @app.route("/api/budget/items", methods=["POST"])
     @verify_firebase_token_or_dev
     def api_create_budget_item():
-        body = request.get_json() or {}
-        item = {"id": body.get("id", f"item_{datetime.utcnow().timestamp()}"), "category_id": body.get("category_id"), "name": body.get("name", "New item"), "budget_amount": float(body.get("budget_amount", 0)), "classification": body.get("classification", "TRUE_VARIABLE"), "created_at": datetime.utcnow().isoformat()}
-        items_file = DATA_DIR / f"budget_items_{request.uid}.json"
-        items = json.loads(items_file.read_text()) if items_file.exists() else []
-        items.append(item)
-        items_file.write_text(json.dumps(items, indent=2))
+        from services.budget_items import create_item
+        try:
+            item = create_item(request.get_json() or {}, request.uid)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         return jsonify({"item": item, "status": "created"}), 201
 
     @app.route("/api/budget/items/<item_id>", methods=["PUT"])
     @verify_firebase_token_or_dev
     def api_update_budget_item(item_id):
-        body = request.get_json() or {}
-        items_file = DATA_DIR / f"budget_items_{request.uid}.json"
-        items = json.loads(items_file.read_text()) if items_file.exists() else []
-        for item in items:
-            if item["id"] == item_id:
-                if body.get("name"): item["name"] = body["name"]
-                if body.get("budget_amount") is not None: item["budget_amount"] = float(body["budget_amount"])
-                if body.get("classification"): item["classification"] = body["classification"]
-                item["updated_at"] = datetime.utcnow().isoformat()
-                break
-        items_file.write_text(json.dumps(items, indent=2))
+        from services.budget_items import update_item
+        if update_item(item_id, request.get_json() or {}, request.uid) is None:
+            return jsonify({"error": f"Item not found: {item_id}"}), 404
         return jsonify({"status": "updated"})
 
     @app.route("/api/budget/items/<item_id>", methods=["DELETE"])
     @verify_firebase_token_or_dev
     def api_delete_budget_item(item_id):
-        items_file = DATA_DIR / f"budget_items_{request.uid}.json"
-        items = json.loads(items_file.read_text()) if items_file.exists() else []
-        items = [i for i in items if i["id"] != item_id]
-        items_file.write_text(json.dumps(items, indent=2))
+        from services.budget_items import delete_item
+        if not delete_item(item_id, request.uid):
+            return jsonify({"error": f"Item not found: {item_id}"}), 404
         return jsonify({"status": "deleted"})
 
+    @app.route("/api/budget/items:batch", methods=["PATCH"])
+    @verify_firebase_token_or_dev
+    def api_batch_budget_items():
+        """{"create": [...], "update": [{"id", ...}], "delete": [ids]} in one atomic write."""
+        from services.budget_items import apply_batch
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return jsonify({"error": "JSON object required"}), 400
+        try:
+            result = apply_batch(body, request.uid)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"status": "ok", **result})
+
     @app.route("/api/budget/items", methods=["GET"])
     @verify_firebase_token_or_dev
+    @etag_from_versions("budget_items")
     def api_get_budget_items():
-        items_file = DATA_DIR / f"budget_items_{request.uid}.json"
-        items = json.loads(items_file.read_text()) if items_file.exists() else []
+        from services.budget_items import list_items
+        items = list_items(request.uid)
         return jsonify({"items": items, "count": len(items)})
 
-
     # --- A/B Testing (Phase 5+) ---
 
     @app.route("/api/experiments")
@@ -917,6 +1493,34 @@ def create_app():
         from services.ab_testing_service import list_experiments
         return jsonify({"experiments": list_experiments(request.args.get("status", "active"))})
 
+    @app.route("/api/experiments/<experiment_id>/outcomes", methods=["POST"])
+    @verify_firebase_token_or_dev
+    def api_record_outcome(experiment_id):
+        """Record {metric, value} for the user's variant (buffered: 202)."""
+        from services.ab_testing_service import record_outcome
+        body = request.get_json() or {}
+        try:
+            record = record_outcome(request.uid, experiment_id, body.get("metric"), body.get("value"))
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(record), 202
+
+    @app.route("/api/experiments/<experiment_id>/results")
+    @verify_firebase_token_or_dev
+    def api_experiment_results(experiment_id):
+        from services.ab_testing_service import get_experiment_results
+        try:
+            return jsonify(get_experiment_results(experiment_id))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 404
+
+    @app.route("/api/feature-flags")
+    @verify_firebase_token_or_dev
+    def api_feature_flags():
+        """All flags and experiment assignments for the user in one call."""
+        from services.ab_testing_service import evaluate_flags
+        return jsonify(evaluate_flags(request.uid))
+
     @app.route("/api/feature-flags/<flag_name>")
     @verify_firebase_token_or_dev
     def api_feature_flag(flag_name):
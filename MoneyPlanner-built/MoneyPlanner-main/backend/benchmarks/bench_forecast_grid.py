@@ -0,0 +1,60 @@
+"""Benchmark — vectorized escalation forecast grid vs one call per scenario.
+
+  cd backend && python -m benchmarks.bench_forecast_grid
+"""
+
+import time
+
+from services.accountability_service import (
+    _grid_cache,
+    compute_escalation_forecast,
+    compute_forecast_grid,
+)
+
+# 25 rates × 40 horizons × 5 returns × 2 growth assumptions = 10,000 scenarios
+GRID = {
+    "rates": [round(0.02 + 0.01 * i, 2) for i in range(25)],
+    "years": list(range(1, 41)),
+    "annual_returns": [0.0, 0.03, 0.05, 0.07, 0.09],
+    "income_growth": [0.0, 0.03],
+    "monthly_income": 5000,
+}
+
+
+def _timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    def cold(path_interval=0):
+        _grid_cache.clear()
+        return compute_forecast_grid(**GRID, path_interval=path_interval)
+
+    def per_scenario():
+        # What the app did before: one closed-form forecast per HTTP call
+        for rate in GRID["rates"]:
+            for years in GRID["years"]:
+                for _ in range(len(GRID["annual_returns"]) * len(GRID["income_growth"])):
+                    compute_escalation_forecast(rate, rate, years, GRID["monthly_income"])
+
+    scenarios = cold()["scenarios"]
+    compute_forecast_grid(**GRID)
+    rows = [
+        ("grid, cold", _timed(cold)),
+        ("grid, memoized", _timed(lambda: compute_forecast_grid(**GRID))),
+        ("grid + yearly paths, cold", _timed(lambda: cold(12))),
+        ("grid + quarterly paths, cold", _timed(lambda: cold(3), repeat=2)),
+        ("per-scenario calls", _timed(per_scenario)),
+    ]
+    print(f"{scenarios:,} scenarios")
+    for name, secs in rows:
+        print(f"  {name:<28} {secs * 1000:9.2f} ms  {scenarios / secs:12,.0f} scenarios/s")
+
+
+if __name__ == "__main__":
+    main()
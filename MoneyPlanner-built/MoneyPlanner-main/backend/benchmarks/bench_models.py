@@ -0,0 +1,74 @@
+"""Benchmark — model memory per object and hydration throughput.
+
+  cd backend && python -m benchmarks.bench_models            # 100k records
+  python -m benchmarks.bench_models --records 1000000
+
+Memory is measured with tracemalloc (object plus its own containers, not the
+shared strings it points to) against a plain __dict__-backed object holding
+the same fields, which is what the models were before they were slotted.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_income_events, make_transactions
+from models.income import IncomeEvent
+from models.transaction import Transaction
+
+
+class _PlainRecord:
+    def __init__(self, d: dict):
+        self.__dict__.update(d)
+
+
+def _bytes_per_object(build, rows: list[dict]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(r) for r in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / len(rows)
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Model memory and hydration benchmark")
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    n = args.records
+
+    # Stored shape: what load_all hands to from_dict
+    txn_rows = [Transaction.from_dict(t).to_dict() for t in make_transactions(n, seed=1)]
+    event_rows = [IncomeEvent.from_dict(e).to_dict() for e in make_income_events(n, seed=2)]
+
+    print(f"{n:,} records")
+    for label, cls, rows in (("Transaction", Transaction, txn_rows), ("IncomeEvent", IncomeEvent, event_rows)):
+        slotted = _bytes_per_object(cls.from_dict, rows)
+        plain = _bytes_per_object(_PlainRecord, rows)
+        hydrate = _best(lambda: [cls.from_dict(r) for r in rows])
+        via_init = _best(lambda: [cls(**r) for r in rows])
+        objects = [cls.from_dict(r) for r in rows]
+        dump = _best(lambda: [o.to_dict() for o in objects])
+        print(f"\n  {label}")
+        print(f"    memory/object     {slotted:8.0f} B   (__dict__ object: {plain:.0f} B)")
+        print(f"    from_dict         {hydrate * 1000:8.1f} ms  {n / hydrate:12,.0f} records/s")
+        print(f"    __init__(**d)     {via_init * 1000:8.1f} ms  {n / via_init:12,.0f} records/s")
+        print(f"    to_dict           {dump * 1000:8.1f} ms  {n / dump:12,.0f} records/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
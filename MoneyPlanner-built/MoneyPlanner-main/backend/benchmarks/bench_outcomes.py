@@ -0,0 +1,107 @@
+"""Benchmark — sustained experiment outcome ingestion.
+
+  cd backend && python -m benchmarks.bench_outcomes
+  python -m benchmarks.bench_outcomes --threads 8 --seconds 10 --flush-size 5000
+
+Several threads call record_outcome() as fast as they can for a fixed time
+against a throwaway DATA_DIR and experiment config, with the background
+flusher running. Reports the sustained rate, record_outcome() latency,
+flush batches and how long a results read takes, then checks that the
+streamed statistics match a rebuild from the outcome log.
+"""
+
+import json
+import os
+import tempfile
+
+# Must be set before services are imported (they resolve these on import)
+_tmp = tempfile.mkdtemp(prefix="moneyplanner-bench-outcomes-")
+os.environ["DATA_DIR"] = os.path.join(_tmp, "data")
+os.environ["EXPERIMENTS_CONFIG"] = os.path.join(_tmp, "experiments.json")
+os.makedirs(os.environ["DATA_DIR"])
+with open(os.environ["EXPERIMENTS_CONFIG"], "w") as fh:
+    json.dump({"experiments": {"bench": {"variants": {"control": 1, "treatment": 1}}}}, fh)
+
+import argparse  # noqa: E402
+import random  # noqa: E402
+import shutil  # noqa: E402
+import statistics  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+
+from services import outcomes  # noqa: E402
+from services.ab_testing_service import get_experiment_results, record_outcome  # noqa: E402
+
+METRICS = ("savings_rate", "sessions", "retained")
+
+
+def _ingest(seconds: float, seed: int, latencies: list, counts: list):
+    rng = random.Random(seed)
+    users = [f"bench-{seed}-{i}" for i in range(1000)]
+    sample = []
+    n = 0
+    deadline = time.perf_counter() + seconds
+    while True:
+        start = time.perf_counter()
+        if start >= deadline:
+            break
+        record_outcome(rng.choice(users), "bench", rng.choice(METRICS), rng.gauss(10, 3))
+        if n % 64 == 0:
+            sample.append(time.perf_counter() - start)
+        n += 1
+    latencies.extend(sample)
+    counts.append(n)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Experiment outcome ingestion benchmark")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--flush-size", type=int, default=outcomes.OUTCOME_FLUSH_SIZE)
+    args = parser.parse_args(argv)
+    outcomes.buffer.flush_size = args.flush_size
+
+    try:
+        latencies, counts = [], []
+        threads = [
+            threading.Thread(target=_ingest, args=(args.seconds, i, latencies, counts))
+            for i in range(args.threads)
+        ]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        outcomes.buffer.flush()
+        elapsed = time.perf_counter() - start
+        total = sum(counts)
+
+        read_start = time.perf_counter()
+        results = get_experiment_results("bench")
+        read_ms = (time.perf_counter() - read_start) * 1000
+        streamed = {(v, m): s["count"] for v, ms in results["variants"].items() for m, s in ms.items()}
+        means = {(v, m): s["mean"] for v, ms in results["variants"].items() for m, s in ms.items()}
+
+        rebuilt = outcomes.rebuild_stats()
+        replayed = get_experiment_results("bench")["variants"]
+        drift = max(abs(means[(v, m)] - s["mean"]) for v, ms in replayed.items() for m, s in ms.items())
+
+        latencies.sort()
+        us = [x * 1e6 for x in latencies]
+        print(f"{args.threads} threads x {args.seconds:g}s, flush size {args.flush_size}")
+        print(f"  ingested          {total:12,} outcomes   {total / elapsed:12,.0f} outcomes/s")
+        print(f"  record_outcome    p50 {statistics.median(us):7.1f} us   "
+              f"p99 {us[int(len(us) * 0.99)]:8.1f} us   max {us[-1]:9.1f} us")
+        print(f"  flushes           {outcomes.buffer.flushes:12,}   "
+              f"avg batch {outcomes.buffer.flushed / max(outcomes.buffer.flushes, 1):10,.0f}")
+        print(f"  results read      {read_ms:12.2f} ms")
+        print(f"  log replay        {rebuilt:12,} outcomes   mean drift vs streamed {drift:.2e}")
+        ok = rebuilt == total == sum(streamed.values())
+        print("  counts match" if ok else "  COUNT MISMATCH")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(_tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
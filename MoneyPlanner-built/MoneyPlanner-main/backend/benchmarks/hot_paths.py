@@ -0,0 +1,281 @@
+"""Benchmark suite — backend hot paths at 1k/10k/100k (opt-in 1M) transactions per user.
+
+  cd backend && python -m benchmarks.hot_paths
+  python -m benchmarks.hot_paths --sizes 1k,10k --only routes,persistence
+  python -m benchmarks.hot_paths --compare benchmarks/results/<baseline>.json
+
+Each run writes JSON (machine info, git commit, per-benchmark timings) to
+benchmarks/results/, or --output. With --compare, benchmarks slower than the
+baseline by more than --threshold are listed and the exit code is 1.
+
+Runs against a throwaway DATA_DIR; synthetic users come from
+benchmarks.synthetic.
+"""
+
+import os
+import tempfile
+
+# Must be set before app/services are imported (they resolve DATA_DIR on import)
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="moneyplanner-bench-")
+os.environ.setdefault("DEV_MODE", "true")
+os.environ.setdefault("ADMISSION_ENABLED", "false")  # Measure the views, not the rate limiter
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import shutil  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+import app as app_module  # noqa: E402
+from benchmarks.synthetic import (  # noqa: E402
+    FakePlaid,
+    as_plaid_objects,
+    make_income_events,
+    make_transactions,
+    seed_user,
+)
+from models.income import IncomeEvent  # noqa: E402
+from models.transaction import Transaction  # noqa: E402
+from services.categories import map_category  # noqa: E402
+from services.monitoring_service import compute_safe_to_spend, generate_weekly_review  # noqa: E402
+from services.persistence import (  # noqa: E402
+    DATA_DIR,
+    append_one,
+    bump_version,
+    load_all,
+    load_latest,
+    save_all,
+    user_dir,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SIZES = "1k,10k,100k"
+MIN_RUNS = 3
+MIN_SECONDS = 0.5  # Repeat beyond MIN_RUNS until this much time is spent...
+MAX_RUNS = 20      # ...but never more than this
+
+
+def _measure(fn, setup=None) -> dict:
+    timings = []
+    while len(timings) < MIN_RUNS or (len(timings) < MAX_RUNS and sum(timings) < MIN_SECONDS):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "runs": len(timings),
+    }
+
+
+# --- Benchmarks: each takes (user_id, n) and yields (name, result) ---
+
+def bench_categories(user_id: str, n: int):
+    txns = make_transactions(n, seed=1)
+    yield "map_category", _measure(lambda: [map_category(t) for t in txns])
+
+
+def bench_sync(user_id: str, n: int):
+    plaid_txns = as_plaid_objects(make_transactions(n, seed=2, prefix="sync"))
+    yield "txn_to_dict", _measure(lambda: [app_module.txn_to_dict(t) for t in plaid_txns])
+
+    # Initial sync of one item: paging, txn_to_dict, merge and store
+    app_module.plaid_client = FakePlaid(plaid_txns)
+
+    def reset_item():
+        tokens = app_module.load_tokens(user_id)
+        tokens["item-0"]["cursor"] = ""
+        app_module.save_tokens(tokens, user_id)
+        all_txns = app_module.load_transactions(user_id)
+        all_txns["item-0"] = []
+        app_module.save_transactions(all_txns, user_id)
+
+    yield "sync_transactions.initial", _measure(
+        lambda: app_module.sync_transactions("item-0", user_id), setup=reset_item
+    )
+
+    # Incremental merge into existing history: 1% each added/modified/removed
+    existing = make_transactions(n, seed=3)
+    k = max(n // 100, 1)
+    added = make_transactions(k, seed=4, prefix="new")
+    modified = [dict(t, amount=t["amount"] + 1) for t in existing[:k]]
+    removed = [t["transaction_id"] for t in existing[-k:]]
+    yield "sync_transactions.merge", _measure(
+        lambda: app_module._merge_item_changes(list(existing), added, modified, removed)
+    )
+
+
+def bench_routes(user_id: str, n: int):
+    client = app_module.create_app().test_client()
+    headers = {"X-Dev-User-Id": user_id}
+
+    def invalidate():
+        bump_version("transactions", user_id)
+
+    def get(path):
+        resp = client.get(path, headers=headers)
+        assert resp.status_code == 200, resp.status_code
+
+    yield "api_budget_summary", _measure(lambda: get("/api/budget/summary"), setup=invalidate)
+    yield "api_budget_summary.cached", _measure(lambda: get("/api/budget/summary"))
+    yield "api_plaid_income", _measure(lambda: get("/api/plaid/income"), setup=invalidate)
+
+
+def bench_monitoring(user_id: str, n: int):
+    yield "compute_safe_to_spend", _measure(lambda: compute_safe_to_spend(user_id))
+    yield "generate_weekly_review", _measure(lambda: generate_weekly_review(user_id))
+
+
+def bench_persistence(user_id: str, n: int):
+    # Separate list-shaped collection; "transactions" is item-keyed app storage
+    rows = [
+        Transaction.from_dict(t).to_dict() for t in make_transactions(n, seed=5, prefix="p")
+    ]
+    extra = Transaction.from_dict(make_transactions(1, seed=6, prefix="x")[0])
+    yield "persistence.save_all", _measure(lambda: save_all("bench_transactions", rows, user_id))
+    yield "persistence.load_all", _measure(
+        lambda: load_all("bench_transactions", Transaction.from_dict, user_id)
+    )
+    yield "persistence.append_one", _measure(
+        lambda: append_one("bench_transactions", extra, user_id),
+        setup=lambda: save_all("bench_transactions", rows, user_id),
+    )
+    save_all("bench_transactions", rows, user_id)
+    yield "persistence.load_all[-1]", _measure(
+        lambda: load_all("bench_transactions", Transaction.from_dict, user_id)[-1]
+    )
+    yield "persistence.load_latest", _measure(
+        lambda: load_latest("bench_transactions", Transaction.from_dict, user_id)
+    )
+
+
+def bench_models(user_id: str, n: int):
+    rows = [Transaction.from_dict(t).to_dict() for t in make_transactions(n, seed=8, prefix="m")]
+    objects = [Transaction.from_dict(r) for r in rows]
+    yield "Transaction.from_dict", _measure(lambda: [Transaction.from_dict(r) for r in rows])
+    yield "Transaction.to_dict", _measure(lambda: [t.to_dict() for t in objects])
+
+
+def bench_income(user_id: str, n: int):
+    events = [IncomeEvent.from_dict(d) for d in make_income_events(n, seed=7)]
+    yield "IncomeEvent.compute_rolling_average", _measure(
+        lambda: IncomeEvent.compute_rolling_average(events)
+    )
+
+
+GROUPS = {
+    "categories": bench_categories,
+    "sync": bench_sync,
+    "routes": bench_routes,
+    "monitoring": bench_monitoring,
+    "persistence": bench_persistence,
+    "models": bench_models,
+    "income": bench_income,
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: list[str], groups: list[str], startup: bool) -> dict:
+    results = []
+    if startup:
+        from tools.import_profile import run_once
+
+        timings = [run_once()[0]["startup_ms"] for _ in range(3)]
+        result = {"median_ms": round(statistics.median(timings), 3),
+                  "min_ms": round(min(timings), 3), "runs": len(timings)}
+        results.append({"name": "startup.import_and_create_app", "size": 0, **result})
+        print(f"  {'startup.import_and_create_app':<40} {'':>6} {result['median_ms']:>12.2f} ms")
+
+    for label in sizes:
+        n = SIZES[label]
+        user_id = f"bench-{label}"
+        seed_user(user_id, n)
+        for group in groups:
+            for name, result in GROUPS[group](user_id, n):
+                results.append({"name": name, "size": n, **result})
+                print(f"  {name:<40} {label:>6} {result['median_ms']:>12.2f} ms  ({result['runs']} runs)")
+        shutil.rmtree(user_dir(user_id), ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Benchmarks whose median grew by more than `threshold` (ratio) vs baseline."""
+    base = {(r["name"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\nvs baseline {baseline['meta'].get('git_commit')} ({baseline['meta']['timestamp']}):")
+    for r in current["results"]:
+        old = base.get((r["name"], r["size"]))
+        if old is None or not old["median_ms"]:
+            continue
+        ratio = r["median_ms"] / old["median_ms"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"  {r['name']:<40} {r['size']:>8} {old['median_ms']:>10.2f} → {r['median_ms']:>10.2f} ms  ×{ratio:.2f}{flag}")
+        if ratio > threshold:
+            regressions.append({**r, "baseline_ms": old["median_ms"], "ratio": round(ratio, 3)})
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark backend hot paths")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma list of {', '.join(SIZES)}")
+    parser.add_argument("--only", default=",".join(GROUPS), help=f"Comma list of {', '.join(GROUPS)}")
+    parser.add_argument("--no-startup", action="store_true", help="Skip the cold-start benchmark")
+    parser.add_argument("--output", type=Path, help="Results JSON (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Regression ratio (default 1.25)")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = [s for s in sizes if s not in SIZES] + [g for g in groups if g not in GROUPS]
+    if unknown:
+        parser.error(f"Unknown size/benchmark: {', '.join(unknown)}")
+
+    try:
+        report = run(sizes, groups, startup=not args.no_startup)
+    finally:
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+    output = args.output or RESULTS_DIR / f"{report['meta']['timestamp'].replace(':', '')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than ×{args.threshold}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,307 @@
+"""Load test — the real app under a weighted mix of user sessions.
+
+Boots create_app() behind gunicorn (default: 2 gthread workers, as deployed)
+or an in-process threaded server. Firebase is replaced by a local key set
+(tokens are signed here and verified by the app's TokenVerifier) and Plaid by
+benchmarks.synthetic.FakePlaid with a configurable per-call delay. N
+synthetic users are seeded into a throwaway DATA_DIR, then sessions arrive
+open-loop at --rate per second:
+
+  cd backend && python -m benchmarks.loadtest --users 200 --rate 20 --duration 60
+  python -m benchmarks.loadtest --server inprocess --rate 5 --duration 10
+
+The report gives throughput, per-route latency percentiles and error rates,
+plus how long sessions queued for a free client (if that grows, the server
+isn't keeping up with the target rate).
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from benchmarks.synthetic import FakePlaid, LocalKeySet, seed_user
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Weighted sessions: (weight, [(method, path, json body or None), ...])
+SCENARIOS = {
+    "app_open": (50, [
+        ("GET", "/api/auth/verify", None),
+        ("GET", "/api/phase", None),
+        ("GET", "/api/safe-to-spend", None),
+        ("GET", "/api/reviews/weekly", None),
+    ]),
+    "budget_view": (25, [
+        ("GET", "/api/budget/summary", None),
+        ("GET", "/api/budget/items", None),
+        ("POST", "/api/plaid/transactions", {}),
+    ]),
+    "sync": (15, [
+        ("POST", "/api/plaid/sync", {}),
+        ("GET", "/api/plaid/accounts", None),
+    ]),
+    "income_log": (10, [
+        ("POST", "/api/income", "income"),
+        ("GET", "/api/income/history", None),
+    ]),
+}
+
+
+def create_app():
+    """Server-side factory: the real app with a local token verifier and fake Plaid.
+
+    Configured from the environment the harness passes to gunicorn.
+    """
+    import app as app_module
+    from services.token_cache import TokenVerifier
+
+    keys = LocalKeySet.load(os.environ["LOADTEST_KEY_FILE"])
+    app_module._firebase_initialized = True  # Skip service-account lookup
+    app_module.token_verifier = TokenVerifier(
+        app_module.FIREBASE_PROJECT_ID, cert_fetcher=keys.cert_fetcher
+    )
+    app_module.plaid_client = FakePlaid(
+        [],
+        delay=float(os.environ.get("LOADTEST_PLAID_DELAY", "0.3")),
+        trickle=int(os.environ.get("LOADTEST_PLAID_TRICKLE", "5")),
+    )
+    return app_module.create_app()
+
+
+# --- Server ---
+
+def _start_gunicorn(port: int, args) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(args.workers),
+        "WEB_THREADS": str(args.threads),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+         "--bind", f"127.0.0.1:{port}", "--log-level", "warning",
+         "benchmarks.loadtest:create_app()"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+def _start_inprocess():
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _wait_healthy(base: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base}/health", timeout=2):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base} did not become healthy")
+
+
+# --- Client ---
+
+class Session:
+    """One synthetic user: bearer token plus ETags seen so far (like the app's client)."""
+
+    def __init__(self, base: str, user_id: str, token: str):
+        self.base = base
+        self.user_id = user_id
+        self.headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+        self.etags = {}
+
+    def request(self, method: str, path: str, body) -> tuple[int, float]:
+        if body == "income":
+            body = {"amount": round(random.uniform(2400, 3200), 2),
+                    "date": date.today().isoformat(), "source_description": "Payroll"}
+        headers = dict(self.headers)
+        if method == "GET" and path in self.etags:
+            headers["If-None-Match"] = self.etags[path]
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base + path, data=data, method=method, headers=headers)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                resp.read()
+                status = resp.status
+                if resp.headers.get("ETag"):
+                    self.etags[path] = resp.headers["ETag"]
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code  # 304 lands here too
+        except OSError:
+            status = 0  # Connection error / timeout
+        return status, time.perf_counter() - start
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def replay(sessions: list[Session], rate: float, duration: float, concurrency: int) -> dict:
+    """Start sessions as a Poisson process at `rate`/s; return per-route samples."""
+    names = list(SCENARIOS)
+    weights = [SCENARIOS[n][0] for n in names]
+    samples = defaultdict(list)  # "METHOD path" → [(status, seconds)]
+    queue_delays = []
+    lock = threading.Lock()
+
+    def run_session(scheduled: float):
+        queued = time.perf_counter() - scheduled
+        session = random.choice(sessions)
+        steps = SCENARIOS[random.choices(names, weights)[0]][1]
+        results = [(f"{m} {p}", session.request(m, p, b)) for m, p, b in steps]
+        with lock:
+            queue_delays.append(queued)
+            for route, sample in results:
+                samples[route].append(sample)
+
+    start = time.perf_counter()
+    next_at = start
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while next_at < start + duration:
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+            pool.submit(run_session, next_at)
+            next_at += random.expovariate(rate)
+    elapsed = time.perf_counter() - start
+    return {"elapsed": elapsed, "samples": samples, "queue_delays": queue_delays}
+
+
+def report(result: dict, args) -> dict:
+    samples = result["samples"]
+    elapsed = result["elapsed"]
+    total = sum(len(s) for s in samples.values())
+    routes = {}
+    for route, rows in sorted(samples.items()):
+        latencies = [secs * 1000 for _, secs in rows]
+        errors = sum(1 for status, _ in rows if status == 0 or status >= 500)
+        client_errors = sum(1 for status, _ in rows if 400 <= status < 500)
+        routes[route] = {
+            "requests": len(rows),
+            "not_modified": sum(1 for status, _ in rows if status == 304),
+            "error_rate": round(errors / len(rows), 4),
+            "client_error_rate": round(client_errors / len(rows), 4),
+            "p50_ms": round(_percentile(latencies, 50), 1),
+            "p90_ms": round(_percentile(latencies, 90), 1),
+            "p99_ms": round(_percentile(latencies, 99), 1),
+            "max_ms": round(max(latencies), 1),
+        }
+    delays = [d * 1000 for d in result["queue_delays"]] or [0.0]
+    return {
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "elapsed_s": round(elapsed, 2),
+        "sessions": len(result["queue_delays"]),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1),
+        "error_rate": round(
+            sum(r["error_rate"] * r["requests"] for r in routes.values()) / max(total, 1), 4
+        ),
+        "session_queue_ms": {
+            "p50": round(_percentile(delays, 50), 1),
+            "p99": round(_percentile(delays, 99), 1),
+            "mean": round(statistics.fmean(delays), 1),
+        },
+        "routes": routes,
+    }
+
+
+def _print_report(rep: dict):
+    print(f"\n{rep['sessions']} sessions, {rep['requests']} requests in {rep['elapsed_s']} s "
+          f"— {rep['throughput_rps']} req/s, error rate {rep['error_rate']:.2%}, "
+          f"session queueing p99 {rep['session_queue_ms']['p99']} ms")
+    print(f"\n  {'route':<32} {'reqs':>6} {'304':>5} {'err%':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for route, r in rep["routes"].items():
+        print(f"  {route:<32} {r['requests']:>6} {r['not_modified']:>5} {r['error_rate']:>6.1%} "
+              f"{r['p50_ms']:>8.1f} {r['p90_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end load test with fake Firebase/Plaid")
+    parser.add_argument("--server", choices=("gunicorn", "inprocess"), default="gunicorn")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per gunicorn worker")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--txns", type=int, default=2000, help="Transactions per user")
+    parser.add_argument("--rate", type=float, default=10, help="New sessions per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds")
+    parser.add_argument("--concurrency", type=int, default=64, help="Max sessions in flight")
+    parser.add_argument("--plaid-delay", type=float, default=0.3, help="Seconds per Plaid call")
+    parser.add_argument("--port", type=int, default=5077)
+    parser.add_argument("--output", type=Path, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="moneyplanner-load-")
+    keys = LocalKeySet.generate()
+    key_file = os.path.join(workdir, "signing-key.pem")
+    keys.save(key_file)
+    # Read by the app at import (this process and gunicorn's)
+    os.environ.update({
+        "DATA_DIR": os.path.join(workdir, "data"),
+        "DEV_MODE": "false",
+        "LOADTEST_KEY_FILE": key_file,
+        "LOADTEST_PLAID_DELAY": str(args.plaid_delay),
+        "PROMETHEUS_MULTIPROC_DIR": os.path.join(workdir, "metrics"),
+    })
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+
+    import app as app_module
+
+    server = proc = None
+    try:
+        print(f"Seeding {args.users} users × {args.txns} transactions...")
+        user_ids = [f"load-user-{i}" for i in range(args.users)]
+        for i, user_id in enumerate(user_ids):
+            seed_user(user_id, args.txns, seed=i)
+
+        if args.server == "gunicorn":
+            proc = _start_gunicorn(args.port, args)
+            base = f"http://127.0.0.1:{args.port}"
+        else:
+            server = _start_inprocess()
+            base = f"http://127.0.0.1:{server.server_port}"
+        _wait_healthy(base)
+
+        sessions = [
+            Session(base, uid, keys.sign(uid, app_module.FIREBASE_PROJECT_ID)) for uid in user_ids
+        ]
+        print(f"Replaying {args.rate}/s sessions for {args.duration:g} s against {args.server}...")
+        rep = report(replay(sessions, args.rate, args.duration, args.concurrency), args)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+        if server is not None:
+            server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    _print_report(rep)
+    if args.output:
+        args.output.write_text(json.dumps(rep, indent=2))
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
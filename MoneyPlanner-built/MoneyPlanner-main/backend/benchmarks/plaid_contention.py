@@ -0,0 +1,127 @@
+"""Load test — latency of a cheap endpoint while Plaid calls are slow.
+
+Serves the real app with a stand-in Plaid client that sleeps on every call,
+keeps several clients hammering /api/plaid/sync, and probes /api/phase.
+Runs once single-threaded (what a sync gunicorn worker does) and once
+threaded (gthread worker + async Plaid views):
+
+  cd backend && python -m benchmarks.plaid_contention --plaid-delay 0.5
+"""
+
+import argparse
+import logging
+import shutil
+import statistics
+import threading
+import time
+import urllib.request
+from types import SimpleNamespace
+
+from werkzeug.serving import make_server
+
+import app as app_module
+from services.persistence import user_dir
+
+USER = "bench-contention"
+
+
+class SlowPlaid:
+    """Plaid stand-in: fixed latency per call, empty sync pages."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def transactions_sync(self, req):
+        time.sleep(self.delay)
+        return SimpleNamespace(added=[], modified=[], removed=[], next_cursor="c", has_more=False)
+
+    def accounts_get(self, req):
+        time.sleep(self.delay)
+        return SimpleNamespace(accounts=[])
+
+
+def _request(port: int, path: str, method: str = "GET") -> float:
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{port}{path}", method=method,
+        headers={"X-Dev-User-Id": USER}, data=b"" if method == "POST" else None,
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        resp.read()
+    return time.perf_counter() - start
+
+
+def run(threaded: bool, args) -> dict:
+    server = make_server("127.0.0.1", 0, app_module.create_app(), threaded=threaded)
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    stop = threading.Event()
+    sync_latencies = []
+
+    def sync_client():
+        while not stop.is_set():
+            sync_latencies.append(_request(port, "/api/plaid/sync", "POST"))
+
+    clients = [threading.Thread(target=sync_client) for _ in range(args.sync_clients)]
+    for c in clients:
+        c.start()
+    time.sleep(args.plaid_delay / 2)
+
+    probes = []
+    deadline = time.perf_counter() + args.duration
+    while time.perf_counter() < deadline:
+        probes.append(_request(port, "/api/phase"))
+        time.sleep(args.probe_interval)
+
+    stop.set()
+    for c in clients:
+        c.join()
+    server.shutdown()
+
+    probes.sort()
+    return {
+        "mode": "threaded" if threaded else "single-threaded",
+        "probes": len(probes),
+        "phase_p50_ms": statistics.median(probes) * 1000,
+        "phase_p99_ms": probes[min(len(probes) - 1, int(len(probes) * 0.99))] * 1000,
+        "syncs": len(sync_latencies),
+        "sync_mean_ms": statistics.mean(sync_latencies) * 1000 if sync_latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plaid-delay", type=float, default=0.5, help="Seconds per Plaid call")
+    parser.add_argument("--items", type=int, default=3, help="Linked items for the test user")
+    parser.add_argument("--sync-clients", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    args = parser.parse_args()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    app_module.plaid_client = SlowPlaid(args.plaid_delay)
+    app_module.save_tokens({
+        f"item-{i}": {
+            "access_token": app_module.encrypt(f"access-bench-{i}"),
+            "institution_name": f"Bench Bank {i}",
+            "cursor": "",
+        }
+        for i in range(args.items)
+    }, USER)
+
+    try:
+        print(f"Plaid delay {args.plaid_delay}s × {args.items} items, {args.sync_clients} sync clients")
+        for threaded in (False, True):
+            r = run(threaded, args)
+            print(
+                f"  {r['mode']:<16} /api/phase p50 {r['phase_p50_ms']:8.1f} ms  "
+                f"p99 {r['phase_p99_ms']:8.1f} ms  ({r['probes']} probes)  "
+                f"/api/plaid/sync {r['syncs']} done, mean {r['sync_mean_ms']:.0f} ms"
+            )
+    finally:
+        shutil.rmtree(user_dir(USER), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
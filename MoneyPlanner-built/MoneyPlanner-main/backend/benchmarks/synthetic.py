@@ -0,0 +1,223 @@
+"""Synthetic users for benchmarks and load tests.
+
+Transactions look like what sync_transactions stores (txn_to_dict output):
+Plaid detailed categories, a mix of merchant-override hits and misses, pay
+cheques and e-transfers as negative amounts, dates spread over the last
+`days` days. Generation is seeded, so a size always produces the same data.
+"""
+
+import itertools
+import os
+import random
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+# (name, merchant, Plaid detailed category or "", amount range)
+MERCHANTS = [
+    ("NETFLIX.COM", "Netflix", "ENTERTAINMENT_TV_AND_MOVIES", (16.49, 16.49)),
+    ("SPOTIFY P0A1B2", "Spotify", "ENTERTAINMENT_MUSIC_AND_AUDIO", (10.99, 10.99)),
+    ("LOBLAWS #1032", "Loblaws", "FOOD_AND_DRINK_GROCERIES", (20, 240)),
+    ("TIM HORTONS #2291", "Tim Hortons", "FOOD_AND_DRINK_COFFEE", (2, 14)),
+    ("UBER *TRIP", "Uber", "TRANSPORTATION_TAXIS_AND_RIDE_SHARES", (8, 45)),
+    ("SHELL C01234", "Shell", "TRANSPORTATION_GAS", (35, 110)),
+    ("HYDRO ONE", "Hydro One", "RENT_AND_UTILITIES_GAS_AND_ELECTRICITY", (60, 180)),
+    ("ROGERS WIRELESS", "Rogers", "RENT_AND_UTILITIES_TELEPHONE", (55, 95)),
+    ("AMAZON.CA", "Amazon", "GENERAL_MERCHANDISE_ONLINE_MARKETPLACES", (12, 300)),
+    ("SHOPPERS DRUG MART", "Shoppers Drug Mart", "MEDICAL_PHARMACIES_AND_SUPPLEMENTS", (6, 80)),
+    ("POS PURCHASE 4471", "", "", (5, 120)),
+    ("RENT PAYMENT", "", "RENT_AND_UTILITIES_RENT", (1800, 2200)),
+]
+INCOME = [
+    ("PAYROLL DEPOSIT", "", "INCOME_WAGES", (-3200, -2400)),
+    ("INTERAC E-TRANSFER FROM J SMITH", "", "TRANSFER_IN_ACCOUNT_TRANSFER", (-300, -20)),
+]
+INCOME_SHARE = 0.08
+
+
+def _category_label(detailed: str) -> str:
+    # Stored the way txn_to_dict formats personal_finance_category.detailed
+    return detailed.replace("_", " ").title()
+
+
+def make_transactions(n: int, seed: int = 0, days: int = 365, prefix: str = "txn") -> list[dict]:
+    """n stored-format transactions, newest first (as Plaid returns them)."""
+    rng = random.Random(seed)
+    today = date.today()
+    txns = []
+    for i in range(n):
+        name, merchant, category, (low, high) = rng.choice(
+            INCOME if rng.random() < INCOME_SHARE else MERCHANTS
+        )
+        txns.append({
+            "transaction_id": f"{prefix}-{seed}-{i}",
+            "date": (today - timedelta(days=days * i // max(n, 1))).isoformat(),
+            "name": name,
+            "merchant": merchant,
+            "amount": round(rng.uniform(low, high), 2),
+            "category": _category_label(category) if category else "",
+            "pending": rng.random() < 0.02,
+            "account_id": f"acct-{rng.randrange(3)}",
+        })
+    return txns
+
+
+def as_plaid_objects(txns: list[dict]) -> list[SimpleNamespace]:
+    """Wrap stored-format transactions as Plaid SDK-like objects (for txn_to_dict)."""
+    return [
+        SimpleNamespace(
+            transaction_id=t["transaction_id"],
+            date=t["date"],
+            name=t["name"],
+            merchant_name=t["merchant"] or None,
+            amount=t["amount"],
+            pending=t["pending"],
+            account_id=t["account_id"],
+            personal_finance_category=SimpleNamespace(
+                detailed=t["category"].upper().replace(" ", "_")
+            ) if t["category"] else None,
+        )
+        for t in txns
+    ]
+
+
+def make_income_events(n: int, seed: int = 0) -> list[dict]:
+    """n semi-monthly pay events (IncomeEvent.to_dict shape, ids omitted).
+
+    Large n are packed closer together so dates stay within ten years.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    step = min(15.0, 3650 / max(n, 1))
+    return [
+        {
+            "amount": round(rng.uniform(2400, 3200), 2),
+            "date": (today - timedelta(days=int(step * i))).isoformat(),
+            "source": "plaid",
+            "source_description": "PAYROLL DEPOSIT",
+            "is_recurring": True,
+        }
+        for i in range(n)
+    ]
+
+
+class FakePlaid:
+    """Plaid client stand-in serving a fixed transaction set via /transactions/sync.
+
+    The cursor is the offset into `transactions`; each call returns one page.
+    Past the end, each call returns `trickle` brand-new transactions (so
+    repeated syncs keep merging and writing, like a live account). `delay`
+    sleeps per call to mimic Plaid's network latency.
+    """
+
+    def __init__(self, transactions: list[SimpleNamespace], page_size: int = 500,
+                 delay: float = 0.0, trickle: int = 0):
+        self.transactions = transactions
+        self.page_size = page_size
+        self.delay = delay
+        self.trickle = trickle
+        self._batches = itertools.count()
+
+    def transactions_sync(self, req):
+        time.sleep(self.delay)
+        start = int(req.cursor or 0)
+        if start >= len(self.transactions):
+            batch = next(self._batches)
+            added = as_plaid_objects(
+                make_transactions(self.trickle, seed=batch, days=1, prefix=f"live{os.getpid()}")
+            )
+            return SimpleNamespace(added=added, modified=[], removed=[],
+                                   next_cursor=str(start), has_more=False)
+        end = min(start + self.page_size, len(self.transactions))
+        return SimpleNamespace(
+            added=self.transactions[start:end], modified=[], removed=[],
+            next_cursor=str(end), has_more=end < len(self.transactions),
+        )
+
+    def accounts_get(self, req):
+        time.sleep(self.delay)
+        return SimpleNamespace(accounts=[])
+
+
+class LocalKeySet:
+    """RSA key standing in for Firebase's signing keys.
+
+    Signs Firebase-shaped ID tokens and serves the public key through
+    cert_fetcher, so a services.token_cache.TokenVerifier can verify them
+    without network access. save()/load() share it with server processes.
+    """
+
+    KID = "local-test-key"
+
+    def __init__(self, private_pem: bytes):
+        from cryptography.hazmat.primitives import serialization
+        from google.auth import crypt
+
+        self.private_pem = private_pem
+        key = serialization.load_pem_private_key(private_pem, password=None)
+        self.public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+        self._signer = crypt.RSASigner.from_string(private_pem, key_id=self.KID)
+
+    @classmethod
+    def generate(cls) -> "LocalKeySet":
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return cls(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+
+    @classmethod
+    def load(cls, path: str) -> "LocalKeySet":
+        with open(path, "rb") as fh:
+            return cls(fh.read())
+
+    def save(self, path: str):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(self.private_pem)
+
+    def cert_fetcher(self) -> tuple[dict, int]:
+        return {self.KID: self.public_pem}, 3600
+
+    def sign(self, uid: str, project_id: str, ttl: int = 3600) -> str:
+        from google.auth import jwt
+
+        now = int(time.time())
+        return jwt.encode(self._signer, {
+            "iss": f"https://securetoken.google.com/{project_id}",
+            "aud": project_id,
+            "sub": uid,
+            "iat": now,
+            "exp": now + ttl,
+            "auth_time": now,
+            "email": f"{uid}@example.com",
+        }).decode()
+
+
+def seed_user(user_id: str, n_txns: int, items: int = 2, seed: int = 0, income_events: int = 24):
+    """Write tokens, transactions (split across items) and income events for a user."""
+    import app as app_module
+    from services.persistence import save_all
+
+    tokens, all_txns = {}, {}
+    txns = make_transactions(n_txns, seed)
+    for k in range(items):
+        item_id = f"item-{k}"
+        tokens[item_id] = {
+            "access_token": app_module.encrypt(f"access-sandbox-{user_id}-{k}"),
+            "institution_name": f"Synthetic Bank {k}",
+            "institution_id": f"ins_{k}",
+            "connected_at": date.today().isoformat(),
+            "cursor": "",
+            "last_sync": None,
+        }
+        all_txns[item_id] = txns[k::items]
+    app_module.save_tokens(tokens, user_id)
+    app_module.save_transactions(all_txns, user_id)
+    save_all("income_events", make_income_events(income_events, seed), user_id=user_id)
+
@@ -0,0 +1,92 @@
+"""Gunicorn config — threaded workers so slow Plaid calls don't block cheap requests.
+
+  gunicorn -c gunicorn.conf.py "app:create_app()"
+
+With sync workers each worker handles one request at a time, so two slow
+Plaid syncs starve every other user. gthread workers serve WEB_THREADS
+requests concurrently per worker; Plaid-bound views are async and fan out
+per item on their own I/O pool (see app._offload).
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5050')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", "8"))
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+
+# Workers write Prometheus values to files here so /metrics, served by any
+# worker, aggregates all of them (see services/metrics.py). Must exist before
+# the app (and prometheus_client) is imported, which preload does right after
+# this file is read. Stale files from a previous run would be summed into the
+# new totals, so clear it once per master (not again on config reload).
+metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/moneyplanner-metrics")
+if not os.environ.get("METRICS_DIR_CLEARED"):
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.environ["METRICS_DIR_CLEARED"] = "1"
+os.makedirs(metrics_dir, exist_ok=True)
+
+# Import the app once in the master so workers fork with it already loaded;
+# the heavy SDKs that app.py imports lazily are warmed here too, so neither
+# worker boot nor the first Plaid/Firebase request pays their import cost.
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+# The master also runs the job worker (tools/job_worker.py) as a supervised
+# child, so the web service alone works its queue. Set JOB_WORKERS_IN_WEB=false
+# when a separate worker service with the same DATA_DIR volume runs them.
+job_workers_in_web = os.getenv("JOB_WORKERS_IN_WEB", "true").lower() == "true"
+_job_worker: subprocess.Popen | None = None
+_stopping = threading.Event()
+
+
+def _supervise_job_worker(server):
+    global _job_worker
+    backoff = 1.0
+    while not _stopping.is_set():
+        started = time.monotonic()
+        _job_worker = subprocess.Popen(
+            [sys.executable, "-m", "tools.job_worker"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        # The arbiter reaps any exited child; wait() still returns then
+        code = _job_worker.wait()
+        if _stopping.is_set():
+            return
+        backoff = 1.0 if time.monotonic() - started > 60 else min(backoff * 2, 60.0)
+        server.log.warning("Job worker exited (%s), restarting in %gs", code, backoff)
+        _stopping.wait(backoff)
+
+
+def when_ready(server):
+    if preload_app:
+        import app
+
+        app.preload_heavy_modules()
+    if job_workers_in_web:
+        threading.Thread(
+            target=_supervise_job_worker, args=(server,), name="job-worker", daemon=True
+        ).start()
+
+
+def on_exit(server):
+    _stopping.set()
+    if _job_worker is not None and _job_worker.poll() is None:
+        _job_worker.terminate()  # Finishes its current job, then exits
+        try:
+            _job_worker.wait(timeout=graceful_timeout)
+        except subprocess.TimeoutExpired:
+            _job_worker.kill()
+
+
+def child_exit(server, worker):
+    from services.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
@@ -0,0 +1,95 @@
+"""Model base — slotted dataclasses with generated to_dict/from_dict.
+
+@model turns a class body of annotated fields into a keyword-only slotted
+dataclass (no per-instance __dict__) and compiles a to_dict/from_dict pair
+specialised to its fields. from_dict fills slots directly instead of going
+through __init__, so a record loaded from disk keeps its stored id and
+created_at without generating throwaway ones first; default factories only
+run for keys the record is missing. __post_init__, if defined, runs after
+both construction and loading (derived fields, coercions).
+
+Fields with nested values declare their codec in metadata:
+  field(default=None, metadata={"to_dict": encode, "from_dict": decode})
+Constructor-required fields name the value a record missing them loads with:
+  amount: float = required(0.0)
+"""
+
+import uuid
+from dataclasses import MISSING, dataclass, field, fields
+from datetime import datetime
+
+
+def new_id() -> str:
+    return str(uuid.uuid4())
+
+
+def utcnow_iso() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def id_field():
+    return field(default_factory=new_id)
+
+
+def timestamp_field():
+    return field(default_factory=utcnow_iso)
+
+
+def required(load_default):
+    """A field the constructor requires; from_dict falls back to load_default."""
+    return field(metadata={"load_default": load_default})
+
+
+def _compile(source: str, namespace: dict, name: str):
+    exec(source, namespace)
+    return namespace[name]
+
+
+def _make_to_dict(cls):
+    namespace = {}
+    items = []
+    for f in fields(cls):
+        if "to_dict" in f.metadata:
+            namespace[f"_enc_{f.name}"] = f.metadata["to_dict"]
+            items.append(f"{f.name!r}: _enc_{f.name}(self.{f.name})")
+        else:
+            items.append(f"{f.name!r}: self.{f.name}")
+    source = "def to_dict(self):\n    return {" + ", ".join(items) + "}\n"
+    return _compile(source, namespace, "to_dict")
+
+
+def _make_from_dict(cls):
+    namespace = {"_new": object.__new__}
+    lines = ["def from_dict(cls, d):", "    get = d.get", "    self = _new(cls)"]
+    for f in fields(cls):
+        name = f.name
+        if f.default is not MISSING:
+            namespace[f"_def_{name}"] = f.default
+            value = f"get({name!r}, _def_{name})"
+        elif f.default_factory is not MISSING:
+            namespace[f"_fac_{name}"] = f.default_factory
+            value = f"get({name!r}) or _fac_{name}()"
+        elif "load_default" in f.metadata:
+            namespace[f"_def_{name}"] = f.metadata["load_default"]
+            value = f"get({name!r}, _def_{name})"
+        else:
+            value = f"d[{name!r}]"
+        if "from_dict" in f.metadata:
+            namespace[f"_dec_{name}"] = f.metadata["from_dict"]
+            value = f"_dec_{name}({value})"
+        lines.append(f"    self.{name} = {value}")
+    if hasattr(cls, "__post_init__"):
+        lines.append("    self.__post_init__()")
+    lines.append("    return self")
+    return classmethod(_compile("\n".join(lines) + "\n", namespace, "from_dict"))
+
+
+def model(cls):
+    """Class decorator: slotted keyword-only dataclass plus generated codecs.
+
+    eq=False keeps identity equality and hashing, as plain classes had.
+    """
+    cls = dataclass(slots=True, kw_only=True, eq=False)(cls)
+    cls.to_dict = _make_to_dict(cls)
+    cls.from_dict = _make_from_dict(cls)
+    return cls
@@ -1,8 +1,10 @@
 """User phase model — tracks progression through app phases."""
 
+from dataclasses import field
 from datetime import datetime, timedelta
 from enum import Enum
-import uuid
+
+from models.base import id_field, model, utcnow_iso
 
 
 class Phase(str, Enum):
@@ -22,41 +24,17 @@ PHASE_ORDER = [
 ]
 
 
+@model
 class UserPhaseState:
-    def __init__(
-        self,
-        user_id: str = "user-1",
-        current_phase: Phase = Phase.ONBOARDING,
-        phase_entered_at: str | None = None,
-        history: list | None = None,
-        id: str | None = None,
-    ):
-        self.id = id or str(uuid.uuid4())
-        self.user_id = user_id
-        self.current_phase = (
-            Phase(current_phase) if isinstance(current_phase, str) else current_phase
-        )
-        self.phase_entered_at = phase_entered_at or datetime.utcnow().isoformat()
-        self.history = history or []
-
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "current_phase": self.current_phase.value,
-            "phase_entered_at": self.phase_entered_at,
-            "history": self.history,
-        }
-
-    @classmethod
-    def from_dict(cls, d: dict) -> "UserPhaseState":
-        return cls(
-            id=d.get("id"),
-            user_id=d.get("user_id", "user-1"),
-            current_phase=d.get("current_phase", "onboarding"),
-            phase_entered_at=d.get("phase_entered_at"),
-            history=d.get("history", []),
-        )
+    id: str = id_field()
+    user_id: str = "user-1"
+    current_phase: Phase = field(default=Phase.ONBOARDING, metadata={"to_dict": lambda p: p.value})
+    phase_entered_at: str = field(default_factory=utcnow_iso)
+    history: list = field(default_factory=list)
+
+    def __post_init__(self):
+        if not isinstance(self.current_phase, Phase):
+            self.current_phase = Phase(self.current_phase)
 
     def days_in_phase(self) -> float:
         entered = datetime.fromisoformat(self.phase_entered_at)
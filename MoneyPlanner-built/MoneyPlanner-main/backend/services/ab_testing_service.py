@@ -1,38 +1,281 @@
-"""A/B testing service — experiment management and feature flags (Phase 5+)."""
+"""A/B testing service — experiment management and feature flags (Phase 5+).
 
+Flags and experiments are defined in config/experiments.json (or
+EXPERIMENTS_CONFIG) and compiled into memory; the file is re-checked at most
+every RELOAD_CHECK_SECONDS and recompiled when it changes, so edits apply
+without a deploy. A config that fails to load leaves the previous one in
+place.
+
+Assignment is stateless: a user's bucket for a flag or experiment is a hash
+of its salt and the user id, so every process agrees without storing
+assignments or doing I/O. The file looks like:
+
+  flags        {"name": {"default": false, "value": true, "rollout": 25,
+                         "salt": "...", "users": {"user-id": true}}}
+               rollout is the percentage of users who get `value`.
+  experiments  {"id": {"status": "active", "salt": "...", "traffic": 100,
+                       "variants": {"control": 50, "treatment": 50},
+                       "flags": {"treatment": {"name": true}}}}
+               traffic is the percentage of users enrolled; variants are
+               weights; `flags` overrides flag values per variant.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
 import uuid
 from datetime import datetime
-from services.persistence import load_all, append_one
+from pathlib import Path
+
+from services import outcomes
+
+EXPERIMENTS_CONFIG = Path(os.getenv(
+    "EXPERIMENTS_CONFIG", Path(__file__).parent.parent / "config" / "experiments.json"
+))
+RELOAD_CHECK_SECONDS = float(os.getenv("EXPERIMENTS_RELOAD_SECONDS", "5"))
+BUCKETS = 10_000
+
+# Flags every user has, whatever the config says (the config can change their values)
+DEFAULT_FLAGS = {
+    "iin_auto_apply": False,
+    "peer_benchmark": False,
+    "gamification": True,
+}
+
+
+def bucket(salt: str, user_id: str) -> int:
+    """The user's bucket (0..BUCKETS-1) under a salt."""
+    digest = hashlib.blake2b(f"{salt}:{user_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % BUCKETS
+
+
+def _threshold(percent) -> int:
+    return round(min(max(float(percent), 0.0), 100.0) * BUCKETS / 100)
+
+
+class _Flag:
+    __slots__ = ("name", "default", "value", "salt", "cutoff", "users")
+
+    def __init__(self, name: str, spec):
+        if not isinstance(spec, dict):
+            spec = {"default": spec}
+        self.name = name
+        self.default = spec.get("default", False)
+        self.value = spec.get("value", True)
+        self.salt = spec.get("salt", name)
+        self.cutoff = _threshold(spec.get("rollout", 0))
+        self.users = dict(spec.get("users") or {})
+
+    def evaluate(self, user_id: str):
+        if user_id in self.users:
+            return self.users[user_id]
+        if self.cutoff and bucket(self.salt, user_id) < self.cutoff:
+            return self.value
+        return self.default
+
+
+class _Experiment:
+    __slots__ = ("id", "spec", "active", "salt", "cutoff", "variants", "flags")
+
+    def __init__(self, experiment_id: str, spec: dict):
+        weights = {str(name): float(w) for name, w in (spec.get("variants") or {}).items() if float(w) > 0}
+        if not weights:
+            raise ValueError(f"Experiment {experiment_id} has no variants")
+        self.id = experiment_id
+        self.spec = spec
+        self.active = spec.get("status", "active") == "active"
+        self.salt = spec.get("salt", experiment_id)
+        self.cutoff = _threshold(spec.get("traffic", 100))
+        # Variant upper bounds over the buckets of enrolled users
+        total = sum(weights.values())
+        self.variants = []
+        running = 0.0
+        for name, weight in weights.items():
+            running += weight
+            self.variants.append((round(running / total * BUCKETS), name))
+        self.flags = {str(v): dict(f) for v, f in (spec.get("flags") or {}).items()}
+
+    def assign(self, user_id: str) -> str | None:
+        if not self.active:
+            return None
+        digest = hashlib.blake2b(f"{self.salt}:{user_id}".encode(), digest_size=8).digest()
+        # Enrollment and variant come from independent halves of one hash
+        if int.from_bytes(digest[:4], "big") % BUCKETS >= self.cutoff:
+            return None
+        b = int.from_bytes(digest[4:], "big") % BUCKETS
+        for upper, name in self.variants:
+            if b < upper:
+                return name
+        return self.variants[-1][1]
+
+
+class ExperimentConfig:
+    """The compiled flags and experiments, reloaded when the file changes."""
+
+    def __init__(self, path: Path = EXPERIMENTS_CONFIG):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._next_check = 0.0
+        self.version = ""
+        self.error = None
+        self._state: tuple[dict[str, _Flag], dict[str, _Experiment]] = ({}, {})
+        self._compile({})
+        self.reload()
+
+    def _compile(self, raw: dict):
+        flags = {name: _Flag(name, value) for name, value in DEFAULT_FLAGS.items()}
+        flags.update((name, _Flag(name, spec)) for name, spec in (raw.get("flags") or {}).items())
+        experiments = {eid: _Experiment(eid, spec) for eid, spec in (raw.get("experiments") or {}).items()}
+        # One swap, so a concurrent reader sees the old config or the new one
+        self._state = (flags, experiments)
+
+    @property
+    def flags(self) -> dict[str, _Flag]:
+        return self._state[0]
+
+    @property
+    def experiments(self) -> dict[str, _Experiment]:
+        return self._state[1]
+
+    def reload(self) -> bool:
+        """Recompile if the file changed since the last load. Returns True if it did."""
+        with self._lock:
+            try:
+                st = self.path.stat()
+                stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                stamp = None
+            if stamp == self._stamp:
+                return False
+            try:
+                raw = json.loads(self.path.read_bytes()) if stamp else {}
+                self._compile(raw)
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                self.error = f"{self.path.name}: {e}"
+                print(f"Experiment config not reloaded — {self.error}")
+                self._stamp = stamp  # Don't retry until the file changes again
+                return False
+            self._stamp = stamp
+            self.version = f"{stamp[2]:x}" if stamp else ""
+            self.error = None
+            return True
+
+    def maybe_reload(self):
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + RELOAD_CHECK_SECONDS
+            self.reload()
+
+    def evaluate(self, user_id: str) -> tuple[dict, dict[str, str]]:
+        """(all flag values, experiment assignments) for a user.
+
+        A variant's flag overrides beat the flag's own rule; if several
+        experiments set a flag, the last one in the file wins.
+        """
+        self.maybe_reload()
+        flags, experiments = self._state
+        values = {name: flag.evaluate(user_id) for name, flag in flags.items()}
+        assigned = {}
+        for exp in experiments.values():
+            variant = exp.assign(user_id)
+            if variant is not None:
+                assigned[exp.id] = variant
+                values.update(exp.flags.get(variant, ()))
+        return values, assigned
+
+    def flag(self, user_id: str, name: str):
+        """One flag's value (as evaluate() would give it; False if unknown)."""
+        self.maybe_reload()
+        flags, experiments = self._state
+        for exp in reversed(experiments.values()):
+            if any(name in overrides for overrides in exp.flags.values()):
+                overrides = exp.flags.get(exp.assign(user_id), {})
+                if name in overrides:
+                    return overrides[name]
+        flag = flags.get(name)
+        return flag.evaluate(user_id) if flag else False
+
+
+config = ExperimentConfig()
 
 
 def list_experiments(status: str = "active") -> list:
     """List experiments by status."""
-    return []  # No experiments in initial release
+    config.maybe_reload()
+    return [
+        {
+            "id": exp.id,
+            "status": exp.spec.get("status", "active"),
+            "description": exp.spec.get("description", ""),
+            "traffic": exp.spec.get("traffic", 100),
+            "variants": [name for _, name in exp.variants],
+        }
+        for exp in config.experiments.values()
+        if status in ("all", exp.spec.get("status", "active"))
+    ]
+
+
+def get_assignment(user_id: str, experiment_id: str) -> str | None:
+    """The user's variant in an experiment (None if not enrolled or not active)."""
+    config.maybe_reload()
+    exp = config.experiments.get(experiment_id)
+    return exp.assign(user_id) if exp else None
 
 
 def get_experiment_results(experiment_id: str) -> dict:
-    raise ValueError(f"Experiment {experiment_id} not found")
+    """Per-variant statistics for each metric recorded in an experiment."""
+    variants = outcomes.results(experiment_id)
+    if variants is None and experiment_id not in config.experiments:
+        raise ValueError(f"Experiment {experiment_id} not found")
+    return {
+        "experiment_id": experiment_id,
+        "variants": variants or {},
+        "buffered": outcomes.buffer.pending(),  # This process's, not yet in the stats
+    }
 
 
 def record_outcome(
     user_id: str, experiment_id: str, metric: str, value: float
 ) -> dict:
-    return {
+    """Buffer an outcome for the user's variant (written in batches; see services.outcomes)."""
+    config.maybe_reload()
+    if experiment_id not in config.experiments:
+        raise ValueError(f"Experiment {experiment_id} not found")
+    variant = get_assignment(user_id, experiment_id)
+    if variant is None:
+        raise ValueError(f"User is not enrolled in experiment {experiment_id}")
+    value = float(value)
+    if not metric or not math.isfinite(value):
+        raise ValueError("metric and a finite value are required")
+    record = {
         "id": str(uuid.uuid4()),
         "user_id": user_id,
         "experiment_id": experiment_id,
+        "variant": variant,
         "metric": metric,
         "value": value,
         "recorded_at": datetime.utcnow().isoformat(),
     }
+    outcomes.buffer.add(record)
+    return record
+
 
+def get_feature_flag(user_id: str, flag_name: str):
+    """A flag's value for the user (False for unknown flags)."""
+    return config.flag(user_id, flag_name)
 
-def get_feature_flag(user_id: str, flag_name: str) -> bool:
-    """Get feature flag value. Default: all flags off."""
-    # Production: look up in experiment assignments
-    defaults = {
-        "iin_auto_apply": False,
-        "peer_benchmark": False,
-        "gamification": True,
+
+def evaluate_flags(user_id: str) -> dict:
+    """Every flag and experiment assignment for the user, in one pass."""
+    start = time.perf_counter()
+    values, assigned = config.evaluate(user_id)
+    return {
+        "flags": values,
+        "experiments": assigned,
+        "config_version": config.version,
+        "eval_us": round((time.perf_counter() - start) * 1e6, 1),
     }
-    return defaults.get(flag_name, False)
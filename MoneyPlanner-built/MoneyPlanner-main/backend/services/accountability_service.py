@@ -1,22 +1,118 @@
 """Accountability service — peer benchmarks, escalation, group goals (Phase 5+)."""
 
+import os
+import threading
 import uuid
 import math
-from services.persistence import load_all, append_one, load_one, save_one
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+from services.persistence import (
+    SHARED_SCOPE, append_one, iter_user_ids, load_all, load_one, locked, save_one,
+)
+from services.quantile_sketch import RateSketch
+
+# Monthly income bands used to segment peer benchmarks
+COHORT_BANDS = [
+    (10000, "income_10k_plus"),
+    (6000, "income_6k_10k"),
+    (3000, "income_3k_6k"),
+    (0, "income_under_3k"),
+]
+ALL_COHORT = "all"
+# Cohorts smaller than this fall back to the population-wide sketch (anonymity)
+MIN_COHORT_SIZE = 20
+
+
+def _user_cohort(user_id: str) -> str:
+    from models.income import IncomeEvent
+    events = load_all("income_events", IncomeEvent.from_dict, user_id=user_id)
+    income = IncomeEvent.compute_rolling_average(events)
+    return next(name for floor, name in COHORT_BANDS if income >= floor)
+
+
+def _load_sketches() -> dict[str, RateSketch]:
+    doc = load_one("peer_sketches", lambda d: d, user_id=SHARED_SCOPE) or {}
+    return {k: RateSketch.from_dict(v) for k, v in doc.get("cohorts", {}).items()}
+
+
+def _save_sketches(sketches: dict[str, RateSketch]):
+    save_one(
+        "peer_sketches",
+        {"cohorts": {k: v.to_dict() for k, v in sketches.items()}},
+        user_id=SHARED_SCOPE,
+    )
+
+
+def _update_config(user_id: str, change: Callable[[dict], None]) -> dict:
+    """Apply change(config) and move the user's sketch entry to match.
+
+    The config's read-modify-write and the sketch delta happen under the one
+    peer_sketches lock, so concurrent updates (or a rebuild) can't leave the
+    sketches counting an entry the config no longer has.
+    """
+    with locked("peer_sketches", user_id=SHARED_SCOPE):
+        config = dict(load_one("benchmark_config", lambda d: d, user_id=user_id) or {})
+        old_entry = config.get("sketch_entry")
+        change(config)
+        new_entry = config.get("sketch_entry")
+        if old_entry != new_entry:
+            sketches = _load_sketches()
+            for entry, op in ((old_entry, RateSketch.remove), (new_entry, RateSketch.add)):
+                if entry:
+                    for name in (ALL_COHORT, entry["cohort"]):
+                        op(sketches.setdefault(name, RateSketch()), entry["rate"])
+            _save_sketches(sketches)
+        config["user_id"] = user_id
+        save_one("benchmark_config", config, user_id=user_id)
+    return config
+
+
+def _current_rate(user_id: str) -> float:
+    from services.automation_service import get_user_transfer
+    transfer = get_user_transfer(user_id)
+    return transfer.savings_rate_pct if transfer else 10.0
+
+
+def record_savings_rate(user_id: str, rate: float):
+    """Keep the peer sketches in step with a user's new savings rate.
+
+    Called on every rate change; only the config changes for users who
+    haven't opted in.
+    """
+    def change(config: dict):
+        config["current_rate"] = rate
+        if config.get("opt_in"):
+            config["sketch_entry"] = {"cohort": _user_cohort(user_id), "rate": rate}
+
+    _update_config(user_id, change)
 
 
 def get_peer_benchmark(user_id: str = "user-1") -> dict:
-    """Get anonymized peer benchmark data."""
+    """Get anonymized peer benchmark data from the population sketches."""
     config = load_one("benchmark_config", lambda d: d, user_id=user_id)
     if not config or not config.get("opt_in"):
         return {"opted_in": False, "message": "Opt in to see peer benchmarks"}
 
-    # Simulated benchmark (production: aggregate from anonymized user data)
+    rate = config.get("current_rate", 10.0)
+    entry = config.get("sketch_entry") or {}
+    cohort = entry.get("cohort", ALL_COHORT)
+    sketches = _load_sketches()
+    sketch = sketches.get(cohort)
+    if not sketch or sketch.total < MIN_COHORT_SIZE:
+        cohort = ALL_COHORT
+        sketch = sketches.get(ALL_COHORT, RateSketch())
+
     return {
         "opted_in": True,
-        "savings_rate_percentile": 65,
-        "peer_avg_savings_rate": 12.5,
-        "your_savings_rate": config.get("current_rate", 10.0),
+        "cohort": cohort,
+        "peer_count": sketch.total,
+        "savings_rate_percentile": round(sketch.percentile_of(rate)),
+        "peer_avg_savings_rate": round(sketch.mean(), 2),
+        "peer_median_savings_rate": sketch.quantile(0.5),
+        "your_savings_rate": rate,
         "suppressed": config.get("suppressed", False),
     }
 
@@ -27,11 +123,35 @@ def should_show_benchmark(user_id: str = "user-1") -> bool:
 
 
 def toggle_benchmark(user_id: str = "user-1", opt_in: bool = False) -> dict:
-    config = load_one("benchmark_config", lambda d: d, user_id=user_id) or {}
-    config["opt_in"] = opt_in
-    config["user_id"] = user_id
-    save_one("benchmark_config", config, user_id=user_id)
-    return config
+    def change(config: dict):
+        entry = None
+        if opt_in:
+            rate = _current_rate(user_id)
+            config["current_rate"] = rate
+            entry = {"cohort": _user_cohort(user_id), "rate": rate}
+        config["sketch_entry"] = entry
+        config["opt_in"] = opt_in
+
+    return _update_config(user_id, change)
+
+
+def rebuild_peer_sketches() -> dict:
+    """Rebuild all sketches from every user's config (one-off / repair).
+
+    Holds the peer_sketches lock throughout, so rate changes wait for it.
+    """
+    sketches: dict[str, RateSketch] = {ALL_COHORT: RateSketch()}
+    with locked("peer_sketches", user_id=SHARED_SCOPE):
+        for uid in iter_user_ids():
+            config = load_one("benchmark_config", lambda d: d, user_id=uid)
+            if not config or not config.get("opt_in"):
+                continue
+            entry = {"cohort": _user_cohort(uid), "rate": config.get("current_rate", _current_rate(uid))}
+            for name in (ALL_COHORT, entry["cohort"]):
+                sketches.setdefault(name, RateSketch()).add(entry["rate"])
+            save_one("benchmark_config", {**config, "sketch_entry": entry}, user_id=uid)
+        _save_sketches(sketches)
+    return {k: v.total for k, v in sketches.items()}
 
 
 def check_escalation_triggers(user_id: str = "user-1") -> list:
@@ -67,6 +187,194 @@ def compute_escalation_forecast(
     }
 
 
+FORECAST_MAX_SCENARIOS = 50_000
+FORECAST_MAX_YEARS = 60
+# Sampled path balances (scenarios × points up to each horizon) per request
+FORECAST_MAX_PATH_POINTS = 1_000_000
+FORECAST_CACHE_MAX_BYTES = int(os.getenv("FORECAST_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Seven result columns of Python floats: object plus list slot each
+_SCENARIO_BYTES = 7 * 32
+
+
+def _unit_balance_paths(
+    annual_returns: np.ndarray, income_growth: np.ndarray, months: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Balance and contribution paths for $1 of first-month contribution.
+
+    With monthly return r, monthly contribution growth g and end-of-month
+    deposits, the balance after m months has the closed form
+        B_m = ((1+r)^m - (1+g)^m) / (r - g)      (r != g)
+        B_m = m (1+r)^(m-1)                       (r == g)
+    which reduces to the usual annuity factor ((1+r)^m - 1) / r when g = 0.
+    Returns two arrays of shape (len(annual_returns), months).
+    """
+    r = (annual_returns / 12)[:, None]
+    g = (income_growth / 12)[:, None]
+    m = np.arange(1, months + 1, dtype=float)[None, :]
+
+    fr = np.power(1 + r, m)
+    fg = np.power(1 + g, m)
+    same = np.isclose(r, g, rtol=0, atol=1e-12)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balance = np.where(same, m * fr / (1 + r), (fr - fg) / np.where(same, 1, r - g))
+        g_zero = np.isclose(g, 0, rtol=0, atol=1e-12)
+        contributed = np.where(g_zero, m, (fg - 1) / np.where(g_zero, 1, g))
+    return balance, contributed
+
+
+class _GridCache:
+    """LRU of grid results, bounded by their estimated size in bytes."""
+
+    def __init__(self, max_bytes: int = FORECAST_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()  # key → (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_grid_cache = _GridCache()
+
+
+def _grid_axes(rates: tuple, years: tuple, annual_returns: tuple, income_growth: tuple):
+    # Paths only depend on (return, growth); the savings rate and income are a
+    # per-scenario scale, so compute each distinct pair once and broadcast.
+    pairs = np.array([(a, g) for a in annual_returns for g in income_growth], dtype=float)
+    unit_balance, unit_contrib = _unit_balance_paths(pairs[:, 0], pairs[:, 1], max(years) * 12)
+    rate_grid, years_grid, pair_grid = np.meshgrid(
+        np.array(rates, dtype=float),
+        np.array(years, dtype=int),
+        np.arange(len(pairs)),
+        indexing="ij",
+    )
+    return pairs, unit_balance, unit_contrib, rate_grid.ravel(), years_grid.ravel(), pair_grid.ravel()
+
+
+def _forecast_results(
+    rates: tuple, years: tuple, annual_returns: tuple, income_growth: tuple, monthly_income: float,
+) -> dict:
+    """The per-scenario result columns, memoized (paths never are: see compute_forecast_grid)."""
+    key = (rates, years, annual_returns, income_growth, monthly_income)
+    results = _grid_cache.get(key)
+    if results is not None:
+        return results
+    pairs, unit_balance, unit_contrib, rate_v, years_v, pair_v = _grid_axes(
+        rates, years, annual_returns, income_growth
+    )
+    first_contribution = monthly_income * rate_v
+    last = years_v * 12 - 1
+    final_balance = first_contribution * unit_balance[pair_v, last]
+    contributed = first_contribution * unit_contrib[pair_v, last]
+    results = {
+        "savings_rate": rate_v.tolist(),
+        "years": years_v.tolist(),
+        "annual_return": pairs[pair_v, 0].tolist(),
+        "income_growth": pairs[pair_v, 1].tolist(),
+        "final_balance": np.round(final_balance, 2).tolist(),
+        "total_contributed": np.round(contributed, 2).tolist(),
+        "investment_growth": np.round(final_balance - contributed, 2).tolist(),
+    }
+    _grid_cache.put(key, results, rate_v.size * _SCENARIO_BYTES)
+    return results
+
+
+def _forecast_paths(
+    rates: tuple, years: tuple, annual_returns: tuple, income_growth: tuple,
+    monthly_income: float, path_interval: int,
+) -> dict:
+    """Sampled month-by-month balances, each row cut at its own horizon."""
+    _, unit_balance, _, rate_v, years_v, pair_v = _grid_axes(rates, years, annual_returns, income_growth)
+    sample = np.arange(path_interval - 1, max(years) * 12, path_interval)
+    first_contribution = monthly_income * rate_v
+    balances = [None] * rate_v.size
+    # One block per horizon, so nothing past a row's own horizon is computed
+    for y in set(years):
+        rows = np.flatnonzero(years_v == y)
+        cut = sample[: y * 12 // path_interval]
+        block = np.round(first_contribution[rows, None] * unit_balance[pair_v[rows, None], cut], 2)
+        for i, row in zip(rows.tolist(), block.tolist()):
+            balances[i] = row
+    return {"months": (sample + 1).tolist(), "balances": balances}
+
+
+def compute_forecast_grid(
+    rates: list,
+    years: list,
+    annual_returns: list | None = None,
+    income_growth: list | None = None,
+    monthly_income: float = 5000,
+    path_interval: int = 0,
+) -> dict:
+    """Project savings for every combination of rate × horizon × return × growth.
+
+    Results are columnar (one list per field, one entry per scenario).
+    path_interval > 0 also returns balances sampled every N months, up to
+    FORECAST_MAX_PATH_POINTS in all. Results (not paths) of recent grids are
+    memoized, within FORECAST_CACHE_MAX_BYTES.
+    """
+    annual_returns = annual_returns or [0.05]
+    income_growth = income_growth or [0.0]
+    if not rates or not years:
+        raise ValueError("rates and years are required")
+    if any(not 0 <= r <= 1 for r in rates):
+        raise ValueError("rates must be between 0 and 1")
+    if any(int(y) != y or not 1 <= y <= FORECAST_MAX_YEARS for y in years):
+        raise ValueError(f"years must be whole numbers between 1 and {FORECAST_MAX_YEARS}")
+    if any(a <= -1 for a in annual_returns) or any(g <= -1 for g in income_growth):
+        raise ValueError("annual_returns and income_growth must be greater than -1")
+    if path_interval < 0:
+        raise ValueError("path_interval must be >= 0")
+    count = len(rates) * len(years) * len(annual_returns) * len(income_growth)
+    if count > FORECAST_MAX_SCENARIOS:
+        raise ValueError(f"Grid has {count} scenarios (max {FORECAST_MAX_SCENARIOS})")
+    if path_interval:
+        points = count // len(years) * sum(int(y) * 12 // path_interval for y in years)
+        if points > FORECAST_MAX_PATH_POINTS:
+            raise ValueError(
+                f"Paths would have {points} points (max {FORECAST_MAX_PATH_POINTS}); "
+                "use a larger path_interval or fewer scenarios"
+            )
+
+    grid = (
+        tuple(float(r) for r in rates),
+        tuple(int(y) for y in years),
+        tuple(float(a) for a in annual_returns),
+        tuple(float(g) for g in income_growth),
+        float(monthly_income),
+    )
+    return {
+        "scenarios": count,
+        "months": max(grid[1]) * 12,
+        "monthly_income": grid[4],
+        "results": _forecast_results(*grid),
+        "paths": _forecast_paths(*grid, int(path_interval)) if path_interval else None,
+    }
+
+
 def create_group_goal(
     creator_id: str, name: str, target: float, member_ids: list
 ) -> dict:
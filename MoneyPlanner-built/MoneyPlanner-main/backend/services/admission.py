@@ -0,0 +1,120 @@
+"""Admission control — per-user token buckets and coalescing of identical requests.
+
+Expensive routes draw from a named bucket per user; an empty bucket means
+429 with Retry-After instead of tying up a worker thread. Identical requests
+from the same user that arrive while one is already running (double-tapped
+sync, a retry storm on /api/budget/summary) wait for that execution and
+share its response instead of running again.
+
+State is per worker process, like the view cache: with WEB_CONCURRENCY
+workers a user can get up to that many times a bucket's rate, and
+coalescing only joins requests that land on the same worker. Syncs that
+do race across workers are still serialized by the transactions lock.
+"""
+
+import math
+import os
+import threading
+import time
+from typing import Callable
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+ADMISSION_MAX_KEYS = 50_000  # Prune idle (full) buckets past this many
+
+
+def _bucket_config(name: str, burst: int, per_minute: float) -> tuple[float, float]:
+    # Override with ADMISSION_<NAME>="burst/per_minute", e.g. ADMISSION_PLAID_SYNC="5/10"
+    raw = os.getenv(f"ADMISSION_{name.upper()}")
+    if raw:
+        burst_s, rate_s = raw.split("/")
+        burst, per_minute = int(burst_s), float(rate_s)
+    return float(burst), per_minute / 60.0
+
+
+# name → (capacity, tokens per second)
+BUCKETS = {
+    "plaid_sync": _bucket_config("plaid_sync", 3, 6),      # Plaid /transactions/sync
+    "plaid_read": _bucket_config("plaid_read", 10, 60),    # Plaid reads (accounts)
+    "compute": _bucket_config("compute", 20, 120),         # Heavy derived views
+}
+
+
+class TokenBucketLimiter:
+    def __init__(self, buckets: dict = BUCKETS, clock: Callable[[], float] = time.monotonic):
+        self.buckets = buckets
+        self._clock = clock
+        self._state = {}  # (user_id, bucket) → (tokens, last refill time)
+        self._lock = threading.Lock()
+
+    def acquire(self, user_id: str, bucket: str) -> float:
+        """Take one token. Returns 0 if admitted, else seconds until one is available."""
+        capacity, rate = self.buckets[bucket]
+        now = self._clock()
+        key = (user_id, bucket)
+        with self._lock:
+            tokens, last = self._state.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens >= 1:
+                self._state[key] = (tokens - 1, now)
+                if len(self._state) > ADMISSION_MAX_KEYS:
+                    self._prune(now)
+                return 0.0
+            self._state[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+    def _prune(self, now: float):
+        # A bucket that has refilled completely is indistinguishable from a new one
+        for key, (tokens, last) in list(self._state.items()):
+            capacity, rate = self.buckets[key[1]]
+            if tokens + (now - last) * rate >= capacity:
+                del self._state[key]
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run fn once per key at a time; concurrent callers with the key share the outcome."""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn: Callable[[], object]) -> tuple[object, bool]:
+        """Returns (result, shared) — shared is True for callers that joined a flight."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+
+limiter = TokenBucketLimiter()
+single_flight = SingleFlight()
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
@@ -1,31 +1,40 @@
 """Automation service — IIN (Income Increase Neutralization) automation.
 
 Handles income change detection → savings rate adjustment proposals.
+Rate changes are recorded as events in the IIN ledger (services/iin_ledger.py).
 """
 
 from models.auto_transfer import AutoTransfer, EscalationProposal
 from models.income import IncomeEvent
-from services.persistence import load_all, save_all
+from services import iin_ledger
+from services.accountability_service import record_savings_rate
 
 
 def get_user_transfer(user_id: str = "user-1") -> AutoTransfer | None:
     """Get the user's current auto-transfer config."""
-    transfers = load_all("auto_transfers", AutoTransfer.from_dict, user_id=user_id)
-    return transfers[-1] if transfers else None
+    return iin_ledger.current(user_id)
 
 
-def create_default_transfer(user_id: str = "user-1") -> AutoTransfer:
-    """Create a default auto-transfer config."""
-    transfer = AutoTransfer(
-        user_id=user_id,
-        savings_rate_pct=10.0,
-        destination="savings",
+def set_transfer(
+    user_id: str = "user-1",
+    savings_rate_pct: float = 10.0,
+    destination: str = "savings",
+    is_active: bool = True,
+) -> AutoTransfer:
+    """Configure the user's auto-transfer (starts a new config)."""
+    transfer = iin_ledger.record(
+        user_id, "rate_set",
+        new_rate=savings_rate_pct, destination=destination, is_active=is_active,
     )
-    from services.persistence import append_one
-    append_one("auto_transfers", transfer, user_id=user_id)
+    record_savings_rate(user_id, transfer.savings_rate_pct)
     return transfer
 
 
+def create_default_transfer(user_id: str = "user-1") -> AutoTransfer:
+    """Create a default auto-transfer config."""
+    return set_transfer(user_id, savings_rate_pct=10.0, destination="savings")
+
+
 def handle_income_change(
     transfer: AutoTransfer,
     income_event: IncomeEvent,
@@ -47,76 +56,50 @@ def handle_income_change(
         proposed_bump = round(increase_pct * 50, 1)  # 50% of increase
         new_rate = min(transfer.savings_rate_pct + proposed_bump, 50.0)
 
-        transfer.pending_escalation = EscalationProposal(
+        proposal = EscalationProposal(
             old_rate=transfer.savings_rate_pct,
             new_rate=new_rate,
             reason=f"Income increased {increase_pct:.1%}. "
                    f"Proposing {proposed_bump:.1f}pp increase to capture surplus.",
         )
+        return iin_ledger.record(user_id, "escalation_proposed", proposal=proposal.to_dict())
 
     elif income_event.income_change_flag == "decrease" and previous_avg > 0:
         # Auto-reduce: scale rate down proportionally
         decrease_pct = (previous_avg - income_event.amount) / previous_avg
         reduction = round(transfer.savings_rate_pct * decrease_pct, 1)
-        transfer.savings_rate_pct = max(transfer.savings_rate_pct - reduction, 1.0)
-        transfer.history.append({
-            "action": "auto_reduce",
-            "old_rate": transfer.savings_rate_pct + reduction,
-            "new_rate": transfer.savings_rate_pct,
-            "reason": f"Income decreased {decrease_pct:.1%}",
-        })
-
-    # Save updated transfer
-    transfers = load_all("auto_transfers", AutoTransfer.from_dict, user_id=user_id)
-    if transfers:
-        transfers[-1] = transfer
-    else:
-        transfers = [transfer]
-    save_all("auto_transfers", transfers, user_id=user_id)
+        transfer = iin_ledger.record(
+            user_id, "auto_reduced",
+            old_rate=transfer.savings_rate_pct,
+            new_rate=max(transfer.savings_rate_pct - reduction, 1.0),
+            reason=f"Income decreased {decrease_pct:.1%}",
+        )
+        record_savings_rate(user_id, transfer.savings_rate_pct)
 
     return transfer
 
 
-def accept_escalation(user_id: str = "user-1") -> AutoTransfer | None:
-    """Accept a pending escalation proposal."""
-    transfer = get_user_transfer(user_id)
+def _pending_escalation(transfer: AutoTransfer | None, rate_field: str) -> dict | None:
+    # Under the ledger lock (iin_ledger.record): None if there's nothing to decide
     if not transfer or not transfer.pending_escalation:
         return None
-
     esc = transfer.pending_escalation
-    transfer.history.append({
-        "action": "escalation_accepted",
-        "old_rate": esc.old_rate,
-        "new_rate": esc.new_rate,
-    })
-    transfer.savings_rate_pct = esc.new_rate
-    esc.status = "accepted"
-    transfer.pending_escalation = None
-
-    transfers = load_all("auto_transfers", AutoTransfer.from_dict, user_id=user_id)
-    if transfers:
-        transfers[-1] = transfer
-        save_all("auto_transfers", transfers, user_id=user_id)
+    return {"proposal_id": esc.id, "old_rate": esc.old_rate, rate_field: esc.new_rate}
+
+
+def accept_escalation(user_id: str = "user-1") -> AutoTransfer | None:
+    """Accept a pending escalation proposal."""
+    transfer = iin_ledger.record(
+        user_id, "escalation_accepted", lambda t: _pending_escalation(t, "new_rate"),
+    )
+    if transfer is None:
+        return None
+    record_savings_rate(user_id, transfer.savings_rate_pct)
     return transfer
 
 
 def reject_escalation(user_id: str = "user-1") -> AutoTransfer | None:
     """Reject a pending escalation proposal."""
-    transfer = get_user_transfer(user_id)
-    if not transfer or not transfer.pending_escalation:
-        return None
-
-    esc = transfer.pending_escalation
-    esc.status = "rejected"
-    transfer.history.append({
-        "action": "escalation_rejected",
-        "old_rate": esc.old_rate,
-        "proposed_rate": esc.new_rate,
-    })
-    transfer.pending_escalation = None
-
-    transfers = load_all("auto_transfers", AutoTransfer.from_dict, user_id=user_id)
-    if transfers:
-        transfers[-1] = transfer
-        save_all("auto_transfers", transfers, user_id=user_id)
-    return transfer
+    return iin_ledger.record(
+        user_id, "escalation_rejected", lambda t: _pending_escalation(t, "proposed_rate"),
+    )
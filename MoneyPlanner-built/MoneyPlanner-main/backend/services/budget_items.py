@@ -0,0 +1,116 @@
+"""Budget items — user-defined line items within budget categories.
+
+Stored as a keyed collection (id → item), so single-item edits look items up
+by id and a batch of edits from the budget screen is one atomic write.
+"""
+
+from datetime import datetime
+
+from models.base import new_id
+from services.persistence import load_keyed, mutate_keyed
+
+COLLECTION = "budget_items"
+
+
+def _new_item(body: dict, now: str) -> dict:
+    return {
+        "id": body.get("id") or f"item_{new_id()}",
+        "category_id": body.get("category_id"),
+        "name": body.get("name", "New item"),
+        "budget_amount": float(body.get("budget_amount", 0)),
+        "classification": body.get("classification", "TRUE_VARIABLE"),
+        "created_at": now,
+    }
+
+
+def _update_item(item: dict, body: dict, now: str):
+    if body.get("name"):
+        item["name"] = body["name"]
+    if body.get("budget_amount") is not None:
+        item["budget_amount"] = float(body["budget_amount"])
+    if body.get("classification"):
+        item["classification"] = body["classification"]
+    item["updated_at"] = now
+
+
+def list_items(user_id: str = "user-1") -> list[dict]:
+    return list(load_keyed(COLLECTION, user_id).values())
+
+
+def create_item(body: dict, user_id: str = "user-1") -> dict:
+    return apply_batch({"create": [body]}, user_id)["created"][0]
+
+
+class _NotFound(LookupError):
+    """Raised inside mutate_keyed to leave the collection unwritten."""
+
+
+def update_item(item_id: str, body: dict, user_id: str = "user-1") -> dict | None:
+    """Update an item in place (None, and nothing written, if there is no such item)."""
+
+    def update(items):
+        item = items.get(item_id)
+        if item is None:
+            raise _NotFound(item_id)
+        _update_item(item, body, datetime.utcnow().isoformat())
+        return item
+
+    try:
+        return mutate_keyed(COLLECTION, update, user_id)
+    except _NotFound:
+        return None
+
+
+def delete_item(item_id: str, user_id: str = "user-1") -> bool:
+    """Delete an item (False, and nothing written, if there is no such item)."""
+
+    def delete(items):
+        if items.pop(item_id, None) is None:
+            raise _NotFound(item_id)
+
+    try:
+        mutate_keyed(COLLECTION, delete, user_id)
+    except _NotFound:
+        return False
+    return True
+
+
+def apply_batch(batch: dict, user_id: str = "user-1") -> dict:
+    """Apply {"create": [...], "update": [{"id", ...}], "delete": [id, ...]} atomically.
+
+    Creates run first, then updates, then deletes, all in one write. Raises
+    ValueError (and writes nothing) on a duplicate create or unknown id.
+    """
+    creates = batch.get("create") or []
+    updates = batch.get("update") or []
+    deletes = batch.get("delete") or []
+    if not all(isinstance(b, dict) for b in creates + updates):
+        raise ValueError("create and update entries must be objects")
+
+    def apply(items):
+        now = datetime.utcnow().isoformat()
+        created = [_new_item(body, now) for body in creates]
+        new_ids = [item["id"] for item in created]
+        duplicates = sorted({i for i in new_ids if i in items or new_ids.count(i) > 1})
+        missing = sorted(
+            {b.get("id") for b in updates if b.get("id") not in items and b.get("id") not in new_ids}
+            | {i for i in deletes if i not in items and i not in new_ids}
+        )
+        if duplicates:
+            raise ValueError(f"Items already exist: {', '.join(duplicates)}")
+        if missing:
+            raise ValueError(f"Items not found: {', '.join(map(str, missing))}")
+
+        for item in created:
+            items[item["id"]] = item
+        for body in updates:
+            _update_item(items[body["id"]], body, now)
+        for item_id in deletes:
+            items.pop(item_id, None)
+        return {
+            "created": created,
+            "updated": [items[b["id"]] for b in updates if b["id"] in items],
+            "deleted": list(deletes),
+        }
+
+    return mutate_keyed(COLLECTION, apply, user_id)
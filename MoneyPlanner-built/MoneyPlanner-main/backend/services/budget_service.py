@@ -0,0 +1,91 @@
+"""Budget service — spending summaries and income streams derived from transactions.
+
+Functions take the item-keyed transaction dict ({item_id: [txn, ...]}) as
+loaded from storage and are pure, so callers can cache or share the load.
+"""
+
+from collections import defaultdict
+
+from services.categories import BUDGET_ENVELOPES, map_category
+
+
+def compute_budget_summary(all_txns: dict) -> dict:
+    """Monthly averages per budget envelope/category across all history."""
+    # Categories are computed, not written back: the records may be shared
+    months = set()
+    by_category = defaultdict(lambda: {"total": 0.0, "count": 0})
+    total_income = 0
+    total_expense = 0
+
+    for txns in all_txns.values():
+        for t in txns:
+            months.add(t["date"][:7])
+            cat = map_category(t)
+            if cat in ("Income", "E-Transfers In"):
+                total_income += abs(t["amount"])
+            elif t["amount"] > 0:
+                by_category[cat]["total"] += t["amount"]
+                by_category[cat]["count"] += 1
+                total_expense += t["amount"]
+
+    num_months = max(len(months), 1)
+
+    # Build envelope summaries
+    envelopes = []
+    for env in BUDGET_ENVELOPES:
+        cats = []
+        env_total = 0
+        for cat_name in env["categories"]:
+            data = by_category.get(cat_name, {"total": 0, "count": 0})
+            if data["total"] > 0:
+                avg = data["total"] / num_months
+                cats.append({
+                    "name": cat_name,
+                    "monthly_avg": round(avg, 2),
+                    "total": round(data["total"], 2),
+                    "count": data["count"],
+                })
+                env_total += avg
+
+        envelopes.append({
+            "name": env["name"],
+            "categories": cats,
+            "subtotal": round(env_total, 2),
+        })
+
+    return {
+        "monthly_income": round(total_income / num_months, 2),
+        "monthly_expense": round(total_expense / num_months, 2),
+        "monthly_balance": round(
+            (total_income - total_expense) / num_months, 2
+        ),
+        "months_analyzed": num_months,
+        "envelopes": envelopes,
+    }
+
+
+def detect_income_streams(all_txns: dict) -> list[dict]:
+    """Detect income streams from transaction patterns."""
+    income_txns = []
+    for item_id, txns in all_txns.items():
+        for t in txns:
+            if t["amount"] < 0 and abs(t["amount"]) > 200:
+                if map_category(t) in ("Income", "E-Transfers In"):
+                    income_txns.append(t)
+
+    # Group by merchant/name to find recurring patterns
+    patterns = defaultdict(list)
+    for t in income_txns:
+        key = t.get("merchant") or t.get("name", "Unknown")
+        patterns[key].append(abs(t["amount"]))
+
+    income_streams = []
+    for name, amounts in patterns.items():
+        income_streams.append({
+            "name": name,
+            "amount": round(sum(amounts) / len(amounts), 2),
+            "frequency": "monthly" if len(amounts) >= 2 else "one-time",
+            "occurrences": len(amounts),
+            "is_active": True,
+        })
+    return income_streams
@@ -0,0 +1,58 @@
+"""Dashboard — several views computed in one request.
+
+The app's opening screen needs the phase, safe-to-spend, budget summary, IIN
+config and safeguards views. compute_sections() runs the requested ones
+concurrently under a single read memo (services.persistence.read_memo), so
+collections the views share (transactions, income_events, user_phase) are
+read and parsed once, and reports how long each took. Sections are
+independent of each other; one failing doesn't fail the rest.
+"""
+
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from services.persistence import read_memo
+
+DASHBOARD_THREADS = int(os.getenv("DASHBOARD_THREADS", "4"))
+
+_pool: ThreadPoolExecutor | None = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    # Created on first use: gunicorn --preload forks after import
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=DASHBOARD_THREADS, thread_name_prefix="dashboard")
+    return _pool
+
+
+def _timed(build: Callable[[], object]) -> tuple[object, Exception | None, float]:
+    start = time.perf_counter()
+    try:
+        return build(), None, time.perf_counter() - start
+    except Exception as e:
+        return None, e, time.perf_counter() - start
+
+
+def compute_sections(builders: dict[str, Callable[[], object]]) -> dict:
+    """Build each section in parallel; {"sections", "errors", "timings_ms"}."""
+    start = time.perf_counter()
+    with read_memo():
+        futures = {
+            name: _executor().submit(contextvars.copy_context().run, _timed, build)
+            for name, build in builders.items()
+        }
+        results = {name: f.result() for name, f in futures.items()}
+
+    sections, errors, timings = {}, {}, {}
+    for name, (value, error, seconds) in results.items():
+        if error is None:
+            sections[name] = value
+        else:
+            errors[name] = str(error)
+        timings[name] = round(seconds * 1000, 2)
+    timings["total"] = round((time.perf_counter() - start) * 1000, 2)
+    return {"sections": sections, "errors": errors, "timings_ms": timings}
@@ -0,0 +1,149 @@
+"""Exports — transactions and budget summaries as CSV or XLSX spreadsheets.
+
+Transaction rows are streamed straight from the store
+(persistence.stream_records) with budget categories applied (the user's
+overrides, else map_category), so neither the history nor the output is
+ever held in memory whole: CSV is produced by a generator the response
+streams, XLSX by openpyxl's write-only workbook into a file. Large exports
+run as a background job that leaves the file in EXPORTS_DIR for download.
+"""
+
+import csv
+import io
+import os
+import time
+import uuid
+from itertools import chain
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from services.categories import map_category
+from services.persistence import DATA_DIR, collection_path, read_json, stream_records
+
+EXPORTS_DIR = DATA_DIR / "_exports"
+EXPORT_RETENTION_DAYS = 7
+FORMATS = ("csv", "xlsx")
+
+TRANSACTION_COLUMNS = (
+    "date", "name", "merchant", "amount", "budget_category", "category",
+    "pending", "account_id", "item_id", "transaction_id",
+)
+SUMMARY_COLUMNS = ("envelope", "category", "monthly_avg", "total", "count")
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _cell(value):
+    # Bank descriptions are user-controlled: keep spreadsheets from running them as formulas
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@"):
+        return "'" + value
+    return value
+
+
+def _overrides(user_id: str) -> dict:
+    path = collection_path(user_id, "category_overrides")
+    try:
+        return read_json(path)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def transaction_rows(
+    user_id: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    progress: Callable[[float], None] | None = None,
+) -> Iterator[tuple]:
+    """Transactions in store order, as TRANSACTION_COLUMNS tuples, within [start_date, end_date]."""
+    overrides = _overrides(user_id)
+    for item_id, t in stream_records("transactions", user_id, progress):
+        day = t.get("date") or ""
+        if (start_date and day < start_date) or (end_date and day > end_date):
+            continue
+        override = overrides.get(t.get("transaction_id"))
+        yield tuple(_cell(v) for v in (
+            day, t.get("name", ""), t.get("merchant", ""), t.get("amount"),
+            override["category"] if override else map_category(t),
+            t.get("category", ""), t.get("pending", False), t.get("account_id", ""),
+            item_id, t.get("transaction_id", ""),
+        ))
+
+
+def summary_rows(summary: dict) -> Iterator[tuple]:
+    """compute_budget_summary() output as SUMMARY_COLUMNS tuples, totals last."""
+    for env in summary["envelopes"]:
+        for cat in env["categories"]:
+            yield env["name"], cat["name"], cat["monthly_avg"], cat["total"], cat["count"]
+        yield env["name"], "Subtotal", env["subtotal"], None, None
+    yield "Monthly income", "", summary["monthly_income"], None, None
+    yield "Monthly expense", "", summary["monthly_expense"], None, None
+    yield "Monthly balance", "", summary["monthly_balance"], None, None
+
+
+def csv_stream(columns: Iterable[str], rows: Iterable[tuple]) -> Iterator[str]:
+    """CSV text, a line at a time (for a streamed response)."""
+    line = io.StringIO()
+    writer = csv.writer(line)
+    for row in chain([columns], rows):
+        writer.writerow(row)
+        yield line.getvalue()
+        line.seek(0)
+        line.truncate()
+
+
+def write_xlsx(path: Path, sheets: dict[str, tuple[Iterable[str], Iterable[tuple]]]) -> int:
+    """Write {sheet title: (columns, rows)} with a write-only workbook; returns the row count."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    count = 0
+    for title, (columns, rows) in sheets.items():
+        ws = wb.create_sheet(title)
+        ws.append(list(columns))
+        for row in rows:
+            ws.append(list(row))
+            count += 1
+    wb.save(path)
+    return count
+
+
+def export_path(fmt: str) -> Path:
+    """A fresh file in EXPORTS_DIR for an export in the given format."""
+    EXPORTS_DIR.mkdir(exist_ok=True)
+    return EXPORTS_DIR / f"{uuid.uuid4().hex}.{fmt}"
+
+
+def write_transactions(
+    path: Path,
+    fmt: str,
+    user_id: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    progress: Callable[[float], None] | None = None,
+) -> int:
+    """Export a user's transactions to a file; returns the row count."""
+    rows = transaction_rows(user_id, start_date, end_date, progress)
+    if fmt == "xlsx":
+        return write_xlsx(path, {"Transactions": (TRANSACTION_COLUMNS, rows)})
+    count = -1  # Header line
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        for line in csv_stream(TRANSACTION_COLUMNS, rows):
+            fh.write(line)
+            count += 1
+    return count
+
+
+def purge_exports(days: int = EXPORT_RETENTION_DAYS) -> int:
+    """Delete export files older than `days` (their jobs are purged too)."""
+    if not EXPORTS_DIR.exists():
+        return 0
+    cutoff = time.time() - days * 86400
+    removed = 0
+    for entry in os.scandir(EXPORTS_DIR):
+        if entry.stat().st_mtime < cutoff:
+            os.unlink(entry.path)
+            removed += 1
+    return removed
@@ -0,0 +1,34 @@
+"""HTTP revalidation — ETags derived from per-user collection versions.
+
+An endpoint declares which collections its payload depends on; the tag is a
+hash of those version counters (plus any time component the payload has), so
+checking If-None-Match costs one small file read instead of a recompute.
+"""
+
+import hashlib
+import os
+from datetime import datetime
+
+from services.persistence import get_versions
+
+# Changes on every deploy so payload-shape changes never revalidate stale tags
+ETAG_NAMESPACE = os.getenv("RAILWAY_GIT_COMMIT_SHA", "dev")
+# /api/phase reports days elapsed in phase; tags roll over on this window
+PHASE_ETAG_WINDOW_SECONDS = 900
+
+
+def compute_etag(user_id: str, collections: tuple, extra: str = "") -> str:
+    versions = get_versions(user_id)
+    parts = [ETAG_NAMESPACE, versions.get("_epoch", ""), user_id, extra]
+    parts += [f"{c}:{versions.get(c, 0)}" for c in collections]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+def utc_day() -> str:
+    """Time component for payloads that depend on the current date."""
+    return datetime.utcnow().strftime("%Y-%m-%d")
+
+
+def phase_window() -> str:
+    """Time component for payloads that report elapsed time in phase."""
+    return str(int(datetime.utcnow().timestamp() // PHASE_ETAG_WINDOW_SECONDS))
@@ -0,0 +1,180 @@
+"""IIN rate ledger — savings-rate changes as an append-only event log.
+
+Every change to a user's auto-transfer is one event appended to
+iin_ledger.jsonl:
+
+  rate_set             user configured a rate (starts a new transfer config)
+  escalation_proposed  income went up; a higher rate is proposed
+  escalation_accepted  proposal accepted; rate raised
+  escalation_rejected  proposal rejected
+  auto_reduced         income went down; rate lowered automatically
+
+The current AutoTransfer is materialized into an iin_snapshot document every
+SNAPSHOT_EVERY events, together with the ledger offset it covers. Reading
+current state is the snapshot plus at most SNAPSHOT_EVERY replayed events,
+whatever the ledger's length; a write is one append (plus the occasional
+snapshot). Users who predate the ledger are read from their last
+auto_transfers entry until their first event seeds the ledger from it.
+
+AutoTransfer.history (rate changes since the config was set) is rebuilt by
+the same replay, so it comes from the ledger too. Checks on the current
+state that decide whether to append (e.g. "is an escalation pending?") go
+in record()'s fields_from, which runs under the ledger lock.
+"""
+
+from datetime import datetime
+from typing import Callable, Iterator
+
+from models.auto_transfer import AutoTransfer, EscalationProposal
+from models.base import new_id
+from services.persistence import append_line, load_latest, load_one, locked, read_lines, save_one
+
+LEDGER = "iin_ledger"
+SNAPSHOT = "iin_snapshot"
+SNAPSHOT_EVERY = 50
+
+EVENT_TYPES = (
+    "rate_set",
+    "escalation_proposed",
+    "escalation_accepted",
+    "escalation_rejected",
+    "auto_reduced",
+)
+
+
+def _apply(state: AutoTransfer | None, event: dict) -> AutoTransfer | None:
+    kind = event["type"]
+    if kind == "rate_set":
+        return AutoTransfer(
+            id=event["transfer_id"],
+            user_id=event["user_id"],
+            savings_rate_pct=event["new_rate"],
+            destination=event.get("destination", "savings"),
+            is_active=event.get("is_active", True),
+            history=list(event.get("history", [])),
+            created_at=event["at"],
+        )
+    if state is None:
+        return None  # Nothing configured yet; stray event
+    if kind == "escalation_proposed":
+        state.pending_escalation = EscalationProposal.from_dict(event["proposal"])
+    elif kind in ("escalation_accepted", "auto_reduced"):
+        state.savings_rate_pct = event["new_rate"]
+        if kind == "escalation_accepted":
+            state.pending_escalation = None
+            state.history.append(_history_entry(event, "escalation_accepted", "new_rate"))
+        else:
+            state.history.append(_history_entry(event, "auto_reduce", "new_rate", reason=event.get("reason", "")))
+    elif kind == "escalation_rejected":
+        state.pending_escalation = None
+        state.history.append(_history_entry(event, "escalation_rejected", "proposed_rate"))
+    return state
+
+
+def _history_entry(event: dict, action: str, rate_field: str, **extra) -> dict:
+    # The shape auto_transfers history entries had before the ledger
+    return {"action": action, "old_rate": event.get("old_rate"), rate_field: event.get(rate_field),
+            **extra, "at": event["at"]}
+
+
+def _replay(user_id: str) -> tuple[AutoTransfer | None, int, int]:
+    """(state, ledger offset, events since the snapshot)."""
+    snapshot = load_one(SNAPSHOT, lambda d: d, user_id=user_id)
+    if snapshot:
+        state = AutoTransfer.from_dict(snapshot["state"]) if snapshot["state"] else None
+        offset = snapshot["offset"]
+    else:
+        state, offset = None, 0
+    pending = 0
+    for event, offset in read_lines(LEDGER, user_id, offset):
+        state = _apply(state, event)
+        pending += 1
+    return state, offset, pending
+
+
+def _legacy_state(user_id: str) -> AutoTransfer | None:
+    transfers = load_latest("auto_transfers", AutoTransfer.from_dict, user_id=user_id)
+    return transfers[-1] if transfers else None
+
+
+def current(user_id: str = "user-1") -> AutoTransfer | None:
+    """The user's current auto-transfer config (None if never configured)."""
+    state, offset, _ = _replay(user_id)
+    if offset == 0 and state is None:
+        return _legacy_state(user_id)
+    return state
+
+
+def _seed_from_legacy(user_id: str) -> int:
+    legacy = _legacy_state(user_id)
+    if legacy is None:
+        return 0
+    end = append_line(LEDGER, {
+        "type": "rate_set",
+        "at": legacy.created_at,
+        "user_id": user_id,
+        "transfer_id": legacy.id,
+        "new_rate": legacy.savings_rate_pct,
+        "destination": legacy.destination,
+        "is_active": legacy.is_active,
+        "history": legacy.history,
+        "migrated": True,
+    }, user_id=user_id)
+    if legacy.pending_escalation and legacy.pending_escalation.status == "pending":
+        end = append_line(LEDGER, {
+            "type": "escalation_proposed",
+            "at": legacy.pending_escalation.created_at,
+            "user_id": user_id,
+            "proposal": legacy.pending_escalation.to_dict(),
+            "migrated": True,
+        }, user_id=user_id)
+    return end
+
+
+def record(
+    user_id: str,
+    kind: str,
+    fields_from: Callable[[AutoTransfer | None], dict | None] | None = None,
+    **fields,
+) -> AutoTransfer | None:
+    """Append one event and return the resulting state.
+
+    fields_from(current state), if given, supplies more event fields under
+    the ledger lock, or returns None to append nothing (record then returns
+    None), so a check on the state and the append it allows are atomic.
+    """
+    if kind not in EVENT_TYPES:
+        raise ValueError(f"Unknown IIN event type: {kind}")
+    with locked(LEDGER, user_id):
+        state, offset, pending = _replay(user_id)
+        if offset == 0 and _seed_from_legacy(user_id):
+            state, offset, pending = _replay(user_id)
+        if fields_from is not None:
+            extra = fields_from(state)
+            if extra is None:
+                return None
+            fields = {**fields, **extra}
+        event = {"type": kind, "at": datetime.utcnow().isoformat(), "user_id": user_id, **fields}
+        if kind == "rate_set":
+            event.setdefault("transfer_id", new_id())
+            event["old_rate"] = state.savings_rate_pct if state else None
+        state = _apply(state, event)
+        offset = append_line(LEDGER, event, user_id=user_id)
+        if pending + 1 >= SNAPSHOT_EVERY:
+            save_one(SNAPSHOT, {
+                "state": state.to_dict() if state else None,
+                "offset": offset,
+                "at": event["at"],
+            }, user_id=user_id)
+    return state
+
+
+def history(user_id: str = "user-1", since: str | None = None, until: str | None = None) -> Iterator[dict]:
+    """Ledger events, oldest first, with `at` within [since, until] (ISO dates or timestamps)."""
+    for event, _ in read_lines(LEDGER, user_id):
+        at = event["at"]
+        if since is not None and at < since:
+            continue
+        if until is not None and at[:len(until)] > until:
+            break  # Appended in time order
+        yield event
@@ -0,0 +1,318 @@
+"""Background jobs — a persistent SQLite queue worked by tools/job_worker.py.
+
+Request handlers submit() a job and return its id; worker processes claim
+jobs, run the registered handler and record progress, result or error. A
+failed job is retried with exponential backoff up to max_attempts; a job
+whose worker died (no heartbeat for JOB_STALE_SECONDS) is put back on the
+queue. Handlers are registered with @job_handler(kind) in the module that
+owns the work (see app.py) and take (user_id, payload, progress); a
+cleanup(payload) registered with them runs once the job is finished for
+good, however it ended.
+
+The queue lives in DATA_DIR/_jobs.sqlite3 (WAL mode, so the web workers and
+job workers can read and write it concurrently). Job workers also check in
+there while they run (worker_seen), so the web side can tell whether
+anything would pick a job up (live_workers).
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable
+
+from services.persistence import DATA_DIR
+
+JOBS_DB = DATA_DIR / "_jobs.sqlite3"
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "300"))
+JOB_RETENTION_DAYS = 7
+WORKER_ALIVE_SECONDS = 90  # A worker that hasn't checked in for this long is gone
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+_handlers: dict[str, Callable] = {}
+_cleanups: dict[str, Callable[[dict], None]] = {}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    run_after REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat_at REAL,
+    worker TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, run_after);
+CREATE INDEX IF NOT EXISTS jobs_user ON jobs (user_id, kind, status);
+CREATE TABLE IF NOT EXISTS workers (
+    name TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL
+);
+"""
+
+_initialized = False
+
+
+@contextmanager
+def _connect():
+    global _initialized
+    conn = sqlite3.connect(JOBS_DB, timeout=10, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        if not _initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _initialized = True
+        yield conn
+    finally:
+        conn.close()
+
+
+def job_handler(kind: str, cleanup: Callable[[dict], None] | None = None):
+    """Register fn(user_id, payload, progress) -> dict as the runner for `kind`.
+
+    cleanup(payload) runs once a job of this kind has succeeded or failed
+    for good (not between retries), e.g. to delete the file it worked on.
+    """
+
+    def register(fn):
+        _handlers[kind] = fn
+        if cleanup is not None:
+            _cleanups[kind] = cleanup
+        return fn
+
+    return register
+
+
+def _to_dict(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    for field in ("created_at", "started_at", "finished_at"):
+        if job[field]:
+            job[field] = datetime.fromtimestamp(job[field]).isoformat()
+    del job["heartbeat_at"], job["run_after"], job["worker"]
+    return job
+
+
+def submit(kind: str, user_id: str, payload: dict | None = None,
+           max_attempts: int = JOB_MAX_ATTEMPTS, dedupe: bool = True) -> dict:
+    """Queue a job. With dedupe, an identical queued/running job is returned instead."""
+    payload_json = json.dumps(payload or {}, sort_keys=True)
+    now = time.time()
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if dedupe:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE user_id = ? AND kind = ? AND payload = ?"
+                    " AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                    (user_id, kind, payload_json, QUEUED, RUNNING),
+                ).fetchone()
+                if row is not None:
+                    conn.execute("COMMIT")
+                    return _to_dict(row)
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, user_id, payload, status, max_attempts, created_at, run_after)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, user_id, payload_json, QUEUED, max_attempts, now, now),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    return _to_dict(row)
+
+
+def get_job(job_id: str, user_id: str | None = None) -> dict | None:
+    """A job by id (None if missing or owned by another user)."""
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None or (user_id is not None and row["user_id"] != user_id):
+        return None
+    return _to_dict(row)
+
+
+def claim_next(worker: str) -> dict | None:
+    """Atomically take the oldest runnable job (marks it running)."""
+    now = time.time()
+    with _connect() as conn:
+        row = conn.execute(
+            "UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?,"
+            " heartbeat_at = ?, worker = ?, error = NULL"
+            " WHERE id = (SELECT id FROM jobs WHERE status = ? AND run_after <= ?"
+            "             AND attempts < max_attempts ORDER BY run_after LIMIT 1)"
+            " AND status = ? RETURNING *",
+            (RUNNING, now, now, worker, QUEUED, now, QUEUED),
+        ).fetchone()
+    return _to_dict(row) if row is not None else None
+
+
+def set_progress(job_id: str, progress: float, message: str = ""):
+    """Record progress (0–1) and refresh the job's heartbeat."""
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE jobs SET progress = ?, message = ?, heartbeat_at = ? WHERE id = ?",
+            (min(max(progress, 0.0), 1.0), message, time.time(), job_id),
+        )
+
+
+def heartbeat(job_id: str):
+    with _connect() as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+
+
+def complete(job_id: str, result: dict | None):
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, progress = 1, result = ?, finished_at = ? WHERE id = ?",
+            (SUCCEEDED, json.dumps(result, default=str), time.time(), job_id),
+        )
+
+
+def fail(job_id: str, error: str) -> bool:
+    """Record a failed attempt: requeue with backoff, or fail for good after max_attempts.
+
+    Returns True when the job has failed for good.
+    """
+    now = time.time()
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return False
+        if row["attempts"] < row["max_attempts"]:
+            delay = JOB_RETRY_BASE_SECONDS * 2 ** (row["attempts"] - 1)
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, run_after = ?, message = ? WHERE id = ?",
+                (QUEUED, error, now + delay, f"Retrying in {delay:g}s", job_id),
+            )
+            return False
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, message = ? WHERE id = ?",
+            (FAILED, error, now, f"Failed after {row['attempts']} attempts", job_id),
+        )
+        return True
+
+
+def requeue_stale(stale_seconds: int = JOB_STALE_SECONDS) -> int:
+    """Return running jobs whose worker stopped heartbeating to the queue.
+
+    A lost attempt counts like a failed one: a job that has used up
+    max_attempts is failed instead, so one that kills its worker every
+    time can't run forever (claim_next skips such jobs; any left queued
+    are failed here too).
+    """
+    now = time.time()
+    cutoff = now - stale_seconds
+    with _connect() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            lost = conn.execute(
+                "UPDATE jobs SET status = ?, error = 'Worker lost', finished_at = ?,"
+                " message = 'Failed after ' || attempts || ' attempts'"
+                " WHERE attempts >= max_attempts"
+                " AND ((status = ? AND heartbeat_at < ?) OR status = ?) RETURNING kind, payload",
+                (FAILED, now, RUNNING, cutoff, QUEUED),
+            ).fetchall()
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, message = 'Worker lost, requeued'"
+                " WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, RUNNING, cutoff),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    for row in lost:
+        _clean_up(row["kind"], json.loads(row["payload"]))
+    return cur.rowcount
+
+
+def purge_finished(days: int = JOB_RETENTION_DAYS) -> int:
+    cutoff = time.time() - days * 86400
+    with _connect() as conn:
+        conn.execute("DELETE FROM workers WHERE seen_at < ?", (cutoff,))
+        cur = conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (SUCCEEDED, FAILED, cutoff),
+        )
+        return cur.rowcount
+
+
+def worker_seen(worker: str):
+    """Record that a worker process is alive and polling."""
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO workers (name, seen_at) VALUES (?, ?)"
+            " ON CONFLICT (name) DO UPDATE SET seen_at = excluded.seen_at",
+            (worker, time.time()),
+        )
+
+
+def worker_gone(worker: str):
+    with _connect() as conn:
+        conn.execute("DELETE FROM workers WHERE name = ?", (worker,))
+
+
+def live_workers(within: float = WORKER_ALIVE_SECONDS) -> int:
+    """How many worker processes have checked in recently."""
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT COUNT(*) FROM workers WHERE seen_at >= ?", (time.time() - within,)
+        ).fetchone()
+    return row[0]
+
+
+def _clean_up(kind: str, payload: dict):
+    cleanup = _cleanups.get(kind)
+    if cleanup is None:
+        return
+    try:
+        cleanup(payload)
+    except Exception as e:
+        print(f"Cleanup after {kind} job failed: {e}")
+
+
+def run_job(job: dict) -> bool:
+    """Run a claimed job's handler and record the outcome. Returns True on success."""
+    handler = _handlers.get(job["kind"])
+    if handler is None:
+        fail(job["id"], f"No handler for job kind {job['kind']!r}")
+        return False
+
+    def progress(fraction: float, message: str = ""):
+        set_progress(job["id"], fraction, message)
+
+    finished = False
+    try:
+        try:
+            result = handler(job["user_id"], job["payload"], progress)
+        except Exception as e:
+            finished = fail(job["id"], f"{type(e).__name__}: {e}")
+            return False
+        complete(job["id"], result)
+        finished = True
+        return True
+    finally:
+        if finished:
+            _clean_up(job["kind"], job["payload"])
@@ -0,0 +1,145 @@
+"""Prometheus metrics — request latency, persistence I/O, Plaid calls, caches.
+
+Served as Prometheus text at /metrics. Each gunicorn worker keeps its own
+counters, so gunicorn.conf.py points PROMETHEUS_MULTIPROC_DIR at a shared
+directory: workers write values there (mmap'd files) and /metrics aggregates
+every worker's files. Without it (flask dev server, scripts) the in-process
+default registry is used.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+IO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+PLAID_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUEST_SECONDS = Histogram(
+    "moneyplanner_http_request_duration_seconds",
+    "Request latency by route",
+    ["method", "route"],
+)
+REQUESTS = Counter(
+    "moneyplanner_http_requests_total",
+    "Responses by route and status",
+    ["method", "route", "status"],
+)
+
+PERSISTENCE_OPS = Counter(
+    "moneyplanner_persistence_operations_total",
+    "JSON file reads/writes by collection",
+    ["collection", "op"],
+)
+PERSISTENCE_BYTES = Counter(
+    "moneyplanner_persistence_bytes_total",
+    "JSON bytes read/written by collection",
+    ["collection", "op"],
+)
+PERSISTENCE_SECONDS = Histogram(
+    "moneyplanner_persistence_duration_seconds",
+    "JSON file read/write latency by collection",
+    ["collection", "op"],
+    buckets=IO_BUCKETS,
+)
+
+PLAID_SECONDS = Histogram(
+    "moneyplanner_plaid_request_duration_seconds",
+    "Plaid API call latency by operation",
+    ["operation"],
+    buckets=PLAID_BUCKETS,
+)
+PLAID_ERRORS = Counter(
+    "moneyplanner_plaid_errors_total",
+    "Plaid API calls that raised, by operation",
+    ["operation"],
+)
+# Per item sync as distributions (an item_id label would be unbounded)
+SYNC_PAGES = Histogram(
+    "moneyplanner_plaid_sync_pages",
+    "/transactions/sync pages fetched per item sync",
+    buckets=(1, 2, 3, 5, 10, 20, 50),
+)
+SYNC_ROWS = Histogram(
+    "moneyplanner_plaid_sync_rows",
+    "Transactions per item sync, by change kind",
+    ["kind"],
+    buckets=(0, 10, 50, 100, 500, 1000, 5000, 20000),
+)
+
+CACHE_LOOKUPS = Counter(
+    "moneyplanner_cache_lookups_total",
+    "Cache lookups by cache and result (hit ratio = hit / total)",
+    ["cache", "result"],
+)
+
+ADMISSIONS = Counter(
+    "moneyplanner_admission_total",
+    "Expensive-route admissions by bucket and result (admitted/throttled/coalesced)",
+    ["bucket", "result"],
+)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    REQUEST_SECONDS.labels(method, route).observe(seconds)
+    REQUESTS.labels(method, route, str(status)).inc()
+
+
+def observe_io(collection: str, op: str, nbytes: int, seconds: float):
+    """Record one persistence read or write ("read" / "write")."""
+    PERSISTENCE_OPS.labels(collection, op).inc()
+    PERSISTENCE_BYTES.labels(collection, op).inc(nbytes)
+    PERSISTENCE_SECONDS.labels(collection, op).observe(seconds)
+
+
+@contextmanager
+def plaid_timer(operation: str):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        PLAID_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        PLAID_SECONDS.labels(operation).observe(time.perf_counter() - start)
+
+
+def observe_sync(pages: int, added: int, modified: int, removed: int):
+    SYNC_PAGES.observe(pages)
+    SYNC_ROWS.labels("added").observe(added)
+    SYNC_ROWS.labels("modified").observe(modified)
+    SYNC_ROWS.labels("removed").observe(removed)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_admission(bucket: str, result: str):
+    ADMISSIONS.labels(bucket, result).inc()
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition text for /metrics (all workers when multiprocess)."""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    """Drop a dead worker's live-only files (gunicorn child_exit hook)."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
@@ -1,12 +1,25 @@
-"""Monitoring service — weekly reviews, safe-to-spend, budget hard stops."""
+"""Monitoring service — weekly reviews, safe-to-spend, budget hard stops.
 
+Weekly reviews are built once per user and week: by the weekly batch, which
+the job worker queues when a week closes (schedule_weekly_reviews), or
+lazily on the user's first read. A stored review is never replaced except
+by a forced rebuild, which keeps its id and acknowledgement.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import uuid
 
 from models.income import IncomeEvent
 from models.transaction import Transaction
-from services.persistence import load_all, save_all, append_one
-from services.categories import BUDGET_ENVELOPES
+from services.persistence import (
+    SHARED_SCOPE, load_all, load_latest, load_one, iter_all, locked, save_all, save_one, iter_user_ids,
+)
+from services.categories import BUDGET_ENVELOPES, map_category
+
+
+def _is_spending(d: dict) -> bool:
+    return d.get("amount", 0) > 0
 
 
 def compute_safe_to_spend(user_id: str = "user-1") -> dict:
@@ -15,19 +28,20 @@ def compute_safe_to_spend(user_id: str = "user-1") -> dict:
     monthly_income = IncomeEvent.compute_rolling_average(income_events)
 
     # Get budget allocations if they exist
-    budgets = load_all("budget_config", lambda d: d, user_id=user_id)
+    budgets = load_latest("budget_config", lambda d: d, user_id=user_id)
     budget = budgets[-1] if budgets else {}
 
     fixed_expenses = budget.get("fixed_expenses", monthly_income * 0.50)
     savings_target = budget.get("savings_target", monthly_income * 0.10)
 
     # Get current month spending
-    transactions = load_all("transactions", Transaction.from_dict, user_id=user_id)
     now = datetime.utcnow()
     month_start = now.replace(day=1).strftime("%Y-%m-%d")
     month_spending = sum(
-        t.amount for t in transactions
-        if t.date >= month_start and t.amount > 0
+        t.amount for t in iter_all(
+            "transactions", Transaction.from_dict, user_id=user_id,
+            since=month_start, where=_is_spending,
+        )
     )
 
     discretionary_budget = monthly_income - fixed_expenses - savings_target
@@ -46,25 +60,40 @@ def compute_safe_to_spend(user_id: str = "user-1") -> dict:
     }
 
 
-def generate_weekly_review(user_id: str = "user-1") -> dict:
-    """Generate a weekly spending review."""
-    transactions = load_all("transactions", Transaction.from_dict, user_id=user_id)
+def _week_bounds(now: datetime) -> tuple[str, str]:
+    """(week_start, week_ending) of the last completed Monday–Sunday week."""
+    week_ending = (now - timedelta(days=now.weekday() + 1)).date()
+    week_start = week_ending - timedelta(days=6)
+    return week_start.isoformat(), week_ending.isoformat()
+
+
+def build_weekly_review(user_id: str = "user-1", week_ending: str | None = None) -> dict:
+    """Compute the spending review for the week ending on week_ending (not stored)."""
     now = datetime.utcnow()
-    week_ago = (now - timedelta(days=7)).strftime("%Y-%m-%d")
+    if week_ending:
+        week_start = (
+            datetime.strptime(week_ending, "%Y-%m-%d") - timedelta(days=6)
+        ).strftime("%Y-%m-%d")
+    else:
+        week_start, week_ending = _week_bounds(now)
 
-    week_txns = [t for t in transactions if t.date >= week_ago and t.amount > 0]
+    week_txns = list(iter_all(
+        "transactions", Transaction.from_dict, user_id=user_id,
+        since=week_start, until=week_ending, where=_is_spending,
+    ))
     total_spending = sum(t.amount for t in week_txns)
 
     # Category breakdown
     by_category = {}
     for t in week_txns:
-        cat = t.budget_category or "Other"
+        cat = t.budget_category or map_category(t.to_dict())
         by_category[cat] = by_category.get(cat, 0) + t.amount
 
-    review = {
+    return {
         "id": str(uuid.uuid4()),
         "user_id": user_id,
-        "week_ending": now.strftime("%Y-%m-%d"),
+        "week_start": week_start,
+        "week_ending": week_ending,
         "total_spending": round(total_spending, 2),
         "transaction_count": len(week_txns),
         "by_category": {k: round(v, 2) for k, v in sorted(
@@ -74,19 +103,148 @@ def generate_weekly_review(user_id: str = "user-1") -> dict:
         "created_at": now.isoformat(),
     }
 
-    append_one("weekly_reviews", review, user_id=user_id)
+
+_ACK_FIELDS = ("acknowledged", "acknowledged_at")
+
+
+def _store_review(review: dict, user_id: str, force: bool = False) -> dict:
+    """Store a review unless its week already has one; returns the stored review.
+
+    With force, the existing review is replaced but keeps its id and
+    acknowledgement.
+    """
+    with locked("weekly_reviews", user_id):
+        reviews = load_all("weekly_reviews", lambda d: d, user_id=user_id)
+        for i, existing in enumerate(reviews):
+            if existing.get("week_ending") == review["week_ending"]:
+                if not force:
+                    return existing
+                review = {
+                    **review,
+                    "id": existing.get("id", review["id"]),
+                    **{k: existing[k] for k in _ACK_FIELDS if k in existing},
+                }
+                reviews[i] = review
+                break
+        else:
+            reviews.append(review)
+        save_all("weekly_reviews", reviews, user_id=user_id)
     return review
 
 
+def generate_weekly_review(
+    user_id: str = "user-1", week_ending: str | None = None, force: bool = False
+) -> dict:
+    """Build and store the weekly review for one user (the stored one, if its week has one)."""
+    review = build_weekly_review(user_id, week_ending)
+    return _store_review(review, user_id, force)
+
+
+def stored_weekly_review(user_id: str = "user-1") -> dict | None:
+    """The stored review for the last completed week, if it has been built."""
+    _, week_ending = _week_bounds(datetime.utcnow())
+    return next(iter_all(
+        "weekly_reviews", lambda d: d, user_id=user_id,
+        where=lambda r: r.get("week_ending") == week_ending, reverse=True,
+    ), None)
+
+
+def get_weekly_review(user_id: str = "user-1") -> dict:
+    """Return the stored review for the last completed week.
+
+    Reviews are normally precomputed by the weekly batch; a user the batch
+    hasn't reached yet gets theirs built and stored once, on first read.
+    """
+    review = stored_weekly_review(user_id)
+    if review is not None:
+        return review
+    _, week_ending = _week_bounds(datetime.utcnow())
+    return generate_weekly_review(user_id, week_ending)
+
+
+def _generate_for_user(args: tuple) -> tuple[str, str | None]:
+    user_id, week_ending, force = args
+    try:
+        if not force:
+            existing = iter_all(
+                "weekly_reviews", lambda d: d, user_id=user_id,
+                where=lambda r: r.get("week_ending") == week_ending, limit=1,
+            )
+            if next(existing, None) is not None:
+                return user_id, "skipped"
+        generate_weekly_review(user_id, week_ending, force)
+        return user_id, None
+    except Exception as e:
+        return user_id, f"error: {e}"
+
+
+def generate_weekly_reviews(
+    user_ids: list[str] | None = None,
+    week_ending: str | None = None,
+    max_workers: int | None = None,
+    force: bool = False,
+) -> dict:
+    """Batch-build weekly reviews for every user in parallel (process pool).
+
+    Idempotent: users who already have a review for the week are skipped
+    unless force=True.
+    """
+    if week_ending is None:
+        _, week_ending = _week_bounds(datetime.utcnow())
+    if user_ids is None:
+        user_ids = (uid for uid in iter_user_ids() if uid != SHARED_SCOPE)
+
+    generated = skipped = 0
+    errors = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        jobs = ((uid, week_ending, force) for uid in user_ids)
+        for uid, status in pool.map(_generate_for_user, jobs, chunksize=16):
+            if status is None:
+                generated += 1
+            elif status == "skipped":
+                skipped += 1
+            else:
+                errors[uid] = status
+
+    return {
+        "week_ending": week_ending,
+        "users": generated + skipped + len(errors),
+        "generated": generated,
+        "skipped": skipped,
+        "errors": errors,
+    }
+
+
+def schedule_weekly_reviews(now: datetime | None = None) -> str | None:
+    """Queue the weekly batch for the last completed week, once; returns the job id.
+
+    Called by the job worker on every maintenance pass (tools/job_worker.py).
+    """
+    from services import jobs
+
+    _, week_ending = _week_bounds(now or datetime.utcnow())
+    with locked("weekly_review_batch", SHARED_SCOPE):
+        state = load_one("weekly_review_batch", lambda d: d, user_id=SHARED_SCOPE) or {}
+        if state.get("week_ending") == week_ending:
+            return None
+        job = jobs.submit("weekly_reviews", SHARED_SCOPE, {"week_ending": week_ending})
+        save_one("weekly_review_batch", {
+            "week_ending": week_ending,
+            "job_id": job["id"],
+            "queued_at": datetime.utcnow().isoformat(),
+        }, user_id=SHARED_SCOPE)
+    return job["id"]
+
+
 def acknowledge_review(review_id: str, user_id: str = "user-1") -> dict:
     """Mark a weekly review as acknowledged."""
-    reviews = load_all("weekly_reviews", lambda d: d, user_id=user_id)
-    for r in reviews:
-        if r.get("id") == review_id:
-            r["acknowledged"] = True
-            r["acknowledged_at"] = datetime.utcnow().isoformat()
-            save_all("weekly_reviews", reviews, user_id=user_id)
-            return r
+    with locked("weekly_reviews", user_id):
+        reviews = load_all("weekly_reviews", lambda d: d, user_id=user_id)
+        for i, r in enumerate(reviews):
+            if r.get("id") == review_id:
+                reviews[i] = r = {**r, "acknowledged": True, "acknowledged_at": datetime.utcnow().isoformat()}
+                save_all("weekly_reviews", reviews, user_id=user_id)
+                return r
     raise ValueError(f"Review {review_id} not found")
 
 
@@ -0,0 +1,209 @@
+"""Experiment outcomes — buffered ingestion with streaming per-variant statistics.
+
+record() only appends to an in-process buffer. The buffer is flushed in
+batches, every OUTCOME_FLUSH_SECONDS by a background thread or by the
+recording thread once OUTCOME_FLUSH_SIZE outcomes are waiting: one
+append_lines to the shared experiment_outcomes log and one merge into the
+experiment_stats document, together under a cross-process lock, so every
+web and job worker can record.
+
+Statistics are kept per (experiment, variant, metric) as count, mean and
+M2 (Welford). A batch is reduced on its own, then merged in with Chan's
+parallel formula, so a flush costs O(batch + keys touched) and results()
+is a read of the stats document however many outcomes there are.
+rebuild_stats() recomputes it from the log.
+
+A failed flush is retried with the same batch, so writing one must be
+idempotent. The stats document records the log offset it covers and the
+ids of the last RECENT_BATCHES batches in it (a batch's first record is
+tagged with the batch size in the log). A flush first folds in any log
+records past that offset (appended by a flush whose stats write then
+failed), then appends its batch only if the batch isn't already counted.
+"""
+
+import atexit
+import copy
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+from services.persistence import SHARED_SCOPE, append_lines, load_one, locked, read_lines, save_one
+
+OUTCOMES = "experiment_outcomes"
+STATS = "experiment_stats"
+OUTCOME_FLUSH_SIZE = int(os.getenv("OUTCOME_FLUSH_SIZE", "1000"))
+OUTCOME_FLUSH_SECONDS = float(os.getenv("OUTCOME_FLUSH_SECONDS", "1"))
+Z_95 = 1.959963984540054
+RECENT_BATCHES = 1024
+
+
+# --- Streaming statistics ---
+# An aggregate is [count, mean, m2]; variance is m2 / (count - 1).
+
+def _add(agg: list, value: float):
+    agg[0] += 1
+    delta = value - agg[1]
+    agg[1] += delta / agg[0]
+    agg[2] += delta * (value - agg[1])
+
+
+def _merge(a: list, b: list) -> list:
+    n = a[0] + b[0]
+    if not n:
+        return [0, 0.0, 0.0]
+    delta = b[1] - a[1]
+    return [n, a[1] + delta * b[0] / n, a[2] + b[2] + delta * delta * a[0] * b[0] / n]
+
+
+def _reduce(records, stats: dict | None = None) -> dict:
+    """Fold outcome records into {experiment: {variant: {metric: aggregate}}}."""
+    stats = {} if stats is None else stats
+    for r in records:
+        metrics = stats.setdefault(r["experiment_id"], {}).setdefault(r["variant"], {})
+        _add(metrics.setdefault(r["metric"], [0, 0.0, 0.0]), r["value"])
+    return stats
+
+
+def summarize(agg: list) -> dict:
+    """count, mean, variance, std and a normal-approximation 95% CI for the mean."""
+    n, mean, m2 = agg
+    variance = m2 / (n - 1) if n > 1 else 0.0
+    half = Z_95 * math.sqrt(variance / n) if n > 1 else 0.0
+    return {
+        "count": n,
+        "mean": mean,
+        "variance": variance,
+        "std": math.sqrt(variance),
+        "ci95": [mean - half, mean + half],
+    }
+
+
+def _write_batch(batch: list[dict]):
+    batch_id = batch[0]["id"]
+    with locked(STATS, SHARED_SCOPE):
+        doc = copy.deepcopy(load_one(STATS, lambda d: d, user_id=SHARED_SCOPE) or {})  # Shared parse
+        stats = doc.get("stats", {})
+        offset = doc.get("offset", 0)
+        recent = doc.get("recent", [])
+        for record, offset in read_lines(OUTCOMES, SHARED_SCOPE, offset):
+            _reduce((record,), stats)
+            if "batch" in record:
+                recent.append(record["id"])
+        if batch_id not in recent:
+            offset = append_lines(OUTCOMES, [{**batch[0], "batch": len(batch)}, *batch[1:]], SHARED_SCOPE)
+            for experiment_id, variants in _reduce(batch).items():
+                for variant, metrics in variants.items():
+                    stored = stats.setdefault(experiment_id, {}).setdefault(variant, {})
+                    for metric, agg in metrics.items():
+                        stored[metric] = _merge(stored.get(metric, [0, 0.0, 0.0]), agg)
+            recent.append(batch_id)
+        save_one(STATS, {
+            "stats": stats,
+            "offset": offset,
+            "recent": recent[-RECENT_BATCHES:],
+            "updated_at": datetime.utcnow().isoformat(),
+        }, user_id=SHARED_SCOPE)
+
+
+def results(experiment_id: str) -> dict | None:
+    """{variant: {metric: summarize()}} from flushed outcomes (None if there are none)."""
+    doc = load_one(STATS, lambda d: d, user_id=SHARED_SCOPE) or {}
+    variants = doc.get("stats", {}).get(experiment_id)
+    if variants is None:
+        return None
+    return {
+        variant: {metric: summarize(agg) for metric, agg in metrics.items()}
+        for variant, metrics in variants.items()
+    }
+
+
+def rebuild_stats() -> int:
+    """Recompute experiment_stats from the outcome log; returns the outcomes read."""
+    with locked(STATS, SHARED_SCOPE):
+        stats, count, offset, recent = {}, 0, 0, []
+        for record, offset in read_lines(OUTCOMES, SHARED_SCOPE):
+            _reduce((record,), stats)
+            count += 1
+            if "batch" in record:
+                recent.append(record["id"])
+        save_one(STATS, {
+            "stats": stats,
+            "offset": offset,
+            "recent": recent[-RECENT_BATCHES:],
+            "updated_at": datetime.utcnow().isoformat(),
+        }, user_id=SHARED_SCOPE)
+    return count
+
+
+# --- Buffer ---
+
+class OutcomeBuffer:
+    """Per-process outcome buffer with a background flusher."""
+
+    def __init__(self, flush_size: int = OUTCOME_FLUSH_SIZE, flush_seconds: float = OUTCOME_FLUSH_SECONDS):
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._pending: list[dict] = []
+        self._failed: list[list[dict]] = []  # Batches to retry as they were
+        self._flusher_pid = None
+        self.flushed = 0
+        self.flushes = 0
+
+    def _start_flusher(self):
+        # Started lazily, and again in a forked child (threads don't survive fork)
+        if self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+
+        def run():
+            while True:
+                time.sleep(self.flush_seconds)
+                try:
+                    self.flush()
+                except Exception as e:  # Keep flushing: this thread is the only one that does
+                    print(f"Outcome flusher error: {e}")
+
+        threading.Thread(target=run, name="outcome-flusher", daemon=True).start()
+
+    def add(self, record: dict):
+        with self._lock:
+            self._pending.append(record)
+            full = len(self._pending) >= self.flush_size
+            self._start_flusher()
+        if full:
+            self.flush()
+
+    def pending(self) -> int:
+        return len(self._pending) + sum(len(b) for b in self._failed)
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns how many outcomes were written.
+
+        A batch that fails is kept as it is and retried first next time.
+        """
+        with self._lock:
+            batches, self._failed = self._failed, []
+            if self._pending:
+                batches.append(self._pending)
+                self._pending = []
+        written = 0
+        for i, batch in enumerate(batches):
+            try:
+                _write_batch(batch)
+            except Exception as e:  # Any failure: the batch must not be lost
+                with self._lock:
+                    self._failed[:0] = batches[i:]
+                print(f"Outcome flush failed, {sum(len(b) for b in batches[i:])} outcomes kept: {e}")
+                break
+            written += len(batch)
+            with self._lock:
+                self.flushed += len(batch)
+                self.flushes += 1
+        return written
+
+
+buffer = OutcomeBuffer()
+atexit.register(buffer.flush)  # Don't lose a partial batch on a clean shutdown
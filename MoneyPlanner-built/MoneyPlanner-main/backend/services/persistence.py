@@ -1,82 +1,673 @@
 """Persistence service — JSON file storage scoped by user_id.
 
-Each collection is stored as data/{user_id}/{collection}.json.
+Each collection is stored as data/_users/{shard}/{user_id}/{collection}.json,
+where {shard} is a two-level hash prefix (ab/cd) of the user id, so no
+directory holds more than a few hundred entries however many users there are.
+Users still in the old flat layout (data/{user_id}/) are moved on first
+access; tools/migrate_shards.py moves everyone ahead of time.
 Railway deployments use ephemeral storage; for production, migrate to PostgreSQL.
 """
 
+import fcntl
+import hashlib
 import json
 import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Callable, TypeVar
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from services.metrics import observe_io, record_cache
 
 T = TypeVar("T")
 
-DATA_DIR = Path(__file__).parent.parent / "data"
+DATA_DIR = Path(os.getenv("DATA_DIR", Path(__file__).parent.parent / "data"))
 DATA_DIR.mkdir(exist_ok=True)
+USERS_DIR = DATA_DIR / "_users"
+
+# Pseudo-user scope for population-level collections (e.g. peer benchmarks)
+SHARED_SCOPE = "_shared"
+
+# Per-user files that used to live at the top level as {collection}_{user_id}.json
+LEGACY_FLAT_COLLECTIONS = ("budget_items", "category_overrides")
+
+
+def shard_of(user_id: str) -> str:
+    """Relative shard directory for a user, e.g. "3f/a2"."""
+    h = hashlib.sha1(user_id.encode()).hexdigest()
+    return f"{h[:2]}/{h[2:4]}"
+
+
+def _sharded_dir(user_id: str) -> Path:
+    # Scopes like _shared aren't users: they stay at the top level
+    if user_id.startswith("_"):
+        return DATA_DIR / user_id
+    return USERS_DIR / shard_of(user_id) / user_id
+
 
+def migrate_user(user_id: str) -> bool:
+    """Move a user's flat-layout directory and top-level files into their shard.
 
-def _user_dir(user_id: str) -> Path:
-    """Get or create user-specific data directory."""
-    d = DATA_DIR / user_id
-    d.mkdir(exist_ok=True)
+    Renames within DATA_DIR, so it is safe while the app is serving: each file
+    keeps its inode (held locks stay valid) and readers see either layout.
+    Returns True if anything moved.
+    """
+    target = _sharded_dir(user_id)
+    moved = False
+    legacy = DATA_DIR / user_id
+    if legacy != target and legacy.is_dir() and not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(legacy, target)
+            moved = True
+        except FileNotFoundError:
+            pass  # Another process moved it first
+    for collection in LEGACY_FLAT_COLLECTIONS:
+        flat = DATA_DIR / f"{collection}_{user_id}.json"
+        if flat.exists():
+            target.mkdir(parents=True, exist_ok=True)
+            dest = target / f"{collection}.json"
+            try:
+                if dest.exists():
+                    flat.unlink()  # Already written in the new layout; it wins
+                else:
+                    os.rename(flat, dest)
+                    moved = True
+            except FileNotFoundError:
+                pass
+    return moved
+
+
+def user_dir(user_id: str) -> Path:
+    """Get or create a user's data directory (migrating a flat-layout one)."""
+    d = _sharded_dir(user_id)
+    if not d.is_dir():
+        migrate_user(user_id)
+        d.mkdir(parents=True, exist_ok=True)
     return d
 
 
-def _collection_path(user_id: str, collection: str) -> Path:
-    return _user_dir(user_id) / f"{collection}.json"
+def collection_path(user_id: str, collection: str) -> Path:
+    return user_dir(user_id) / f"{collection}.json"
 
 
-def load_all(collection: str, from_dict: Callable[[dict], T], user_id: str = "user-1") -> list[T]:
-    """Load all items from a collection."""
-    path = _collection_path(user_id, collection)
+# --- Request-scoped read memo ---
+# A view that several others overlap with (the dashboard) runs them inside
+# read_memo(): every read_json of the same file version (inode, size, mtime)
+# returns one parsed copy, so a collection is read once however many views
+# use it, while a write in between still shows up as a new version. Threads
+# run under contextvars.copy_context() share the memo; a thread reading a
+# file another is already parsing waits for that parse.
+
+
+class _ReadMemo:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files: dict[tuple, Future] = {}
+
+    def get(self, key: tuple, load: Callable[[], object]):
+        with self._lock:
+            pending = self._files.get(key)
+            hit = pending is not None
+            if not hit:
+                pending = self._files[key] = Future()
+        record_cache("read_memo", hit)
+        if not hit:
+            try:
+                pending.set_result(load())
+            except BaseException as e:
+                pending.set_exception(e)
+        return pending.result()
+
+
+_read_memo: ContextVar[_ReadMemo | None] = ContextVar("read_memo", default=None)
+
+
+@contextmanager
+def read_memo():
+    """Share parsed files between everything read in this block (and its copied contexts)."""
+    if _read_memo.get() is not None:
+        yield  # Already memoizing
+        return
+    token = _read_memo.set(_ReadMemo())
+    try:
+        yield
+    finally:
+        _read_memo.reset(token)
+
+
+# read_json/write_json label metrics with the file stem; pass `collection`
+# when the file name embeds an id (e.g. budget_items_{user_id}.json).
+
+def read_json(path: Path, collection: str | None = None):
+    """Parse a JSON file (raises FileNotFoundError / JSONDecodeError).
+
+    Inside read_memo(), each version of a file is parsed once and the result
+    shared, so callers that change what they read must copy it first (the
+    writers below do).
+    """
+    memo = _read_memo.get()
+    if memo is None:
+        return _parse_json(path, collection)
+    st = path.stat()
+    return memo.get((str(path), st.st_ino, st.st_size, st.st_mtime_ns), lambda: _parse_json(path, collection))
+
+
+def _parse_json(path: Path, collection: str | None):
+    start = time.perf_counter()
+    raw = path.read_bytes()
+    data = json.loads(raw)
+    observe_io(collection or path.stem, "read", len(raw), time.perf_counter() - start)
+    return data
+
+
+def write_json(path: Path, data, indent: int | None = 2, collection: str | None = None) -> os.stat_result:
+    """Atomically replace path with JSON; concurrent readers never see a partial file.
+
+    Returns the stat of the file as written (the rename keeps it).
+    """
+    start = time.perf_counter()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            json.dump(data, fh, indent=indent)
+            nbytes = fh.tell()
+        st = os.stat(tmp)
+        os.replace(tmp, path)  # mkstemp files are already 0600
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    observe_io(collection or path.stem, "write", nbytes, time.perf_counter() - start)
+    return st
+
+
+def write_json_groups(path: Path, groups: dict[str, Iterable], collection: str | None = None) -> os.stat_result:
+    """Atomically write {key: [item, ...]}, serializing items one at a time.
+
+    The values may be generators (e.g. over a spool file), so an item-keyed
+    collection can be written without its items all being in memory at once.
+    """
+    start = time.perf_counter()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write("{")
+            for i, (key, items) in enumerate(groups.items()):
+                fh.write(f"{', ' if i else ''}{json.dumps(key)}: [")
+                for j, item in enumerate(items):
+                    if j:
+                        fh.write(", ")
+                    fh.write(json.dumps(item))
+                fh.write("]")
+            fh.write("}")
+            nbytes = fh.tell()
+        st = os.stat(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    observe_io(collection or path.stem, "write", nbytes, time.perf_counter() - start)
+    return st
+
+
+def _scan_shard(top: Path) -> list[str]:
+    return [
+        entry.name
+        for sub in os.scandir(top) if sub.is_dir()
+        for entry in os.scandir(sub.path) if entry.is_dir()
+    ]
+
+
+def iter_user_ids(workers: int = 16) -> Iterator[str]:
+    """Every user with data (for batch jobs), walking shards in parallel.
+
+    Yields shard by shard in no particular order, then any users still in
+    the flat layout.
+    """
+    if USERS_DIR.is_dir():
+        tops = [Path(e.path) for e in os.scandir(USERS_DIR) if e.is_dir()]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for user_ids in pool.map(_scan_shard, tops):
+                yield from user_ids
+    for entry in os.scandir(DATA_DIR):
+        if entry.is_dir() and not entry.name.startswith((".", "_")):
+            yield entry.name
+
+
+def list_user_ids() -> list[str]:
+    """List every user that has a data directory (for batch jobs)."""
+    return sorted(set(iter_user_ids()))
+
+
+def user_data_size(user_id: str) -> dict:
+    """Files and bytes a user has on disk (for profiling/diagnostics)."""
+    d = _sharded_dir(user_id)
+    sizes = [p.stat().st_size for p in d.glob("*.json")] if d.is_dir() else []
+    return {"files": len(sizes), "bytes": sum(sizes)}
+
+
+def _records(collection: str, user_id: str) -> list[dict]:
+    """A collection's raw records ([] if missing or unreadable)."""
+    path = collection_path(user_id, collection)
     if not path.exists():
         return []
     try:
-        data = json.loads(path.read_text())
-        return [from_dict(d) for d in data]
-    except (json.JSONDecodeError, KeyError):
+        data = read_json(path)
+    except json.JSONDecodeError:
         return []
+    if isinstance(data, dict):
+        # Item-keyed collections (Plaid transactions: {item_id: [...]})
+        data = [d for items in data.values() for d in items]
+    return data
+
+
+def load_all(collection: str, from_dict: Callable[[dict], T], user_id: str = "user-1") -> list[T]:
+    """Load all items from a collection."""
+    try:
+        return [from_dict(d) for d in _records(collection, user_id)]
+    except KeyError:
+        return []
+
+
+_STREAM_READ_CHARS = 1 << 16
+_WS = " \t\n\r"
+
+
+def stream_records(
+    collection: str, user_id: str = "user-1", progress: Callable[[float], None] | None = None
+) -> Iterator[tuple[str | None, dict]]:
+    """(group, record) for each record of a list or item-keyed collection.
+
+    Decodes one record at a time from 64K reads instead of parsing the file
+    whole, so memory stays flat for exports of any size. group is the item
+    key for item-keyed collections ({item_id: [...]}) and None for lists.
+    progress, if given, is called with the fraction of the file read.
+    """
+    path = collection_path(user_id, collection)
+    try:
+        fh = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+    decoder = json.JSONDecoder()
+    size = os.fstat(fh.fileno()).st_size or 1
+    with fh:
+        buf, pos, consumed, eof = "", 0, 0, False
+
+        def fill() -> bool:
+            nonlocal buf, pos, consumed, eof
+            chunk = fh.read(_STREAM_READ_CHARS)
+            consumed += len(chunk)
+            if progress:
+                progress(min(consumed / size, 1.0))
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            return not eof
+
+        def peek() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _WS:
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not fill():
+                    raise json.JSONDecodeError("Unexpected end of file", buf, pos)
+
+        def value():
+            nonlocal pos
+            peek()
+            while True:
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if fill():
+                        continue
+                    raise
+                if end == len(buf) and not eof and not isinstance(obj, (dict, list, str)):
+                    fill()  # A number or literal may continue in the next read
+                    continue
+                pos = end
+                return obj
+
+        def array(group):
+            nonlocal pos
+            if peek() != "[":
+                raise json.JSONDecodeError("Expected a list", buf, pos)
+            pos += 1
+            if peek() == "]":
+                pos += 1
+                return
+            while True:
+                yield group, value()
+                sep = peek()
+                pos += 1
+                if sep == "]":
+                    return
+                if sep != ",":
+                    raise json.JSONDecodeError("Expected , or ]", buf, pos - 1)
+
+        if peek() != "{":
+            yield from array(None)
+            return
+        pos += 1
+        if peek() == "}":
+            return
+        while True:
+            key = value()
+            if peek() != ":":
+                raise json.JSONDecodeError("Expected :", buf, pos)
+            pos += 1
+            yield from array(key)
+            sep = peek()
+            pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise json.JSONDecodeError("Expected , or }", buf, pos - 1)
+
+
+def iter_all(
+    collection: str,
+    from_dict: Callable[[dict], T],
+    user_id: str = "user-1",
+    *,
+    where: Callable[[dict], bool] | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    limit: int | None = None,
+    reverse: bool = False,
+    date_key: str = "date",
+) -> Iterator[T]:
+    """Stream a collection's items, filtering raw records before hydration.
+
+    since/until are inclusive ISO date bounds on record[date_key]; `where`
+    sees the raw dict. Only records that pass are passed to from_dict, and
+    iteration stops after `limit` items. reverse=True walks newest-appended
+    first, so `next(iter_all(..., reverse=True), None)` is the latest item.
+    The bounds are plain parameters (not a predicate) so a database backend
+    can turn them into an indexed range query.
+    """
+    records = _records(collection, user_id)
+    if reverse:
+        records = reversed(records)
+    if limit is not None and limit <= 0:
+        return
+    count = 0
+    for d in records:
+        if since is not None or until is not None:
+            value = d.get(date_key) or ""
+            if (since is not None and value < since) or (until is not None and value > until):
+                continue
+        if where is not None and not where(d):
+            continue
+        yield from_dict(d)
+        count += 1
+        if count == limit:
+            return
 
 
 def save_all(collection: str, items: list, user_id: str = "user-1"):
     """Save all items to a collection (overwrites)."""
-    path = _collection_path(user_id, collection)
+    path = collection_path(user_id, collection)
     data = [i.to_dict() if hasattr(i, "to_dict") else i for i in items]
-    path.write_text(json.dumps(data, indent=2))
-    os.chmod(path, 0o600)
+    write_json(path, data)
+    _write_head(path, data)
+    bump_version(collection, user_id)
 
 
 def append_one(collection: str, item, user_id: str = "user-1"):
     """Append a single item to a collection."""
-    path = _collection_path(user_id, collection)
+    path = collection_path(user_id, collection)
     data = []
     if path.exists():
         try:
-            data = json.loads(path.read_text())
+            data = list(read_json(path))  # A copy: the parse may be shared (read_memo)
         except json.JSONDecodeError:
             data = []
     data.append(item.to_dict() if hasattr(item, "to_dict") else item)
-    path.write_text(json.dumps(data, indent=2))
-    os.chmod(path, 0o600)
+    write_json(path, data)
+    _write_head(path, data)
+    bump_version(collection, user_id)
+
+
+# --- Head pointers ---
+# List collections keep their last HEAD_SIZE records in a {collection}.head.json
+# sidecar, written after the collection itself. "Latest record" reads use it
+# without parsing the whole collection. The head carries the length and hash
+# of the bytes those records take at the end of the file as write_json lays it
+# out, and a reader checks them against the file's actual last bytes (one
+# short read), so a head is trusted only if the file really ends with its
+# records. Otherwise (written some other way, or a write in progress) the
+# reader parses the collection and rewrites the head.
+
+HEAD_SIZE = 16
+
+
+def _head_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.head.json")
+
+
+def _tail(records: list) -> bytes:
+    """What a list written by write_json ends with, when these are its last records."""
+    text = json.dumps(records, indent=2)
+    # Without the "[", the last records of a longer list serialize the same
+    return (text[1:] if records else text).encode()
+
+
+def _tail_key(tail: bytes) -> list:
+    return [len(tail), hashlib.blake2b(tail, digest_size=16).hexdigest()]
+
+
+def _file_tail(path: Path, size: int) -> bytes | None:
+    try:
+        with open(path, "rb") as fh:
+            fh.seek(-size, os.SEEK_END)
+            return fh.read(size)
+    except (FileNotFoundError, OSError):
+        return None  # Gone, or shorter than size
+
+
+def _write_head(path: Path, data: list):
+    records = data[-HEAD_SIZE:]
+    head = {"tail": _tail_key(_tail(records)), "records": records}
+    write_json(_head_path(path), head, indent=None, collection=f"{path.stem}.head")
+
+
+def _read_head(path: Path) -> list[dict] | None:
+    """The head's records if the collection file ends with them, else None."""
+    head_path = _head_path(path)
+    try:
+        head = read_json(head_path, collection=f"{path.stem}.head")
+        size, _ = head["tail"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+    tail = _file_tail(path, size)
+    return head["records"] if tail is not None and _tail_key(tail) == head["tail"] else None
+
+
+def load_latest(
+    collection: str, from_dict: Callable[[dict], T], user_id: str = "user-1", n: int = 1
+) -> list[T]:
+    """The last n items of a list collection (collection order, newest last).
+
+    O(1) in the collection's length for n <= HEAD_SIZE while the head is fresh.
+    """
+    path = collection_path(user_id, collection)
+    if not path.exists():
+        return []
+    records = _read_head(path) if n <= HEAD_SIZE else None
+    if records is None:
+        try:
+            data = read_json(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+        if not isinstance(data, list):
+            return [from_dict(data)] if isinstance(data, dict) and n > 0 else []
+        tail = _tail(data[-HEAD_SIZE:])
+        if _file_tail(path, len(tail)) == tail:  # Laid out by write_json and not replaced since
+            _write_head(path, data)
+        records = data
+    return [from_dict(d) for d in records[-n:]] if n > 0 else []
 
 
 def load_one(collection: str, from_dict: Callable[[dict], T], user_id: str = "user-1") -> T | None:
     """Load a single-document collection (e.g., user phase state)."""
-    path = _collection_path(user_id, collection)
+    path = collection_path(user_id, collection)
     if not path.exists():
         return None
     try:
-        data = json.loads(path.read_text())
+        head = _read_head(path)
+        if head is not None:
+            return from_dict(head[-1]) if head else None
+        data = read_json(path)
         if isinstance(data, list):
             return from_dict(data[-1]) if data else None
         return from_dict(data)
-    except (json.JSONDecodeError, KeyError):
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
         return None
 
 
 def save_one(collection: str, item, user_id: str = "user-1"):
     """Save a single document to a collection."""
-    path = _collection_path(user_id, collection)
+    path = collection_path(user_id, collection)
     data = item.to_dict() if hasattr(item, "to_dict") else item
-    path.write_text(json.dumps(data, indent=2))
-    os.chmod(path, 0o600)
+    write_json(path, data)
+    bump_version(collection, user_id)
+
+
+# --- Keyed collections ---
+# {collection}.json as {id: item} (insertion-ordered), for collections edited
+# one item at a time. Lookups are by key; a batch of edits is one locked
+# read-modify-write. A list-shaped file (the old format) is keyed by "id" on read.
+
+def load_keyed(collection: str, user_id: str = "user-1") -> dict[str, dict]:
+    return _load_keyed(collection, user_id, read_json)
+
+
+def _load_keyed(collection: str, user_id: str, read: Callable[[Path], object]) -> dict[str, dict]:
+    path = collection_path(user_id, collection)
+    if not path.exists():
+        return {}
+    try:
+        data = read(path)
+    except json.JSONDecodeError:
+        return {}
+    if isinstance(data, list):
+        return {item["id"]: item for item in data if "id" in item}
+    return data
+
+
+def mutate_keyed(collection: str, fn: Callable[[dict[str, dict]], T], user_id: str = "user-1") -> T:
+    """Apply fn to the keyed items under the collection lock and write once.
+
+    If fn raises, nothing is written.
+    """
+    with locked(collection, user_id):
+        # Parsed afresh, never the shared read_memo copy: fn edits items in place
+        items = _load_keyed(collection, user_id, lambda path: _parse_json(path, None))
+        result = fn(items)
+        write_json(collection_path(user_id, collection), items)
+        bump_version(collection, user_id)
+    return result
+
+
+# --- Append-only logs ---
+# {collection}.jsonl: one compact JSON record per line, appended with a single
+# O_APPEND write so a record is never interleaved with another writer's.
+# Readers can resume from a byte offset returned by an earlier append/read.
+
+def _log_path(user_id: str, collection: str) -> Path:
+    return user_dir(user_id) / f"{collection}.jsonl"
+
+
+def append_line(collection: str, record: dict, user_id: str = "user-1") -> int:
+    """Append one record to a log collection; returns the file's new end offset."""
+    return append_lines(collection, [record], user_id)
+
+
+def append_lines(collection: str, records: list[dict], user_id: str = "user-1") -> int:
+    """Append a batch of records in one write; returns the file's new end offset.
+
+    A single O_APPEND write, so concurrent appenders (other processes
+    included) never interleave inside the batch.
+    """
+    path = _log_path(user_id, collection)
+    data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode()
+    start = time.perf_counter()
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, data)
+        end = os.lseek(fd, 0, os.SEEK_CUR)
+    finally:
+        os.close(fd)
+    observe_io(collection, "write", len(data), time.perf_counter() - start)
+    bump_version(collection, user_id)
+    return end
+
+
+def read_lines(collection: str, user_id: str = "user-1", offset: int = 0) -> Iterator[tuple[dict, int]]:
+    """Stream (record, end offset) from a log collection, starting at offset.
+
+    A trailing line without its newline (an append in progress) is skipped.
+    """
+    path = _log_path(user_id, collection)
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        return
+    start, begin = time.perf_counter(), offset
+    with fh:
+        fh.seek(offset)
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            yield json.loads(line), offset
+        observe_io(collection, "read", offset - begin, time.perf_counter() - start)
+
+
+@contextmanager
+def locked(collection: str, user_id: str = "user-1"):
+    """Exclusive cross-process lock around a read-modify-write of a collection."""
+    path = user_dir(user_id) / f".{collection}.lock"
+    with open(path, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+# --- Data versions ---
+# Per-user counters bumped on every write to a collection. Readers derive
+# ETags and cache keys from them without touching the collection itself.
+# "_epoch" is randomized when the file is created so counters that restart
+# (e.g. after a data reset) never reproduce an old version.
+
+def _versions_path(user_id: str) -> Path:
+    return user_dir(user_id) / "_versions.json"
+
+
+def get_versions(user_id: str = "user-1") -> dict:
+    """Current version counters for all of a user's collections."""
+    path = _versions_path(user_id)
+    if not path.exists():
+        return {}
+    try:
+        return read_json(path)
+    except json.JSONDecodeError:
+        return {}
+
+
+def bump_version(collection: str, user_id: str = "user-1"):
+    """Record that a collection changed."""
+    with locked("_versions", user_id):
+        versions = dict(get_versions(user_id))  # A copy: the parse may be shared (read_memo)
+        versions.setdefault("_epoch", uuid.uuid4().hex[:8])
+        versions[collection] = versions.get(collection, 0) + 1
+        write_json(_versions_path(user_id), versions, indent=None)
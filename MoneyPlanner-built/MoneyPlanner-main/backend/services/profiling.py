@@ -0,0 +1,153 @@
+"""On-demand request profiling — cProfile around a view, stored for later reading.
+
+A request is profiled when an admin sends `X-Profile: 1`, or at random with
+probability PROFILE_SAMPLE_RATE (default off). Each profile is saved as
+{id}.prof (pstats, open with `python -m pstats` or snakeviz) plus {id}.json
+metadata: route, user, user data size, duration and the top functions by
+cumulative time. Only the newest PROFILE_MAX_FILES are kept.
+
+One request per process is profiled at a time. On Python 3.12+ cProfile
+is built on sys.monitoring, which is process-wide and allows one profiler
+per interpreter, so a profile also counts whatever other threads ran
+meanwhile (other requests, Plaid fan-out via app._offload); before 3.12 it
+covers only the request thread, and offloaded work shows up as wait time.
+A request that can't be profiled (another is, or the profiler won't
+start) just runs unprofiled.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from services.persistence import DATA_DIR, user_data_size, write_json
+
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(DATA_DIR / "_profiles")))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+PROFILE_TOP_FUNCTIONS = 15
+
+
+def trigger_for(header_value: str | None, allowed: bool) -> str | None:
+    """Why this request should be profiled ("header" / "sample"), or None."""
+    if allowed and header_value and header_value.lower() not in ("0", "false"):
+        return "header"
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+# Held while a request is profiled (see the module docstring)
+_profiling = threading.Lock()
+
+
+def profile_call(fn, *, route: str, method: str, user_id: str, trigger: str):
+    """Run fn() under cProfile and store the result. Returns (fn(), profile_id).
+
+    profile_id is None when fn() ran unprofiled; profiling never fails the call.
+    """
+    if not _profiling.acquire(blocking=False):
+        return fn(), None
+    try:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except Exception as e:  # e.g. "Another profiling tool is already active" on 3.12+
+            print(f"Profiler not started: {e}")
+            return fn(), None
+        profile_id = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        start = time.perf_counter()
+        error = None
+        try:
+            return fn(), profile_id
+        except Exception as e:
+            error = repr(e)
+            raise
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - start
+            _store_safely(profiler, {
+                "id": profile_id,
+                "route": route,
+                "method": method,
+                "user_id": user_id,
+                "duration_ms": round(duration * 1000, 2),
+                "trigger": trigger,
+                "error": error,
+                "created_at": datetime.now().isoformat(),
+            })
+    finally:
+        _profiling.release()
+
+
+def _store_safely(profiler: cProfile.Profile, meta: dict):
+    try:
+        _store(profiler, meta)
+    except Exception as e:
+        print(f"Profile {meta['id']} not saved: {e}")
+
+
+def _store(profiler: cProfile.Profile, meta: dict):
+    meta["user_data"] = user_data_size(meta["user_id"])
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(PROFILE_DIR / f"{meta['id']}.prof")
+    stats = pstats.Stats(profiler).sort_stats("cumulative")
+    meta["top"] = [
+        {
+            "function": f"{Path(filename).name}:{line}({name})",
+            "calls": calls,
+            "own_ms": round(own * 1000, 2),
+            "cumulative_ms": round(cumulative * 1000, 2),
+        }
+        for (filename, line, name), (_, calls, own, cumulative, _) in sorted(
+            stats.stats.items(), key=lambda kv: kv[1][3], reverse=True
+        )[:PROFILE_TOP_FUNCTIONS]
+    ]
+    write_json(PROFILE_DIR / f"{meta['id']}.json", meta, collection="profiles")
+    _prune()
+
+
+def _prune():
+    metas = sorted(PROFILE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for path in metas[: max(0, len(metas) - PROFILE_MAX_FILES)]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def list_profiles(limit: int = 20, route: str | None = None) -> list[dict]:
+    """Stored profiles, slowest first (without the per-function breakdown)."""
+    if not PROFILE_DIR.exists():
+        return []
+    metas = []
+    for path in PROFILE_DIR.glob("*.json"):
+        try:
+            meta = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue  # Pruned by another worker
+        if route is None or meta["route"] == route:
+            meta.pop("top", None)
+            metas.append(meta)
+    metas.sort(key=lambda m: m["duration_ms"], reverse=True)
+    return metas[:limit]
+
+
+def get_profile(profile_id: str, lines: int = 40) -> dict | None:
+    """Metadata plus a pstats text report (top `lines` by cumulative time)."""
+    meta_path = PROFILE_DIR / f"{profile_id}.json"
+    prof_path = meta_path.with_suffix(".prof")
+    if not profile_id.replace("-", "").isalnum() or not prof_path.exists():
+        return None
+    out = io.StringIO()
+    pstats.Stats(str(prof_path), stream=out).sort_stats("cumulative").print_stats(lines)
+    try:
+        meta = json.loads(meta_path.read_text())
+    except FileNotFoundError:
+        return None
+    return {**meta, "report": out.getvalue()}
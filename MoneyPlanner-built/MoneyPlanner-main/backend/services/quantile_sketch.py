@@ -0,0 +1,104 @@
+"""Quantile sketch — mergeable fixed-bin histogram for bounded rates (0–100%).
+
+Savings rates are bounded and change in place, so unlike t-digest/KLL this
+sketch supports exact removal of a user's previous value. Size and percentile
+lookups are bounded by the bin count, independent of how many users it holds.
+
+Each bin also keeps the sum of its values, so a quantile is read at the mean
+of the bin it falls in rather than the bin's center: exact when the bin's
+values are all equal (users pick round rates), within the bin otherwise.
+"""
+
+
+class RateSketch:
+    BIN_WIDTH = 0.25  # percentage points
+    MAX_RATE = 100.0
+
+    def __init__(self, counts: dict | None = None, total: int = 0, value_sum: float = 0.0,
+                 sums: dict | None = None):
+        self.counts = counts or {}  # bin index → count (sparse)
+        self.sums = sums or {}  # bin index → sum of its values
+        self.total = total
+        self.value_sum = value_sum
+
+    def _bin(self, rate: float) -> int:
+        rate = min(max(rate, 0.0), self.MAX_RATE)
+        return int(rate / self.BIN_WIDTH)
+
+    def add(self, rate: float):
+        b = self._bin(rate)
+        self.counts[b] = self.counts.get(b, 0) + 1
+        self.sums[b] = self.sums.get(b, 0.0) + rate
+        self.total += 1
+        self.value_sum += rate
+
+    def remove(self, rate: float):
+        b = self._bin(rate)
+        if not self.counts.get(b):
+            return
+        self.counts[b] -= 1
+        self.sums[b] -= rate
+        if not self.counts[b]:
+            del self.counts[b], self.sums[b]
+        self.total -= 1
+        self.value_sum -= rate
+
+    def merge(self, other: "RateSketch") -> "RateSketch":
+        for b, n in other.counts.items():
+            self.counts[b] = self.counts.get(b, 0) + n
+            self.sums[b] = self.sums.get(b, 0.0) + other.sums[b]
+        self.total += other.total
+        self.value_sum += other.value_sum
+        return self
+
+    def percentile_of(self, rate: float) -> float:
+        """Share of values below rate (ties count half), as 0–100."""
+        if not self.total:
+            return 0.0
+        b = self._bin(rate)
+        below = sum(n for i, n in self.counts.items() if i < b)
+        return 100.0 * (below + 0.5 * self.counts.get(b, 0)) / self.total
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q (0–1), to within one bin.
+
+        Interpolates linearly between the two nearest ranks (as
+        statistics.quantiles(method="inclusive") does), each taken as the
+        mean of its bin.
+        """
+        if not self.total:
+            return 0.0
+        position = min(max(q, 0.0), 1.0) * (self.total - 1)
+        lower = int(position)
+        upper = min(lower + 1, self.total - 1)
+        values = {}
+        seen = 0
+        for b in sorted(self.counts):
+            n = self.counts[b]
+            for rank in (lower, upper):
+                if seen <= rank < seen + n:
+                    values[rank] = self.sums[b] / n
+            if upper < seen + n:
+                break
+            seen += n
+        return round(values[lower] + (position - lower) * (values[upper] - values[lower]), 4)
+
+    def mean(self) -> float:
+        return self.value_sum / self.total if self.total else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "counts": {str(b): n for b, n in self.counts.items()},
+            "sums": {str(b): v for b, v in self.sums.items()},
+            "total": self.total,
+            "value_sum": self.value_sum,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RateSketch":
+        return cls(
+            counts={int(b): n for b, n in d.get("counts", {}).items()},
+            total=d.get("total", 0),
+            value_sum=d.get("value_sum", 0.0),
+            sums={int(b): v for b, v in d["sums"].items()},
+        )
@@ -0,0 +1,192 @@
+"""
+Firebase ID-token verification with a claims cache.
+
+firebase_auth.verify_id_token does an RSA signature check on every call and
+refetches Google's signing certs whenever its HTTP cache lapses. TokenVerifier
+keeps the certs in memory, refreshed on a background thread before their
+max-age runs out, and caches decoded claims by token hash until the token's
+exp — a repeat request with the same token is a dict lookup.
+
+Cached tokens are not re-checked for revocation; routes that care use
+firebase_auth.verify_id_token(check_revoked=True) instead (see app.py).
+
+The cert source is injectable: pass cert_fetcher returning
+({kid: PEM cert or public key}, max_age_seconds) to verify tokens signed with
+a local key set.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+
+from services.metrics import record_cache
+
+FIREBASE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+CERT_REFRESH_MARGIN_SECONDS = 300  # Refresh this long before certs expire
+CERT_RETRY_SECONDS = 30
+
+
+class InvalidTokenError(ValueError):
+    pass
+
+
+class ExpiredTokenError(InvalidTokenError):
+    pass
+
+
+class RevokedTokenError(InvalidTokenError):
+    pass
+
+
+def fetch_google_certs() -> tuple[dict, int]:
+    """Fetch Firebase signing certs and their Cache-Control max-age."""
+    with urllib.request.urlopen(FIREBASE_CERTS_URL, timeout=10) as resp:
+        certs = json.load(resp)
+        match = re.search(r"max-age=(\d+)", resp.headers.get("Cache-Control", ""))
+    return certs, int(match.group(1)) if match else 3600
+
+
+class TokenVerifier:
+    """Verify Firebase ID tokens, caching claims until each token expires."""
+
+    def __init__(self, project_id: str, cert_fetcher=fetch_google_certs,
+                 max_entries: int = TOKEN_CACHE_MAX_ENTRIES, clock=time.time):
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self._fetch = cert_fetcher
+        self._max_entries = max_entries
+        self._clock = clock
+        self._claims = OrderedDict()  # sha256(token) -> (exp, claims)
+        self._lock = threading.Lock()
+        self._certs = {}
+        self._certs_expire_at = 0.0
+        self._certs_fetched_at = 0.0
+        self._cert_lock = threading.Lock()
+        self._refresher_pid = None
+        self.hits = 0
+        self.misses = 0
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # A lock held by a thread of the parent (e.g. mid cert fetch under
+        # preload_app) stays held in the child, where nothing will release it
+        self._lock = threading.Lock()
+        self._cert_lock = threading.Lock()
+        self._refresher_pid = None
+
+    def start(self):
+        """Prefetch certs and keep them fresh (idempotent; restarts after fork)."""
+        if self._refresher_pid == os.getpid():
+            return
+        with self._cert_lock:
+            if self._refresher_pid == os.getpid():
+                return
+            self._refresher_pid = os.getpid()
+        threading.Thread(target=self._refresh_loop, name="firebase-certs", daemon=True).start()
+
+    def verify(self, token: str) -> dict:
+        """Return decoded claims (with "uid") or raise InvalidTokenError."""
+        self.start()
+        key = hashlib.sha256(token.encode()).hexdigest()
+        now = self._clock()
+        with self._lock:
+            entry = self._claims.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._claims.move_to_end(key)
+                    self.hits += 1
+                    record_cache("token", True)
+                    return entry[1]
+                del self._claims[key]
+            self.misses += 1
+        record_cache("token", False)
+
+        claims = self._decode(token, now)
+        with self._lock:
+            self._claims[key] = (claims["exp"], claims)
+            while len(self._claims) > self._max_entries:
+                self._claims.popitem(last=False)
+        return claims
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._claims), "hits": self.hits, "misses": self.misses}
+
+    # --- internals ---
+
+    def _decode(self, token: str, now: float) -> dict:
+        from google.auth import jwt as google_jwt
+
+        try:
+            header = google_jwt.decode_header(token)
+            unverified = google_jwt.decode(token, verify=False)
+        except (ValueError, TypeError) as e:
+            raise InvalidTokenError(f"Malformed token: {e}") from e
+        if header.get("alg") != "RS256":
+            raise InvalidTokenError("Token must be signed with RS256")
+        if unverified.get("exp", 0) <= now:
+            raise ExpiredTokenError("Token expired")
+
+        certs = self._get_certs(now)
+        if header.get("kid") not in certs:
+            # Google rotated keys since our last fetch
+            certs = self._get_certs(now, force=True)
+            if header.get("kid") not in certs:
+                raise InvalidTokenError("Token signed with unknown key")
+        try:
+            claims = google_jwt.decode(token, certs=certs, audience=self.project_id)
+        except ValueError as e:
+            raise InvalidTokenError(str(e)) from e
+
+        sub = claims.get("sub")
+        if claims.get("iss") != self.issuer:
+            raise InvalidTokenError("Token has incorrect issuer")
+        if not isinstance(sub, str) or not sub or len(sub) > 128:
+            raise InvalidTokenError("Token has invalid subject")
+        if claims.get("auth_time", 0) > now:
+            raise InvalidTokenError("Token auth_time is in the future")
+        claims["uid"] = sub
+        return claims
+
+    def _get_certs(self, now: float, force: bool = False) -> dict:
+        # Forced refetches (unknown kid) are throttled so junk tokens can't hammer Google
+        force = force and now - self._certs_fetched_at >= CERT_RETRY_SECONDS
+        if self._certs and now < self._certs_expire_at and not force:
+            return self._certs
+        with self._cert_lock:
+            if self._certs and now < self._certs_expire_at and not force:
+                return self._certs
+            try:
+                self._set_certs(*self._fetch())
+            except Exception as e:
+                if not self._certs:
+                    raise InvalidTokenError(f"Could not fetch signing certs: {e}") from e
+                print(f"Firebase cert refresh failed, keeping previous set: {e}")
+        return self._certs
+
+    def _set_certs(self, certs: dict, max_age: int):
+        self._certs = certs
+        self._certs_fetched_at = self._clock()
+        self._certs_expire_at = self._certs_fetched_at + max_age
+
+    def _refresh_loop(self):
+        while True:
+            try:
+                # Fetched outside the lock: requests keep verifying with the
+                # current certs, and a fork mid-fetch can't inherit it held
+                certs, max_age = self._fetch()
+                with self._cert_lock:
+                    self._set_certs(certs, max_age)
+                wait = self._certs_expire_at - self._clock() - CERT_REFRESH_MARGIN_SECONDS
+            except Exception as e:
+                print(f"Firebase cert prefetch failed: {e}")
+                wait = CERT_RETRY_SECONDS
+            time.sleep(max(wait, CERT_RETRY_SECONDS))
@@ -0,0 +1,332 @@
+"""Transaction import — bulk-loads bank exports (CSV, OFX, XLSX) into the transaction store.
+
+Files are parsed as a stream and handled chunk_size rows at a time: each
+chunk is normalized to the stored transaction shape, deduplicated and
+categorized (map_category), and its new rows spooled to a temporary JSONL
+file. The store is then rewritten once, streaming the spooled rows into it
+(persistence.write_json_groups). Beyond the user's existing transactions,
+memory is one chunk of rows plus a short dedupe key per row, however long
+the file is.
+
+Imported rows are kept under the IMPORT_ITEM pseudo-item of the item-keyed
+store, so every view that reads transactions sees them. Amounts use the
+store's (Plaid's) convention — positive is money out; bank exports are
+usually the opposite, hence sign="bank" by default.
+
+Duplicates are rows whose transaction_id (an OFX FITID or an id column) is
+already stored, or whose content (date, amount, description) matches a
+stored row. Content matches are counted, so a file with two identical
+coffees on one day imports both, and importing it again adds neither.
+"""
+
+import codecs
+import csv
+import hashlib
+import html
+import json
+import os
+import re
+import tempfile
+import uuid
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+from services.categories import map_category
+from services.persistence import DATA_DIR, bump_version, collection_path, locked, read_json, write_json_groups
+
+IMPORT_ITEM = "import"
+FORMATS = ("csv", "ofx", "xlsx")
+SIGNS = ("bank", "plaid")
+CHUNK_SIZE = 5000
+ERROR_SAMPLES = 10
+
+# Uploaded files wait here for an import job
+UPLOADS_DIR = DATA_DIR / "_imports"
+
+_READ_BYTES = 1 << 16
+
+# Header aliases for CSV/XLSX columns (compared lowercased and stripped)
+_COLUMNS = {
+    "date": ("date", "transaction date", "posted date", "posting date", "trans. date"),
+    "name": ("description", "name", "payee", "details", "memo", "transaction description"),
+    "amount": ("amount", "transaction amount", "amount (cad)", "amount (usd)"),
+    "debit": ("debit", "withdrawal", "withdrawals", "money out"),
+    "credit": ("credit", "deposit", "deposits", "money in"),
+    "transaction_id": ("transaction id", "transaction_id", "id", "reference", "fitid"),
+    "merchant": ("merchant", "merchant name"),
+    "category": ("category",),
+    "account_id": ("account", "account id", "account number"),
+}
+
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%y", "%d-%b-%Y", "%b %d, %Y")
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def detect_format(path: Path, fmt: str | None = None) -> str:
+    fmt = (fmt or Path(path).suffix.lstrip(".")).lower()
+    if fmt == "qfx":
+        fmt = "ofx"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported import format {fmt!r} (expected one of: {', '.join(FORMATS)})")
+    return fmt
+
+
+def upload_path(filename: str) -> Path:
+    """A fresh path to store an uploaded file under, keeping its extension."""
+    UPLOADS_DIR.mkdir(exist_ok=True)
+    return UPLOADS_DIR / f"{uuid.uuid4().hex}{Path(filename).suffix.lower()}"
+
+
+# --- Parsing ---
+# Parsers yield (row number, {field: raw value}, fraction of the file read).
+
+def _column_map(header: list) -> dict[str, int]:
+    names = [str(h or "").strip().lower() for h in header]
+    columns = {}
+    for field, aliases in _COLUMNS.items():
+        for alias in aliases:
+            if alias in names:
+                columns[field] = names.index(alias)
+                break
+    if "date" not in columns or "name" not in columns or not (
+        "amount" in columns or "debit" in columns or "credit" in columns
+    ):
+        raise ValueError(f"Header needs date, description and amount (or debit/credit) columns: {header}")
+    return columns
+
+
+def _fields(row, columns: dict[str, int]) -> dict:
+    return {field: row[i] if i < len(row) else None for field, i in columns.items()}
+
+
+def _iter_csv(path: Path) -> Iterator[tuple[int, dict, float]]:
+    size = os.path.getsize(path) or 1
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as fh:
+        sample = fh.read(_READ_BYTES)
+        fh.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(fh, dialect)
+        columns = None
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            if columns is None:
+                columns = _column_map(row)
+                continue
+            yield reader.line_num, _fields(row, columns), fh.buffer.tell() / size
+
+
+def _iter_xlsx(path: Path) -> Iterator[tuple[int, dict, float]]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        total = ws.max_row or 0
+        columns = None
+        for number, row in enumerate(ws.iter_rows(values_only=True), start=1):
+            if not any(cell is not None and str(cell).strip() for cell in row):
+                continue
+            if columns is None:
+                columns = _column_map(list(row))
+                continue
+            yield number, _fields(row, columns), number / total if total else 0.0
+    finally:
+        wb.close()
+
+
+def _iter_ofx(path: Path) -> Iterator[tuple[int, dict, float]]:
+    """STMTTRN blocks from OFX 1.x (SGML, unclosed tags) or 2.x (XML)."""
+    size = os.path.getsize(path) or 1
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    account = None
+    txn = None
+    number = 0
+    with open(path, "rb") as fh:
+        buf = ""
+        while True:
+            chunk = fh.read(_READ_BYTES)
+            buf += decoder.decode(chunk, final=not chunk)
+            # Leave a tag that may continue into the next chunk for next time
+            end = buf.rfind("<") if chunk else len(buf)
+            if end < 0:
+                end = 0
+            for m in _OFX_TAG.finditer(buf, 0, end):
+                closing, tag, value = m.group(1), m.group(2).upper(), html.unescape(m.group(3).strip())
+                if tag == "STMTTRN":
+                    if closing and txn is not None:
+                        number += 1
+                        txn.setdefault("account_id", account)
+                        yield number, txn, fh.tell() / size
+                        txn = None
+                    elif not closing:
+                        txn = {}
+                elif closing or not value:
+                    continue
+                elif tag == "ACCTID":
+                    account = value
+                elif txn is not None:
+                    if tag == "DTPOSTED":
+                        txn["date"] = value[:8]
+                    elif tag == "TRNAMT":
+                        txn["amount"] = value
+                    elif tag == "FITID":
+                        txn["transaction_id"] = value
+                    elif tag == "NAME" or (tag in ("PAYEE", "MEMO") and "name" not in txn):
+                        txn["name"] = value
+            buf = buf[end:]
+            if not chunk:
+                break
+
+
+_PARSERS = {"csv": _iter_csv, "ofx": _iter_ofx, "xlsx": _iter_xlsx}
+
+
+# --- Normalization ---
+
+def _parse_date(value) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    text = str(value or "").strip()
+    if re.fullmatch(r"\d{8}", text):  # OFX / compact
+        text = f"{text[:4]}-{text[4:6]}-{text[6:]}"
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date {text!r}")
+
+
+def _parse_amount(value) -> float | None:
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None else float(value)
+    text = str(value).strip().replace(",", "").replace("$", "").replace(" ", "")
+    if not text:
+        return None
+    negative = text.startswith("(") and text.endswith(")")
+    amount = float(text.strip("()"))
+    return -amount if negative else amount
+
+
+def _to_record(fields: dict, sign: str, source: str) -> dict:
+    amount = _parse_amount(fields.get("amount"))
+    if amount is None:
+        debit = _parse_amount(fields.get("debit")) or 0.0
+        credit = _parse_amount(fields.get("credit")) or 0.0
+        if not debit and not credit:
+            raise ValueError("Missing amount")
+        amount = abs(debit) - abs(credit)  # Already money-out positive
+    elif sign == "bank":
+        amount = -amount
+    name = str(fields.get("name") or "").strip()
+    if not name:
+        raise ValueError("Missing description")
+    return {
+        "transaction_id": str(fields.get("transaction_id") or "").strip(),
+        "date": _parse_date(fields.get("date")),
+        "name": name,
+        "merchant": str(fields.get("merchant") or "").strip(),
+        "amount": round(amount, 2),
+        "category": str(fields.get("category") or "").strip(),
+        "pending": False,
+        "account_id": str(fields.get("account_id") or IMPORT_ITEM),
+        "source": source,
+    }
+
+
+def content_key(txn: dict) -> str:
+    """Identity of a transaction by content, for matching rows without shared ids."""
+    name = " ".join(str(txn.get("name") or "").upper().split())
+    raw = f"{txn.get('date')}|{float(txn.get('amount') or 0):.2f}|{name}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+# --- Import ---
+
+def _iter_spool(fh) -> Iterator[dict]:
+    fh.seek(0)
+    for line in fh:
+        yield json.loads(line)
+
+
+def import_transactions(
+    user_id: str,
+    path: Path,
+    fmt: str | None = None,
+    *,
+    sign: str = "bank",
+    chunk_size: int = CHUNK_SIZE,
+    progress: Callable[[float, str], None] | None = None,
+) -> dict:
+    """Import a bank export into the user's transaction store; returns a summary.
+
+    Holds the transactions lock for the whole import (a Plaid sync for the
+    user waits for it). Rows that don't parse are skipped and counted; the
+    first few are reported with their row numbers.
+    """
+    path = Path(path)
+    fmt = detect_format(path, fmt)
+    if sign not in SIGNS:
+        raise ValueError(f"sign must be one of: {', '.join(SIGNS)}")
+    store = collection_path(user_id, "transactions")
+    summary = {"format": fmt, "rows": 0, "added": 0, "duplicates": 0, "errors": 0,
+               "error_samples": [], "categories": Counter()}
+
+    with locked("transactions", user_id):
+        all_txns = dict(read_json(store)) if store.exists() else {}  # Popped from below
+        known_ids = {t["transaction_id"] for txns in all_txns.values() for t in txns}
+        stored = Counter(content_key(t) for txns in all_txns.values() for t in txns)
+        seen = Counter()
+
+        def add_chunk(chunk: list[dict], spool) -> None:
+            fresh = []
+            for txn in chunk:
+                key = content_key(txn)
+                seen[key] += 1
+                if not txn["transaction_id"]:
+                    txn["transaction_id"] = f"imp_{key}_{seen[key]}"
+                if txn["transaction_id"] in known_ids or seen[key] <= stored[key]:
+                    summary["duplicates"] += 1
+                    continue
+                known_ids.add(txn["transaction_id"])
+                fresh.append(txn)
+            summary["categories"].update(map_category(t) for t in fresh)
+            spool.writelines(json.dumps(t) + "\n" for t in fresh)
+            summary["added"] += len(fresh)
+
+        with tempfile.TemporaryFile("w+", dir=store.parent, prefix=".import.") as spool:
+            chunk = []
+            for number, fields, fraction in _PARSERS[fmt](path):
+                summary["rows"] += 1
+                try:
+                    chunk.append(_to_record(fields, "bank" if fmt == "ofx" else sign, fmt))
+                except (TypeError, ValueError) as e:
+                    summary["errors"] += 1
+                    if len(summary["error_samples"]) < ERROR_SAMPLES:
+                        summary["error_samples"].append({"row": number, "error": str(e)})
+                if len(chunk) >= chunk_size:
+                    add_chunk(chunk, spool)
+                    chunk = []
+                    if progress:
+                        progress(fraction, f"{summary['rows']} rows read, {summary['added']} new")
+            add_chunk(chunk, spool)
+
+            if summary["added"]:
+                if progress:
+                    progress(1.0, f"Saving {summary['added']} new transactions")
+                spool.flush()
+                existing = all_txns.pop(IMPORT_ITEM, [])
+                groups = {**all_txns, IMPORT_ITEM: (t for it in (existing, _iter_spool(spool)) for t in it)}
+                write_json_groups(store, groups)
+                bump_version("transactions", user_id)
+
+    summary["categories"] = dict(summary["categories"].most_common())
+    summary["item_id"] = IMPORT_ITEM
+    return summary
@@ -0,0 +1,115 @@
+"""Derived-view cache — computed payloads keyed by the data versions they read.
+
+Keys are (user_id, view, versions of the view's input collections, extra), so
+any write that bumps an input (sync_transactions, append_one, save_all, ...)
+makes the next read miss; the superseded entry is dropped on recompute. The
+cache is per process with a byte budget and LRU eviction. Versions live on
+disk, so gunicorn workers never serve each other's stale views.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable
+
+from services.metrics import record_cache
+from services.persistence import get_versions
+
+VIEW_CACHE_MAX_BYTES = int(os.getenv("VIEW_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+class ViewCache:
+    def __init__(self, max_bytes: int = VIEW_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()  # key → (value, size, compute_seconds)
+        self._current: dict = {}  # (user_id, view) → live key
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {
+            "hits": 0, "misses": 0, "evictions": 0,
+            "compute_seconds": 0.0, "saved_seconds": 0.0,
+        })
+
+    def get_or_compute(
+        self,
+        user_id: str,
+        view: str,
+        inputs: tuple,
+        compute: Callable[[], object],
+        extra: str = "",
+    ):
+        """Return the cached view or compute, store and return it.
+
+        `inputs` names the collections compute() reads; `extra` carries any
+        other dependency (e.g. the current day). Cached values are shared:
+        callers must not mutate them.
+        """
+        # Read versions before computing: a write racing the compute can only
+        # leave a fresher value under an older key, never a stale one.
+        versions = get_versions(user_id)
+        key = (
+            user_id, view, versions.get("_epoch", ""),
+            tuple(versions.get(c, 0) for c in inputs), extra,
+        )
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                stats = self._stats[view]
+                stats["hits"] += 1
+                stats["saved_seconds"] += entry[2]
+                record_cache(f"view:{view}", True)
+                return entry[0]
+        record_cache(f"view:{view}", False)
+
+        start = time.perf_counter()
+        value = compute()
+        elapsed = time.perf_counter() - start
+        size = len(json.dumps(value, default=str))
+
+        with self._lock:
+            stats = self._stats[view]
+            stats["misses"] += 1
+            stats["compute_seconds"] += elapsed
+            old = self._current.get((user_id, view))
+            if old is not None and old != key:
+                self._drop(old)
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (value, size, elapsed)
+                self._bytes += size
+                self._current[(user_id, view)] = key
+                while self._bytes > self.max_bytes:
+                    evicted, _ = next(iter(self._entries.items()))
+                    self._drop(evicted)
+                    self._stats[evicted[1]]["evictions"] += 1
+        return value
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+            if self._current.get((key[0], key[1])) == key:
+                del self._current[(key[0], key[1])]
+
+    def stats(self) -> dict:
+        with self._lock:
+            views = {}
+            for view, s in self._stats.items():
+                lookups = s["hits"] + s["misses"]
+                views[view] = {
+                    **s,
+                    "hit_rate": round(s["hits"] / lookups, 4) if lookups else 0.0,
+                    "compute_seconds": round(s["compute_seconds"], 6),
+                    "saved_seconds": round(s["saved_seconds"], 6),
+                }
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "views": views,
+            }
+
+
+view_cache = ViewCache()
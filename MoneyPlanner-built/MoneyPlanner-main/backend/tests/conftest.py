@@ -0,0 +1,20 @@
+"""Shared test setup: a throwaway DATA_DIR and config, set before services import."""
+
+import json
+import os
+import shutil
+import tempfile
+
+# Services resolve these on import, so this must run before any test module imports them
+_tmp = tempfile.mkdtemp(prefix="moneyplanner-tests-")
+os.environ["DATA_DIR"] = os.path.join(_tmp, "data")
+os.environ["EXPERIMENTS_CONFIG"] = os.path.join(_tmp, "experiments.json")
+os.environ["ADMISSION_ENABLED"] = "false"
+os.environ["DEV_MODE"] = "true"  # X-Dev-User-Id picks the user
+os.makedirs(os.environ["DATA_DIR"])
+with open(os.environ["EXPERIMENTS_CONFIG"], "w") as fh:
+    json.dump({}, fh)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_tmp, ignore_errors=True)
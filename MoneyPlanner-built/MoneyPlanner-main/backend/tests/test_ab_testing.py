@@ -0,0 +1,65 @@
+"""A/B assignment: deterministic hash buckets that split traffic as configured."""
+
+import json
+from collections import Counter
+
+import pytest
+
+from services.ab_testing_service import BUCKETS, ExperimentConfig, _Experiment, _Flag, bucket
+
+USERS = [f"user-{i}" for i in range(20_000)]
+
+
+def test_bucket_is_deterministic_and_in_range():
+    buckets = [bucket("salt", u) for u in USERS[:1000]]
+    assert buckets == [bucket("salt", u) for u in USERS[:1000]]
+    assert all(0 <= b < BUCKETS for b in buckets)
+    assert buckets != [bucket("other-salt", u) for u in USERS[:1000]]
+
+
+def test_flag_rollout_share():
+    flag = _Flag("new_ui", {"rollout": 25, "salt": "new_ui"})
+    share = sum(flag.evaluate(u) is True for u in USERS) / len(USERS)
+    assert share == pytest.approx(0.25, abs=0.02)
+    assert _Flag("off", {"rollout": 0}).evaluate("anyone") is False
+
+
+def test_experiment_traffic_and_variant_weights():
+    exp = _Experiment("checkout", {"traffic": 50, "variants": {"control": 1, "treatment": 3}})
+    assigned = [exp.assign(u) for u in USERS]
+    assert assigned == [exp.assign(u) for u in USERS]
+
+    counts = Counter(v for v in assigned if v is not None)
+    enrolled = sum(counts.values())
+    assert enrolled / len(USERS) == pytest.approx(0.5, abs=0.02)
+    assert counts["treatment"] / enrolled == pytest.approx(0.75, abs=0.02)
+
+
+def test_enrollment_and_variant_are_independent():
+    # Growing traffic only adds users; nobody already enrolled changes variant
+    small = _Experiment("exp", {"traffic": 20, "variants": {"a": 1, "b": 1}})
+    large = _Experiment("exp", {"traffic": 60, "variants": {"a": 1, "b": 1}})
+    for u in USERS[:5000]:
+        if small.assign(u) is not None:
+            assert large.assign(u) == small.assign(u)
+    counts = Counter(small.assign(u) for u in USERS if small.assign(u) is not None)
+    assert counts["a"] / sum(counts.values()) == pytest.approx(0.5, abs=0.03)
+
+
+def test_variant_flag_overrides_and_reload(tmp_path):
+    path = tmp_path / "experiments.json"
+    path.write_text(json.dumps({
+        "flags": {"new_ui": {"default": False, "users": {"vip": True}}},
+        "experiments": {"ui": {"variants": {"control": 1, "treatment": 1}, "flags": {"treatment": {"new_ui": True}}}},
+    }))
+    config = ExperimentConfig(path)
+    for user_id in USERS[:200]:
+        values, assigned = config.evaluate(user_id)
+        assert values["new_ui"] is (assigned["ui"] == "treatment")
+        assert config.flag(user_id, "new_ui") is values["new_ui"]
+    assert config.evaluate("vip")[0]["new_ui"] is True
+    assert config.evaluate("someone")[0]["gamification"] is True  # Default flags are always present
+
+    path.write_text("{not json")
+    assert config.reload() is False
+    assert config.error and "ui" in config.experiments  # The previous config stays
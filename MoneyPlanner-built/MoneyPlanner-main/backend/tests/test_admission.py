@@ -0,0 +1,79 @@
+"""Admission control: token buckets refill at their rate; identical requests share one run."""
+
+import threading
+import time
+
+import pytest
+
+from services.admission import SingleFlight, TokenBucketLimiter, retry_after_header
+
+
+class CountingEvent(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self.waiters = 0
+
+    def wait(self, timeout=None):
+        self.waiters += 1
+        return super().wait(timeout)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter({"sync": (3.0, 1.0)}, clock=clock)  # Burst 3, 1 token/s
+    assert [limiter.acquire("u", "sync") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("u", "sync") == pytest.approx(1.0)
+    clock.now = 0.5
+    assert limiter.acquire("u", "sync") == pytest.approx(0.5)
+    clock.now = 1.0
+    assert limiter.acquire("u", "sync") == 0.0
+    assert limiter.acquire("other", "sync") == 0.0  # Buckets are per user
+
+
+def test_retry_after_is_whole_seconds():
+    assert retry_after_header(0.2) == "1"
+    assert retry_after_header(2.1) == "3"
+
+
+def test_single_flight_shares_one_execution():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "payload"
+
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", slow)))
+    leader.start()
+    started.wait(5)
+    done = flights._flights["key"].done = CountingEvent()
+    followers = [threading.Thread(target=lambda: results.append(flights.do("key", slow))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    while done.waiters < 3:  # Every follower has joined the flight
+        time.sleep(0.001)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results, key=lambda r: r[1]) == [("payload", False)] + [("payload", True)] * 3
+    assert flights.do("key", lambda: "again") == ("again", False)  # The flight ended
+
+
+def test_single_flight_shares_errors():
+    flights = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flights.do("key", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert flights.do("key", lambda: 1) == (1, False)
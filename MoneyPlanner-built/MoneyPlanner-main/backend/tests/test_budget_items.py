@@ -0,0 +1,82 @@
+"""Budget items: keyed single-item edits and all-or-nothing batches."""
+
+import uuid
+
+import pytest
+
+import app as app_module
+from services import budget_items
+from services.persistence import get_versions
+
+
+def _user() -> str:
+    return f"test-{uuid.uuid4().hex}"
+
+
+def test_create_update_delete():
+    user_id = _user()
+    item = budget_items.create_item({"name": "Groceries", "budget_amount": "250"}, user_id)
+    assert item["budget_amount"] == 250.0
+
+    updated = budget_items.update_item(item["id"], {"budget_amount": 300}, user_id)
+    assert updated["budget_amount"] == 300.0 and "updated_at" in updated
+    assert budget_items.list_items(user_id) == [updated]
+
+    assert budget_items.delete_item(item["id"], user_id) is True
+    assert budget_items.list_items(user_id) == []
+
+
+def test_unknown_ids_are_reported_and_write_nothing():
+    user_id = _user()
+    budget_items.create_item({"id": "a", "name": "Rent"}, user_id)
+    versions = get_versions(user_id)
+    assert budget_items.update_item("nope", {"name": "x"}, user_id) is None
+    assert budget_items.delete_item("nope", user_id) is False
+    assert get_versions(user_id) == versions
+    assert [i["id"] for i in budget_items.list_items(user_id)] == ["a"]
+
+
+def test_routes_answer_404_for_unknown_ids():
+    client = app_module.create_app().test_client()
+    headers = {"X-Dev-User-Id": _user()}
+    assert client.put("/api/budget/items/nope", json={"name": "x"}, headers=headers).status_code == 404
+    assert client.delete("/api/budget/items/nope", headers=headers).status_code == 404
+
+    item = client.post("/api/budget/items", json={"name": "Rent"}, headers=headers).get_json()["item"]
+    assert client.put(f"/api/budget/items/{item['id']}", json={"name": "x"}, headers=headers).status_code == 200
+    assert client.delete(f"/api/budget/items/{item['id']}", headers=headers).status_code == 200
+
+
+def test_batch_applies_creates_updates_and_deletes_together():
+    user_id = _user()
+    keep = budget_items.create_item({"id": "keep", "name": "Rent"}, user_id)
+    drop = budget_items.create_item({"id": "drop", "name": "Gym"}, user_id)
+
+    result = budget_items.apply_batch({
+        "create": [{"id": "new", "name": "Transit"}],
+        "update": [{"id": "keep", "budget_amount": 1500}, {"id": "new", "name": "Bus pass"}],
+        "delete": [drop["id"]],
+    }, user_id)
+
+    assert [i["id"] for i in result["created"]] == ["new"]
+    assert result["deleted"] == ["drop"]
+    items = {i["id"]: i for i in budget_items.list_items(user_id)}
+    assert set(items) == {keep["id"], "new"}
+    assert items["keep"]["budget_amount"] == 1500.0
+    assert items["new"]["name"] == "Bus pass"
+
+
+@pytest.mark.parametrize("batch", [
+    {"create": [{"id": "a"}], "update": [{"id": "missing"}]},
+    {"create": [{"id": "a"}], "delete": ["missing"]},
+    {"create": [{"id": "existing"}]},
+    {"create": [{"id": "a"}, {"id": "a"}]},
+    {"create": ["not an object"]},
+])
+def test_bad_batch_writes_nothing(batch):
+    user_id = _user()
+    budget_items.create_item({"id": "existing", "name": "Rent"}, user_id)
+    before = budget_items.list_items(user_id)
+    with pytest.raises(ValueError):
+        budget_items.apply_batch(batch, user_id)
+    assert budget_items.list_items(user_id) == before
@@ -0,0 +1,76 @@
+"""Dashboard: sections match their own endpoints and share one parse of each file."""
+
+import uuid
+
+import pytest
+
+import app as app_module
+from services import persistence
+from services.dashboard import compute_sections
+from services.persistence import (
+    append_one, bump_version, collection_path, get_versions, mutate_keyed, read_json, read_memo,
+    write_json,
+)
+
+
+@pytest.fixture(scope="module")
+def client():
+    return app_module.create_app().test_client()
+
+
+def test_sections_match_their_endpoints(client):
+    headers = {"X-Dev-User-Id": f"test-{uuid.uuid4().hex}"}
+    body = client.get("/api/dashboard?sections=budget_summary,iin_config", headers=headers).get_json()
+    assert set(body["sections"]) == {"budget_summary", "iin_config"}
+    assert body["errors"] == {}
+    assert body["sections"]["budget_summary"] == client.get("/api/budget/summary", headers=headers).get_json()
+    assert body["sections"]["iin_config"] == client.get("/api/iin/config", headers=headers).get_json()
+    assert {"budget_summary", "iin_config", "total"} <= set(body["timings_ms"])
+
+
+def test_unknown_section_is_rejected(client):
+    resp = client.get("/api/dashboard?sections=phase,nope", headers={"X-Dev-User-Id": "u"})
+    assert resp.status_code == 400
+    assert "nope" in resp.get_json()["error"]
+
+
+def test_failing_section_does_not_fail_the_rest():
+    result = compute_sections({"ok": lambda: 1, "broken": lambda: 1 / 0})
+    assert result["sections"] == {"ok": 1}
+    assert "division" in result["errors"]["broken"]
+
+
+def test_sections_share_one_parse_per_file(monkeypatch):
+    path = collection_path(f"test-{uuid.uuid4().hex}", "transactions")
+    write_json(path, {"item": [{"amount": 1}]})
+    parses = []
+    parse = persistence._parse_json
+    monkeypatch.setattr(persistence, "_parse_json", lambda *a: parses.append(a) or parse(*a))
+
+    result = compute_sections({name: lambda: read_json(path) for name in ("a", "b", "c")})
+    values = list(result["sections"].values())
+    assert len(parses) == 1
+    assert all(v is values[0] for v in values)
+
+    read_json(path)  # Outside the memo every read parses
+    assert len(parses) == 2
+
+
+def test_writes_inside_the_memo_leave_shared_parses_alone():
+    user_id = f"test-{uuid.uuid4().hex}"
+    append_one("income_events", {"id": "a"}, user_id)
+    mutate_keyed("budget_items", lambda items: items.update(x={"id": "x", "amount": 1}), user_id)
+    with read_memo():
+        events = read_json(collection_path(user_id, "income_events"))
+        versions = get_versions(user_id)
+        items = read_json(collection_path(user_id, "budget_items"))
+        seen = (list(events), dict(versions), {k: dict(v) for k, v in items.items()})
+
+        append_one("income_events", {"id": "b"}, user_id)
+        bump_version("transactions", user_id)
+        mutate_keyed("budget_items", lambda items: items["x"].update(amount=2), user_id)
+
+        assert (events, versions, items) == seen
+        assert [e["id"] for e in read_json(collection_path(user_id, "income_events"))] == ["a", "b"]
+        assert get_versions(user_id)["transactions"] == 1
+        assert read_json(collection_path(user_id, "budget_items"))["x"]["amount"] == 2
@@ -0,0 +1,66 @@
+"""Exports: transactions stream out with budget categories applied, as CSV or XLSX."""
+
+import csv
+import io
+import uuid
+
+import pytest
+from openpyxl import load_workbook
+
+import app as app_module
+from services.exports import TRANSACTION_COLUMNS, transaction_rows, write_transactions
+from services.persistence import collection_path, write_json
+
+TRANSACTIONS = {
+    "item-1": [
+        {"transaction_id": "t1", "date": "2024-01-05", "name": "=HYPERLINK(\"x\")", "amount": 12.5,
+         "category": "Shops", "account_id": "acc"},
+        {"transaction_id": "t2", "date": "2024-02-10", "name": "Landlord", "amount": 1500.0,
+         "category": "Rent"},
+    ],
+    "item-2": [
+        {"transaction_id": "t3", "date": "2024-03-15", "name": "Grocer", "amount": 80.0, "category": "Food"},
+    ],
+}
+
+
+@pytest.fixture
+def user_id():
+    user_id = f"test-{uuid.uuid4().hex}"
+    write_json(collection_path(user_id, "transactions"), TRANSACTIONS)
+    write_json(collection_path(user_id, "category_overrides"), {"t3": {"category": "Household"}})
+    return user_id
+
+
+def test_rows_apply_overrides_and_date_range(user_id):
+    rows = [dict(zip(TRANSACTION_COLUMNS, r)) for r in transaction_rows(user_id)]
+    assert [r["transaction_id"] for r in rows] == ["t1", "t2", "t3"]
+    assert rows[2]["budget_category"] == "Household"
+    assert rows[0]["item_id"] == "item-1"
+    assert rows[0]["name"].startswith("'=")  # Not run as a formula
+
+    ranged = [r[-1] for r in transaction_rows(user_id, start_date="2024-02-01", end_date="2024-02-29")]
+    assert ranged == ["t2"]
+
+
+def test_csv_and_xlsx_files_hold_every_row(user_id, tmp_path):
+    assert write_transactions(tmp_path / "t.csv", "csv", user_id) == 3
+    rows = list(csv.reader(io.StringIO((tmp_path / "t.csv").read_text())))
+    assert tuple(rows[0]) == TRANSACTION_COLUMNS and len(rows) == 4
+
+    assert write_transactions(tmp_path / "t.xlsx", "xlsx", user_id) == 3
+    sheet = load_workbook(tmp_path / "t.xlsx").active
+    assert [c.value for c in sheet[1]] == list(TRANSACTION_COLUMNS)
+    assert sheet.max_row == 4
+
+
+def test_export_route_streams_csv(user_id):
+    client = app_module.create_app().test_client()
+    resp = client.get("/api/export/transactions?format=csv", headers={"X-Dev-User-Id": user_id})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Disposition"] == 'attachment; filename="transactions.csv"'
+    rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert [r["transaction_id"] for r in rows] == ["t1", "t2", "t3"]
+
+    bad = client.get("/api/export/transactions?format=pdf", headers={"X-Dev-User-Id": user_id})
+    assert bad.status_code == 400
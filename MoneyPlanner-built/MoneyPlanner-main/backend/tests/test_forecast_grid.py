@@ -0,0 +1,75 @@
+"""Forecast grid: the closed-form annuity matches a month-by-month simulation."""
+
+import pytest
+
+from services import accountability_service
+from services.accountability_service import compute_forecast_grid
+
+
+def _simulate(rate: float, years: int, annual_return: float, growth: float, income: float) -> list[float]:
+    # End-of-month deposits; the contribution grows with income every month
+    balance, contribution, balances = 0.0, income * rate, []
+    for _ in range(years * 12):
+        balance = balance * (1 + annual_return / 12) + contribution
+        contribution *= 1 + growth / 12
+        balances.append(balance)
+    return balances
+
+
+def test_grid_matches_simulation():
+    grid = compute_forecast_grid(
+        rates=[0.1, 0.25], years=[1, 5], annual_returns=[0.0, 0.05, 0.02],
+        income_growth=[0.0, 0.02], monthly_income=4000,
+    )
+    results = grid["results"]
+    assert grid["scenarios"] == len(results["final_balance"]) == 2 * 2 * 3 * 2
+    for i in range(grid["scenarios"]):
+        balances = _simulate(results["savings_rate"][i], results["years"][i], results["annual_return"][i],
+                             results["income_growth"][i], 4000)
+        assert results["final_balance"][i] == pytest.approx(balances[-1], abs=0.01)
+        assert results["investment_growth"][i] == pytest.approx(
+            results["final_balance"][i] - results["total_contributed"][i], abs=0.02
+        )
+
+
+def test_paths_are_sampled_to_each_horizon():
+    grid = compute_forecast_grid(rates=[0.2], years=[1, 2], annual_returns=[0.06], path_interval=6)
+    assert grid["paths"]["months"] == [6, 12, 18, 24]
+    one_year, two_years = grid["paths"]["balances"]
+    assert len(one_year) == 2 and len(two_years) == 4
+    expected = _simulate(0.2, 2, 0.06, 0.0, 5000)
+    assert two_years == pytest.approx([expected[m - 1] for m in (6, 12, 18, 24)], abs=0.01)
+    assert one_year == two_years[:2]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"rates": [], "years": [1]},
+    {"rates": [1.5], "years": [1]},
+    {"rates": [0.1], "years": [0]},
+    {"rates": [0.1], "years": [1.5]},
+    {"rates": [0.1], "years": [1], "annual_returns": [-1]},
+    {"rates": [0.1], "years": [1], "path_interval": -1},
+])
+def test_invalid_grids_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        compute_forecast_grid(**kwargs)
+
+
+def test_paths_over_the_point_cap_are_rejected():
+    # 5000 scenarios × 60 years of monthly points
+    with pytest.raises(ValueError, match="path_interval"):
+        compute_forecast_grid(rates=[i / 100 for i in range(1, 51)], years=[60],
+                              annual_returns=[i / 100 for i in range(10)],
+                              income_growth=[i / 100 for i in range(10)], path_interval=1)
+
+
+def test_result_cache_stays_within_its_byte_budget(monkeypatch):
+    cache = accountability_service._GridCache(max_bytes=3 * accountability_service._SCENARIO_BYTES)
+    monkeypatch.setattr(accountability_service, "_grid_cache", cache)
+    first = compute_forecast_grid(rates=[0.1, 0.2], years=[1])
+    second = compute_forecast_grid(rates=[0.3, 0.4], years=[1])
+    assert cache._bytes <= cache.max_bytes and len(cache._entries) == 1  # The first was evicted
+    assert compute_forecast_grid(rates=[0.1, 0.2], years=[1]) == first
+    assert compute_forecast_grid(rates=[0.3, 0.4], years=[1]) == second
+    compute_forecast_grid(rates=[i / 10 for i in range(1, 6)], years=[1])  # Larger than the budget
+    assert cache._bytes <= cache.max_bytes
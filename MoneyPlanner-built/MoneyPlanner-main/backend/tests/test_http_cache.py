@@ -0,0 +1,71 @@
+"""ETag revalidation follows the versions of the collections a view reads."""
+
+import uuid
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture(scope="module")
+def client():
+    return app_module.create_app().test_client()
+
+
+def _user() -> dict:
+    return {"X-Dev-User-Id": f"test-{uuid.uuid4().hex}"}
+
+
+def test_unchanged_data_revalidates_with_304(client):
+    headers = _user()
+    first = client.get("/api/budget/items", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    again = client.get("/api/budget/items", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert not again.data
+
+
+def test_write_changes_the_etag(client):
+    headers = _user()
+    etag = client.get("/api/budget/items", headers=headers).headers["ETag"]
+    created = client.post("/api/budget/items", json={"name": "Groceries", "budget_amount": 300}, headers=headers)
+    assert created.status_code == 201
+
+    after = client.get("/api/budget/items", headers={**headers, "If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+    assert [i["name"] for i in after.get_json()["items"]] == ["Groceries"]
+
+
+def test_etags_are_per_user(client):
+    etag = client.get("/api/budget/items", headers=_user()).headers["ETag"]
+    other = client.get("/api/budget/items", headers={**_user(), "If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_etag_is_read_before_the_view(client, monkeypatch):
+    from services import budget_items
+    from services.persistence import bump_version
+
+    headers = _user()
+    list_items = budget_items.list_items
+
+    def racing_list_items(user_id):
+        items = list_items(user_id)
+        bump_version("budget_items", user_id)  # A write lands after the body was read
+        return items
+
+    monkeypatch.setattr(budget_items, "list_items", racing_list_items)
+    stale = client.get("/api/budget/items", headers=headers).headers["ETag"]
+    monkeypatch.setattr(budget_items, "list_items", list_items)
+    assert client.get("/api/budget/items", headers={**headers, "If-None-Match": stale}).status_code == 200
+
+
+def test_default_state_written_by_the_view_is_tagged(client):
+    headers = _user()
+    etag = client.get("/api/phase", headers=headers).headers["ETag"]
+    assert client.get("/api/phase", headers={**headers, "If-None-Match": etag}).status_code == 304
@@ -0,0 +1,78 @@
+"""IIN ledger: snapshots are a cache of the replay, and escalations are decided once."""
+
+import threading
+import uuid
+
+from models.auto_transfer import EscalationProposal
+from services import automation_service, iin_ledger
+from services.persistence import collection_path
+
+
+def _propose(user_id: str, new_rate: float):
+    state = iin_ledger.current(user_id)
+    proposal = EscalationProposal(old_rate=state.savings_rate_pct, new_rate=new_rate)
+    iin_ledger.record(user_id, "escalation_proposed", proposal=proposal.to_dict())
+
+
+def test_snapshot_matches_full_replay():
+    user_id = f"test-{uuid.uuid4().hex}"
+    automation_service.set_transfer(user_id, savings_rate_pct=5.0)
+    for i in range(iin_ledger.SNAPSHOT_EVERY):  # Two events each: snapshots get written
+        _propose(user_id, 5.0 + i + 1)
+        if i % 3:
+            automation_service.accept_escalation(user_id)
+        else:
+            automation_service.reject_escalation(user_id)
+    _propose(user_id, 99.0)
+
+    snapshot = collection_path(user_id, iin_ledger.SNAPSHOT)
+    assert snapshot.exists()
+    via_snapshot = iin_ledger.current(user_id).to_dict()
+    snapshot.unlink()
+    replayed = iin_ledger.current(user_id).to_dict()
+
+    assert via_snapshot == replayed
+    assert replayed["savings_rate_pct"] == 5.0 + iin_ledger.SNAPSHOT_EVERY  # The last proposal was accepted
+    assert len(replayed["history"]) == iin_ledger.SNAPSHOT_EVERY
+    assert [e["action"] for e in replayed["history"][:3]] == [
+        "escalation_rejected", "escalation_accepted", "escalation_accepted",
+    ]
+    assert replayed["pending_escalation"]["new_rate"] == 99.0
+
+
+def test_history_lists_events_in_order_within_bounds():
+    user_id = f"test-{uuid.uuid4().hex}"
+    automation_service.set_transfer(user_id, savings_rate_pct=10.0)
+    _propose(user_id, 12.0)
+    automation_service.accept_escalation(user_id)
+    automation_service.set_transfer(user_id, savings_rate_pct=8.0)
+
+    events = list(iin_ledger.history(user_id))
+    assert [e["type"] for e in events] == ["rate_set", "escalation_proposed", "escalation_accepted", "rate_set"]
+    assert events[-1]["old_rate"] == 12.0
+    assert iin_ledger.current(user_id).savings_rate_pct == 8.0
+    assert list(iin_ledger.history(user_id, until="2000-01-01")) == []
+
+
+def test_concurrent_accepts_append_one_event():
+    user_id = f"test-{uuid.uuid4().hex}"
+    automation_service.set_transfer(user_id, savings_rate_pct=10.0)
+    _propose(user_id, 12.0)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(automation_service.accept_escalation(user_id)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(r is not None for r in results) == 1
+    kinds = [e["type"] for e in iin_ledger.history(user_id)]
+    assert kinds.count("escalation_accepted") == 1
+    state = iin_ledger.current(user_id)
+    assert state.savings_rate_pct == 12.0
+    assert state.pending_escalation is None
+    assert automation_service.reject_escalation(user_id) is None
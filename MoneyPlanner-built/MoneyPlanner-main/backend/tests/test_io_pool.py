@@ -0,0 +1,44 @@
+"""Plaid I/O pool: one per process, however many requests reach it first."""
+
+import os
+import threading
+import time
+
+import app as app_module
+
+
+def test_concurrent_first_use_starts_one_pool(monkeypatch):
+    monkeypatch.setattr(app_module, "_io_pool", None)
+    created = []
+
+    class SlowPool(app_module.ThreadPoolExecutor):
+        def __init__(self, **kwargs):
+            time.sleep(0.05)  # Widen the check-then-set window
+            created.append(self)
+            super().__init__(**kwargs)
+
+    monkeypatch.setattr(app_module, "ThreadPoolExecutor", SlowPool)
+    pools = []
+    threads = [threading.Thread(target=lambda: pools.append(app_module._io_executor())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(created) == 1
+    assert all(pool is created[0] for pool in pools)
+    created[0].shutdown()
+
+
+def test_forked_child_starts_its_own_pool():
+    parent_pool = app_module._io_executor()
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        ok = app_module._io_pool is None and app_module._io_executor() is not parent_pool
+        os.write(write, b"1" if ok else b"0")
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    with os.fdopen(read, "rb") as fh:
+        assert fh.read() == b"1"
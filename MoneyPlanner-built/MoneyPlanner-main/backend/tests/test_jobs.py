@@ -0,0 +1,145 @@
+"""Job queue: dedupe, claiming, retries with backoff, and stale-worker recovery."""
+
+import pytest
+
+from services import jobs
+
+
+@pytest.fixture(autouse=True)
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOBS_DB", tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(jobs, "_initialized", False)
+    monkeypatch.setattr(jobs, "JOB_RETRY_BASE_SECONDS", 0)
+    monkeypatch.setattr(jobs, "_handlers", {})
+
+
+def test_submit_dedupes_identical_pending_jobs():
+    first = jobs.submit("sync", "u1", {"item": "a"})
+    assert jobs.submit("sync", "u1", {"item": "a"})["id"] == first["id"]
+    assert jobs.submit("sync", "u1", {"item": "b"})["id"] != first["id"]
+    assert jobs.submit("sync", "u1", {"item": "a"}, dedupe=False)["id"] != first["id"]
+    assert jobs.get_job(first["id"], "u1")["status"] == jobs.QUEUED
+    assert jobs.get_job(first["id"], "someone-else") is None
+
+
+def test_claimed_job_runs_and_records_result():
+    seen = []
+
+    @jobs.job_handler("export")
+    def export(user_id, payload, progress):
+        progress(0.5, "half way")
+        seen.append((user_id, payload))
+        return {"rows": 3}
+
+    job = jobs.submit("export", "u1", {"fmt": "csv"})
+    claimed = jobs.claim_next("worker-1")
+    assert claimed["id"] == job["id"] and claimed["status"] == jobs.RUNNING
+    assert jobs.claim_next("worker-2") is None  # Claimed once
+
+    assert jobs.run_job(claimed) is True
+    done = jobs.get_job(job["id"])
+    assert seen == [("u1", {"fmt": "csv"})]
+    assert (done["status"], done["result"], done["progress"]) == (jobs.SUCCEEDED, {"rows": 3}, 1)
+
+
+def test_failures_retry_then_fail_for_good():
+    @jobs.job_handler("flaky")
+    def flaky(user_id, payload, progress):
+        raise RuntimeError("bank timeout")
+
+    job = jobs.submit("flaky", "u1", max_attempts=2)
+    assert jobs.run_job(jobs.claim_next("w")) is False
+    retry = jobs.get_job(job["id"])
+    assert (retry["status"], retry["attempts"]) == (jobs.QUEUED, 1)
+    assert "bank timeout" in retry["error"]
+
+    assert jobs.run_job(jobs.claim_next("w")) is False
+    failed = jobs.get_job(job["id"])
+    assert (failed["status"], failed["attempts"]) == (jobs.FAILED, 2)
+    assert jobs.claim_next("w") is None
+
+
+def test_unknown_kind_fails():
+    job = jobs.submit("nobody-handles-this", "u1", max_attempts=1)
+    assert jobs.run_job(jobs.claim_next("w")) is False
+    assert jobs.get_job(job["id"])["status"] == jobs.FAILED
+
+
+def test_stale_running_job_is_requeued():
+    job = jobs.submit("sync", "u1")
+    jobs.claim_next("dead-worker")
+    assert jobs.requeue_stale(stale_seconds=3600) == 0
+    assert jobs.requeue_stale(stale_seconds=-1) == 1
+    assert jobs.get_job(job["id"])["status"] == jobs.QUEUED
+    assert jobs.claim_next("w")["id"] == job["id"]
+
+
+def test_stale_job_out_of_attempts_fails_instead_of_requeuing():
+    job = jobs.submit("sync", "u1", max_attempts=1)
+    jobs.claim_next("dead-worker")
+    assert jobs.requeue_stale(stale_seconds=-1) == 0
+    lost = jobs.get_job(job["id"])
+    assert (lost["status"], lost["error"]) == (jobs.FAILED, "Worker lost")
+    assert jobs.claim_next("w") is None
+
+
+def test_exhausted_queued_job_is_never_claimed():
+    job = jobs.submit("sync", "u1", max_attempts=1)
+    with jobs._connect() as conn:
+        conn.execute("UPDATE jobs SET attempts = 1 WHERE id = ?", (job["id"],))
+    assert jobs.claim_next("w") is None
+    jobs.requeue_stale()
+    assert jobs.get_job(job["id"])["status"] == jobs.FAILED
+
+
+def test_workers_check_in_and_out():
+    assert jobs.live_workers() == 0
+    jobs.worker_seen("host:1")
+    jobs.worker_seen("host:2")
+    jobs.worker_seen("host:1")
+    assert jobs.live_workers() == 2
+    assert jobs.live_workers(within=-1) == 0  # Nobody checked in "in the future"
+    jobs.worker_gone("host:1")
+    assert jobs.live_workers() == 1
+
+
+def test_claim_loop_stops_after_max_jobs():
+    import threading
+
+    from tools import job_worker
+
+    ran = []
+
+    @jobs.job_handler("sync")
+    def sync(user_id, payload, progress):
+        ran.append(payload["n"])
+
+    for n in range(3):
+        jobs.submit("sync", "u1", {"n": n})
+    job_worker._claim_loop("w", threading.Event(), poll_interval=0, max_jobs=2)
+    assert ran == [0, 1]
+    assert jobs.claim_next("w")["payload"] == {"n": 2}
+
+
+def test_cleanup_runs_once_the_job_is_finished_for_good():
+    cleaned = []
+
+    @jobs.job_handler("flaky", cleanup=lambda payload: cleaned.append(payload["n"]))
+    def flaky(user_id, payload, progress):
+        if payload["n"]:
+            raise RuntimeError("bank timeout")
+
+    jobs.submit("flaky", "u1", {"n": 0})
+    assert jobs.run_job(jobs.claim_next("w"))
+    assert cleaned == [0]
+
+    jobs.submit("flaky", "u1", {"n": 1}, max_attempts=2)
+    jobs.run_job(jobs.claim_next("w"))
+    assert cleaned == [0]  # Not between retries
+    jobs.run_job(jobs.claim_next("w"))
+    assert cleaned == [0, 1]
+
+    jobs.submit("flaky", "u1", {"n": 2}, max_attempts=1)
+    jobs.claim_next("dead-worker")
+    jobs.requeue_stale(stale_seconds=-1)
+    assert cleaned == [0, 1, 2]
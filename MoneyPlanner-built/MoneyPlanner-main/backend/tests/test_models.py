@@ -0,0 +1,103 @@
+"""Models: the generated to_dict/from_dict round-trip every field."""
+
+from dataclasses import MISSING, fields
+
+import pytest
+
+from models.auto_transfer import AutoTransfer, EscalationProposal
+from models.income import IncomeEvent, ManualIncomeLog
+from models.savings import ManualSavingsLog
+from models.transaction import Transaction
+from models.user_phase import Phase, UserPhaseState
+
+PROPOSAL = {
+    "id": "esc-1", "old_rate": 10.0, "new_rate": 12.5, "reason": "Income increased",
+    "status": "accepted", "created_at": "2024-02-01T09:00:00",
+}
+
+# One stored record per model, with every field set to a non-default value
+SAMPLES = {
+    EscalationProposal: PROPOSAL,
+    AutoTransfer: {
+        "id": "at-1", "user_id": "u1", "savings_rate_pct": 15.0, "destination": "tfsa",
+        "is_active": False, "pending_escalation": PROPOSAL,
+        "history": [{"action": "escalation_accepted", "old_rate": 10.0}], "created_at": "2024-01-01T00:00:00",
+    },
+    IncomeEvent: {
+        "id": "inc-1", "amount": 5200.0, "date": "2024-03-01", "source": "plaid",
+        "source_description": "Payroll", "is_recurring": True, "rolling_3mo_average": 5000.0,
+        "income_change_flag": "increase", "created_at": "2024-03-01T12:00:00",
+    },
+    ManualIncomeLog: {
+        "id": "mil-1", "amount": 300.0, "date": "2024-03-05", "source_description": "Gig",
+        "is_recurring": True, "created_at": "2024-03-05T08:00:00",
+    },
+    ManualSavingsLog: {
+        "id": "msl-1", "amount": 520.0, "date": "2024-03-02", "destination_description": "HISA",
+        "savings_rate_at_time": 0.12, "rate_adherence": 0.98, "created_at": "2024-03-02T08:00:00",
+    },
+    Transaction: {
+        "id": "tx-1", "transaction_id": "plaid-1", "date": "2024-03-03", "name": "COFFEE",
+        "merchant": "Cafe", "amount": 4.5, "category": "Food", "budget_category": "Dining",
+        "pending": True, "account_id": "acc-1", "pain_of_paying_flag": True,
+        "created_at": "2024-03-03T07:00:00",
+    },
+    UserPhaseState: {
+        "id": "ph-1", "user_id": "u1", "current_phase": Phase.FIRST_BUDGET.value,
+        "phase_entered_at": "2024-01-15T00:00:00", "history": [{"from": "observation"}],
+    },
+}
+
+MODELS = list(SAMPLES)
+
+
+@pytest.mark.parametrize("cls", MODELS, ids=lambda c: c.__name__)
+def test_sample_covers_every_field(cls):
+    assert set(SAMPLES[cls]) == {f.name for f in fields(cls)}
+
+
+@pytest.mark.parametrize("cls", MODELS, ids=lambda c: c.__name__)
+def test_round_trip_keeps_every_field(cls):
+    record = SAMPLES[cls]
+    loaded = cls.from_dict(record)
+    assert loaded.to_dict() == record
+    assert cls.from_dict(loaded.to_dict()).to_dict() == record
+
+
+@pytest.mark.parametrize("cls", MODELS, ids=lambda c: c.__name__)
+def test_unknown_keys_are_ignored(cls):
+    loaded = cls.from_dict({**SAMPLES[cls], "added_by_a_newer_version": 1})
+    assert loaded.to_dict() == SAMPLES[cls]
+    assert not hasattr(loaded, "added_by_a_newer_version")
+    assert not hasattr(loaded, "__dict__")  # Slotted
+
+
+@pytest.mark.parametrize("cls", MODELS, ids=lambda c: c.__name__)
+def test_missing_keys_load_defaults(cls):
+    loaded = cls.from_dict({}).to_dict()
+    derived = {"id", "transaction_id"} if cls is Transaction else set()  # Filled in by __post_init__
+    for f in fields(cls):
+        if f.name in derived:
+            assert loaded[f.name], f.name
+        elif f.default is not MISSING:
+            expected = f.metadata["to_dict"](f.default) if "to_dict" in f.metadata else f.default
+            assert loaded[f.name] == expected, f.name
+        elif f.default_factory is not MISSING:
+            fresh = f.default_factory()
+            assert type(loaded[f.name]) is type(fresh), f.name
+            if not isinstance(fresh, str):
+                assert loaded[f.name] == fresh, f.name
+        else:
+            assert loaded[f.name] == f.metadata["load_default"], f.name
+
+
+def test_constructed_instances_round_trip():
+    transfer = AutoTransfer(user_id="u1", pending_escalation=EscalationProposal(old_rate=10, new_rate=11))
+    assert AutoTransfer.from_dict(transfer.to_dict()).to_dict() == transfer.to_dict()
+    assert transfer.to_dict()["pending_escalation"]["new_rate"] == 11
+
+
+def test_post_init_runs_on_load():
+    assert Transaction.from_dict({"transaction_id": "plaid-9"}).id == "plaid-9"
+    assert Transaction.from_dict({"id": "only-id"}).transaction_id == "only-id"
+    assert UserPhaseState.from_dict({"current_phase": "first_budget"}).current_phase is Phase.FIRST_BUDGET
@@ -0,0 +1,104 @@
+"""Experiment outcomes: merged streaming statistics, and flushes that retry without duplicating."""
+
+import random
+import statistics
+import time
+import uuid
+
+import pytest
+
+from services import outcomes
+
+
+def _records(experiment_id: str, values) -> list[dict]:
+    return [
+        {"id": str(uuid.uuid4()), "experiment_id": experiment_id, "variant": "a", "metric": "m", "value": v}
+        for v in values
+    ]
+
+
+def test_chan_merge_matches_two_pass_statistics():
+    rng = random.Random(7)
+    values = [rng.gauss(1e6, 3.0) for _ in range(5000)]  # Large mean: naive sums lose precision
+    aggs = []
+    for part in (values[:1], values[1:1200], values[1200:]):
+        agg = [0, 0.0, 0.0]
+        for v in part:
+            outcomes._add(agg, v)
+        aggs.append(agg)
+    merged = outcomes._merge(outcomes._merge(aggs[0], aggs[1]), aggs[2])
+
+    summary = outcomes.summarize(merged)
+    assert summary["count"] == len(values)
+    assert summary["mean"] == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert summary["variance"] == pytest.approx(statistics.variance(values), rel=1e-9)
+    assert outcomes._merge([0, 0.0, 0.0], [0, 0.0, 0.0]) == [0, 0.0, 0.0]
+
+
+def test_flushed_stats_match_a_rebuild_from_the_log():
+    experiment_id = f"exp-{uuid.uuid4().hex}"
+    buffer = outcomes.OutcomeBuffer(flush_size=10**9)
+    values = [float(v) for v in range(100)]
+    for chunk in (values[:30], values[30:]):
+        for record in _records(experiment_id, chunk):
+            buffer.add(record)
+        buffer.flush()
+
+    streamed = outcomes.results(experiment_id)["a"]["m"]
+    outcomes.rebuild_stats()
+    rebuilt = outcomes.results(experiment_id)["a"]["m"]
+    assert streamed["count"] == rebuilt["count"] == 100
+    assert streamed["mean"] == pytest.approx(rebuilt["mean"])
+    assert streamed["variance"] == pytest.approx(statistics.variance(values))
+
+
+@pytest.mark.parametrize("error", [OSError("disk full"), TypeError("not JSON serializable")])
+@pytest.mark.parametrize("after_write", [False, True])
+def test_failed_flush_retry_is_idempotent(monkeypatch, after_write, error):
+    experiment_id = f"exp-{uuid.uuid4().hex}"
+    buffer = outcomes.OutcomeBuffer(flush_size=10**9)
+    for record in _records(experiment_id, [1.0, 2.0, 3.0]):
+        buffer.add(record)
+
+    save_one = outcomes.save_one
+
+    def failing_save(*args, **kwargs):
+        if after_write:
+            save_one(*args, **kwargs)  # Stats written, then the version bump fails
+        raise error
+
+    monkeypatch.setattr(outcomes, "save_one", failing_save)
+    assert buffer.flush() == 0
+    assert buffer.pending() == 3
+    monkeypatch.setattr(outcomes, "save_one", save_one)
+
+    for record in _records(experiment_id, [4.0]):
+        buffer.add(record)
+    assert buffer.flush() == 4
+    assert buffer.pending() == 0
+
+    assert outcomes.results(experiment_id)["a"]["m"]["count"] == 4
+    outcomes.rebuild_stats()
+    assert outcomes.results(experiment_id)["a"]["m"]["count"] == 4  # Each row logged once
+
+
+def test_flusher_survives_a_failed_flush(monkeypatch):
+    experiment_id = f"exp-{uuid.uuid4().hex}"
+    buffer = outcomes.OutcomeBuffer(flush_size=10**9, flush_seconds=0.01)
+    flush, calls = buffer.flush, []
+
+    def first_fails():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("stats file locked")
+        return flush()
+
+    monkeypatch.setattr(buffer, "flush", first_fails)
+    for record in _records(experiment_id, [1.0, 2.0]):
+        buffer.add(record)
+    deadline = time.monotonic() + 5
+    while buffer.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(calls) > 1
+    assert buffer.pending() == 0
+    assert outcomes.results(experiment_id)["a"]["m"]["count"] == 2
@@ -0,0 +1,181 @@
+"""Persistence: sharded user directories, filtered streaming reads, head pointers,
+keyed collections and streamed grouped writes."""
+
+import json
+import os
+import threading
+import uuid
+
+import pytest
+
+from services import persistence
+from services.persistence import (
+    DATA_DIR,
+    append_one,
+    collection_path,
+    get_versions,
+    iter_all,
+    iter_user_ids,
+    load_keyed,
+    load_latest,
+    load_one,
+    migrate_user,
+    mutate_keyed,
+    save_all,
+    shard_of,
+    user_dir,
+    write_json,
+    write_json_groups,
+)
+
+
+def _user() -> str:
+    return f"test-{uuid.uuid4().hex}"
+
+
+def test_users_live_in_their_hash_shard():
+    user_id = _user()
+    shard = shard_of(user_id)
+    assert shard == shard_of(user_id)
+    assert len(shard) == 5 and shard[2] == "/"
+    assert user_dir(user_id) == DATA_DIR / "_users" / shard / user_id
+    assert user_dir(persistence.SHARED_SCOPE) == DATA_DIR / persistence.SHARED_SCOPE
+
+
+def test_flat_layout_is_migrated_on_first_access():
+    user_id = _user()
+    (DATA_DIR / user_id).mkdir()
+    (DATA_DIR / user_id / "transactions.json").write_text('{"item": []}')
+    (DATA_DIR / f"budget_items_{user_id}.json").write_text('[{"id": "a"}]')
+
+    path = collection_path(user_id, "transactions")
+    assert json.loads(path.read_text()) == {"item": []}
+    assert json.loads(collection_path(user_id, "budget_items").read_text()) == [{"id": "a"}]
+    assert not (DATA_DIR / user_id).exists()
+    assert not (DATA_DIR / f"budget_items_{user_id}.json").exists()
+    assert migrate_user(user_id) is False  # Nothing left to move
+
+
+def test_iter_user_ids_finds_sharded_users():
+    users = {_user() for _ in range(5)}
+    for user_id in users:
+        user_dir(user_id)
+    assert users <= set(iter_user_ids())
+
+
+def test_iter_all_filters_before_hydrating():
+    user_id = _user()
+    save_all("events", [{"id": i, "date": f"2024-01-{i + 1:02d}", "kind": "ab"[i % 2]} for i in range(10)], user_id)
+    hydrated = []
+
+    def hydrate(d):
+        hydrated.append(d["id"])
+        return d["id"]
+
+    ids = list(iter_all("events", hydrate, user_id, since="2024-01-03", until="2024-01-08",
+                        where=lambda d: d["kind"] == "a"))
+    assert ids == [2, 4, 6]
+    assert hydrated == ids
+
+    assert list(iter_all("events", lambda d: d["id"], user_id, reverse=True, limit=2)) == [9, 8]
+    assert list(iter_all("events", lambda d: d["id"], user_id, limit=0)) == []
+    assert list(iter_all("missing", lambda d: d, user_id)) == []
+
+
+@pytest.mark.parametrize("n", [0, 1, persistence.HEAD_SIZE, persistence.HEAD_SIZE + 5])
+def test_load_latest_returns_the_newest_records(n):
+    user_id = _user()
+    save_all("events", [{"id": i, "note": "café", "tags": [], "nested": {"v": [i, None]}} for i in range(n)], user_id)
+    assert load_latest("events", lambda d: d["id"], user_id, n=3) == list(range(max(n - 3, 0), n))
+    assert load_latest("events", lambda d: d["id"], user_id, n=n + 1) == list(range(n))
+    append_one("events", {"id": "appended"}, user_id)
+    assert load_latest("events", lambda d: d["id"], user_id) == ["appended"]
+    assert load_one("events", lambda d: d["id"], user_id) == "appended"
+
+
+def test_load_latest_sees_writes_that_bypass_the_head():
+    user_id = _user()
+    save_all("events", [{"id": i} for i in range(20)], user_id)
+    assert load_latest("events", lambda d: d["id"], user_id) == [19]
+    collection_path(user_id, "events").write_text(json.dumps([{"id": "rewritten"}]))
+    assert load_latest("events", lambda d: d["id"], user_id) == ["rewritten"]
+    assert load_latest("missing", lambda d: d, user_id) == []
+
+
+def test_head_rejected_when_file_rewritten_with_same_stat():
+    user_id = _user()
+    records = [{"id": i, "amount": 10} for i in range(persistence.HEAD_SIZE + 4)]
+    save_all("events", records, user_id)
+    path = collection_path(user_id, "events")
+    st = os.stat(path)
+
+    records[-1]["amount"] = 99  # Same size, rewritten in place: same inode too
+    with open(path, "r+") as fh:
+        json.dump(records, fh, indent=2)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    after = os.stat(path)
+    assert (after.st_ino, after.st_size, after.st_mtime_ns) == (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    assert load_latest("events", lambda d: d, user_id)[0]["amount"] == 99
+    assert load_one("events", lambda d: d, user_id)["amount"] == 99
+
+
+def test_mutate_keyed_failure_writes_nothing():
+    user_id = _user()
+    mutate_keyed("items", lambda items: items.update(a={"id": "a", "n": 1}), user_id)
+    version = get_versions(user_id)["items"]
+
+    def fail(items):
+        items["a"]["n"] = 2
+        items["b"] = {"id": "b"}
+        raise ValueError("rejected")
+
+    with pytest.raises(ValueError):
+        mutate_keyed("items", fail, user_id)
+    assert load_keyed("items", user_id) == {"a": {"id": "a", "n": 1}}
+    assert get_versions(user_id)["items"] == version
+
+
+def test_mutate_keyed_batches_are_serialized():
+    user_id = _user()
+
+    def bump(items):
+        item = items.setdefault("counter", {"id": "counter", "n": 0})
+        item["n"] += 1
+
+    threads = [
+        threading.Thread(target=lambda: [mutate_keyed("items", bump, user_id) for _ in range(10)])
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert load_keyed("items", user_id)["counter"]["n"] == 40
+
+
+def test_list_shaped_files_load_keyed_by_id():
+    user_id = _user()
+    collection_path(user_id, "items").write_text(json.dumps([{"id": "a"}, {"id": "b"}, {"no_id": 1}]))
+    assert list(load_keyed("items", user_id)) == ["a", "b"]
+
+
+def test_write_json_groups_streams_generators(tmp_path):
+    path = tmp_path / "groups.json"
+    write_json_groups(path, {"a": ({"n": i} for i in range(3)), "b": [], "c": [{"n": 9}]})
+    assert json.loads(path.read_text()) == {"a": [{"n": 0}, {"n": 1}, {"n": 2}], "b": [], "c": [{"n": 9}]}
+
+
+def test_write_json_groups_failure_leaves_file_untouched(tmp_path):
+    path = tmp_path / "groups.json"
+    write_json(path, {"a": [{"n": 1}]})
+    before = path.read_bytes()
+
+    def failing():
+        yield {"n": 2}
+        raise RuntimeError("source went away")
+
+    with pytest.raises(RuntimeError):
+        write_json_groups(path, {"a": failing()})
+    assert path.read_bytes() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["groups.json"]  # No temp file left
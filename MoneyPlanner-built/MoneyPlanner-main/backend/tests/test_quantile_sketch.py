@@ -0,0 +1,31 @@
+"""Rate sketch: quantiles within a bin of the exact ones, and a lossless round trip."""
+
+import random
+import statistics
+
+import pytest
+
+from services.quantile_sketch import RateSketch
+
+
+def test_quantiles_match_the_exact_ones_within_a_bin():
+    rng = random.Random(3)
+    rates = [round(rng.uniform(0, 40), 2) for _ in range(500)] + [10.0] * 50
+    sketch = RateSketch()
+    for rate in rates + [99.0]:
+        sketch.add(rate)
+    sketch.remove(99.0)
+
+    exact = statistics.quantiles(rates, n=4, method="inclusive")
+    for q, value in zip((0.25, 0.5, 0.75), exact):
+        assert sketch.quantile(q) == pytest.approx(value, abs=RateSketch.BIN_WIDTH)
+    assert sketch.mean() == pytest.approx(statistics.fmean(rates))
+
+
+def test_round_trip_keeps_bin_sums():
+    sketch = RateSketch()
+    for rate in (5.0, 5.1, 12.0):
+        sketch.add(rate)
+    loaded = RateSketch.from_dict(sketch.to_dict())
+    assert loaded.to_dict() == sketch.to_dict()
+    assert loaded.quantile(0) == 5.05  # The mean of its bin, not the bin center
@@ -0,0 +1,28 @@
+"""Startup budget: `import app; app.create_app()` in a fresh interpreter (tools.import_profile)."""
+
+import statistics
+
+import pytest
+
+from tools import import_profile
+
+RUNS = 3
+
+
+@pytest.fixture(scope="module")
+def samples():
+    return [import_profile.run_once() for _ in range(RUNS)]
+
+
+def test_startup_within_budget(samples):
+    startup_ms = statistics.median(result["startup_ms"] for result, _ in samples)
+    assert startup_ms <= import_profile.STARTUP_BUDGET_MS, (
+        f"startup took {startup_ms:.0f} ms (median of {RUNS}), "
+        f"budget {import_profile.STARTUP_BUDGET_MS:g} ms; see python -m tools.import_profile"
+    )
+
+
+def test_heavy_sdks_load_lazily(samples):
+    result, _ = samples[-1]
+    eager = {m.split(".")[0] for m in result["modules"]} & set(import_profile.LAZY_MODULES)
+    assert not eager, f"imported during startup: {', '.join(sorted(eager))}"
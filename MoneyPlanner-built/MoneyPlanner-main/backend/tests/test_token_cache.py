@@ -0,0 +1,122 @@
+"""Token verifier against a local fake key set: cert caching, refetches and the claims cache."""
+
+import os
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+from services import token_cache
+from services.token_cache import ExpiredTokenError, InvalidTokenError, TokenVerifier
+
+PROJECT = "test-project"
+MAX_AGE = 3600
+
+
+def _key():
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public = private.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return crypt.RSASigner.from_string(pem), public.decode()
+
+
+class FakeGoogle:
+    """Serves the current key set like the certs endpoint, counting fetches."""
+
+    def __init__(self):
+        self.keys = {}
+        self.fetches = 0
+        self.rotate("key-1")
+
+    def rotate(self, kid: str):
+        self.keys[kid] = _key()
+        self.kid = kid
+
+    def __call__(self):
+        self.fetches += 1
+        return {kid: public for kid, (_, public) in self.keys.items()}, MAX_AGE
+
+    def token(self, sub: str = "user-42", kid: str | None = None, **claims) -> str:
+        # google.auth checks iat against the real clock; exp outlasts the fake one
+        kid = kid or self.kid
+        now = int(time.time())
+        payload = {
+            "iss": f"https://securetoken.google.com/{PROJECT}", "aud": PROJECT, "sub": sub,
+            "iat": now, "exp": now + 86400, "auth_time": now - 10, **claims,
+        }
+        return google_jwt.encode(self.keys[kid][0], payload, header={"kid": kid}).decode()
+
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def google():
+    return FakeGoogle()
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def verifier(google, clock):
+    verifier = TokenVerifier(PROJECT, cert_fetcher=google, clock=clock)
+    verifier._refresher_pid = os.getpid()  # No background refresher: the test drives the clock
+    return verifier
+
+
+def test_valid_token_verifies_and_claims_are_cached(verifier, google, clock):
+    token = google.token()
+    claims = verifier.verify(token)
+    assert claims["uid"] == "user-42"
+    assert verifier.verify(token) is claims
+    assert verifier.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    assert google.fetches == 1
+
+
+def test_certs_are_reused_within_max_age_then_refetched(verifier, google, clock):
+    verifier.verify(google.token(sub="a"))
+    clock.now += MAX_AGE - 60
+    verifier.verify(google.token(sub="b"))
+    assert google.fetches == 1
+
+    clock.now += 120  # Past max-age
+    verifier.verify(google.token(sub="c"))
+    assert google.fetches == 2
+
+
+def test_unknown_kid_triggers_a_refetch(verifier, google, clock):
+    verifier.verify(google.token())
+    google.rotate("key-2")
+    clock.now += token_cache.CERT_RETRY_SECONDS
+    assert verifier.verify(google.token(sub="rotated"))["uid"] == "rotated"
+    assert google.fetches == 2
+
+    stranger = FakeGoogle()
+    stranger.rotate("key-9")
+    with pytest.raises(InvalidTokenError, match="unknown key"):
+        verifier.verify(stranger.token())
+    assert google.fetches == 2  # Refetches for unknown keys are throttled
+
+
+def test_rejects_expired_and_foreign_tokens(verifier, google, clock):
+    with pytest.raises(ExpiredTokenError):
+        verifier.verify(google.token(exp=int(clock.now) - 1, iat=int(clock.now) - 60))
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(google.token(aud="someone-else"))
+    with pytest.raises(InvalidTokenError):
+        verifier.verify("not-a-token")
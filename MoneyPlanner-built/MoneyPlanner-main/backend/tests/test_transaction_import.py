@@ -0,0 +1,88 @@
+"""Transaction import: content duplicates are counted, so re-imports add nothing."""
+
+import uuid
+
+import app  # noqa: F401 — registers the import job handler
+from services import jobs
+from services.persistence import collection_path, read_json, write_json
+from services.transaction_import import IMPORT_ITEM, import_transactions
+
+HEADER = "Date,Description,Amount\n"
+COFFEE = "2024-03-01,Coffee Shop,-4.50\n"
+RENT = "2024-03-02,Rent,-1200.00\n"
+
+
+def _user() -> str:
+    return f"test-{uuid.uuid4().hex}"
+
+
+def _imported(user_id: str) -> list[dict]:
+    return read_json(collection_path(user_id, "transactions"))[IMPORT_ITEM]
+
+
+def test_identical_rows_in_one_file_all_import(tmp_path):
+    user_id = _user()
+    path = tmp_path / "march.csv"
+    path.write_text(HEADER + COFFEE + COFFEE + RENT)
+
+    summary = import_transactions(user_id, path)
+
+    assert (summary["added"], summary["duplicates"]) == (3, 0)
+    assert len({t["transaction_id"] for t in _imported(user_id)}) == 3
+    assert {t["amount"] for t in _imported(user_id)} == {4.5, 1200.0}  # Bank sign flipped to money-out
+
+
+def test_reimport_adds_nothing_and_extra_copies_are_counted(tmp_path):
+    user_id = _user()
+    path = tmp_path / "march.csv"
+    path.write_text(HEADER + COFFEE + COFFEE + RENT)
+    import_transactions(user_id, path)
+
+    again = import_transactions(user_id, path)
+    assert (again["added"], again["duplicates"]) == (0, 3)
+
+    path.write_text(HEADER + COFFEE + COFFEE + COFFEE + RENT)  # A third coffee that day
+    more = import_transactions(user_id, path, chunk_size=2)
+    assert (more["added"], more["duplicates"]) == (1, 3)
+    assert len(_imported(user_id)) == 4
+
+
+def test_rows_matching_synced_transactions_are_duplicates(tmp_path):
+    user_id = _user()
+    synced = {"transaction_id": "plaid-1", "date": "2024-03-02", "name": "RENT", "amount": 1200.0}
+    write_json(collection_path(user_id, "transactions"), {"item-1": [synced]})
+    path = tmp_path / "march.csv"
+    path.write_text(HEADER + COFFEE + RENT)
+
+    summary = import_transactions(user_id, path)
+
+    assert (summary["added"], summary["duplicates"]) == (1, 1)
+    stored = read_json(collection_path(user_id, "transactions"))
+    assert stored["item-1"] == [synced]
+    assert [t["name"] for t in stored[IMPORT_ITEM]] == ["Coffee Shop"]
+
+
+def test_bad_rows_are_counted_and_sampled(tmp_path):
+    user_id = _user()
+    path = tmp_path / "march.csv"
+    path.write_text(HEADER + COFFEE + "not a date,Thing,-1\n2024-03-04,,-2\n")
+
+    summary = import_transactions(user_id, path)
+
+    assert (summary["rows"], summary["added"], summary["errors"]) == (3, 1, 2)
+    assert [e["row"] for e in summary["error_samples"]] == [3, 4]
+
+
+def test_failed_import_job_deletes_its_upload_after_the_last_attempt(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOBS_DB", tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(jobs, "_initialized", False)
+    monkeypatch.setattr(jobs, "JOB_RETRY_BASE_SECONDS", 0)
+    upload = tmp_path / "upload.csv"
+    upload.write_text("Payee,Memo\nnot,a statement\n")
+
+    job = jobs.submit("transactions_import", _user(), {"path": str(upload)}, max_attempts=2)
+    assert jobs.run_job(jobs.claim_next("w")) is False
+    assert upload.exists()  # Kept for the retry
+    assert jobs.run_job(jobs.claim_next("w")) is False
+    assert jobs.get_job(job["id"])["status"] == jobs.FAILED
+    assert not upload.exists()
@@ -0,0 +1,51 @@
+"""View cache: entries are keyed by the versions of their inputs, within a byte budget."""
+
+import uuid
+
+from services.persistence import bump_version
+from services.view_cache import ViewCache
+
+
+def _user() -> str:
+    user_id = f"test-{uuid.uuid4().hex}"
+    bump_version("transactions", user_id)  # The first write also sets the user's version epoch
+    return user_id
+
+
+def test_invalidated_by_input_versions_only():
+    user_id = _user()
+    cache = ViewCache()
+    calls = []
+
+    def get():
+        return cache.get_or_compute(user_id, "view", ("transactions",), lambda: calls.append(1) or len(calls))
+
+    assert get() == 1
+    assert get() == 1
+    bump_version("budget_items", user_id)  # Not an input
+    assert get() == 1
+    bump_version("transactions", user_id)
+    assert get() == 2
+    assert cache.stats()["entries"] == 1  # The superseded entry was dropped
+    assert cache.stats()["views"]["view"]["hits"] == 2
+
+
+def test_extra_is_part_of_the_key():
+    user_id = _user()
+    cache = ViewCache()
+    assert cache.get_or_compute(user_id, "view", (), lambda: "monday", extra="2024-01-01") == "monday"
+    assert cache.get_or_compute(user_id, "view", (), lambda: "tuesday", extra="2024-01-02") == "tuesday"
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = ViewCache(max_bytes=250)
+    users = [_user() for _ in range(3)]
+    for user_id in users:
+        cache.get_or_compute(user_id, "view", (), lambda: "x" * 100)
+    stats = cache.stats()
+    assert stats["bytes"] <= 250
+    assert stats["entries"] == 2
+    assert stats["views"]["view"]["evictions"] == 1
+    calls = []
+    cache.get_or_compute(users[0], "view", (), lambda: calls.append(1) or "x" * 100)
+    assert calls  # The oldest entry was the one evicted
@@ -0,0 +1,99 @@
+"""Import-time profile and startup budget for the API process.
+
+Boots `import app; app.create_app()` in a fresh interpreter under
+`python -X importtime`, then reports per-package and per-module import cost:
+  cd backend && python -m tools.import_profile
+
+With --check it exits non-zero if startup exceeds the budget or a heavy SDK
+that should load lazily was imported during startup (use in CI/pre-deploy).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "500"))
+# Must not be imported by app startup; they load on first use
+LAZY_MODULES = ("plaid", "cryptography", "numpy", "openpyxl")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+app.create_app()
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"startup_ms": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def run_once() -> tuple[dict, list[tuple[str, int, int]]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return result, rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile API import/startup time")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to sample")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--check", action="store_true", help="Fail on budget/laziness regressions")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    args = parser.parse_args(argv)
+
+    samples = [run_once() for _ in range(args.runs)]
+    startup_ms = statistics.median(r["startup_ms"] for r, _ in samples)
+    result, rows = samples[-1]
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    packages = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[: args.top]
+    modules = sorted(rows, key=lambda r: r[2], reverse=True)[: args.top]
+    eager = sorted({m.split(".")[0] for m in result["modules"]} & set(LAZY_MODULES))
+
+    report = {
+        "startup_ms": round(startup_ms, 1),
+        "budget_ms": args.budget_ms,
+        "eagerly_imported": eager,
+        "packages_ms": {name: round(us / 1000, 1) for name, us in packages},
+        "modules_cumulative_ms": {name: round(cum / 1000, 1) for name, _, cum in modules},
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Startup (import app + create_app): {report['startup_ms']} ms "
+              f"(median of {args.runs}, budget {args.budget_ms:g} ms)")
+        print("\nSelf time by top-level package:")
+        for name, ms in report["packages_ms"].items():
+            print(f"  {ms:8.1f} ms  {name}")
+        print("\nCumulative time by module:")
+        for name, ms in report["modules_cumulative_ms"].items():
+            print(f"  {ms:8.1f} ms  {name}")
+        if eager:
+            print(f"\nLoaded eagerly (should be lazy): {', '.join(eager)}")
+
+    if args.check and (startup_ms > args.budget_ms or eager):
+        print("\nStartup budget check FAILED", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+"""Bulk transaction import — loads a bank export into a user's transaction store.
+
+  cd backend && python -m tools.import_transactions USER_ID statement.csv
+  python -m tools.import_transactions USER_ID export.ofx
+  python -m tools.import_transactions USER_ID history.xlsx --sign plaid --chunk-size 20000
+
+Progress goes to stderr; the summary (rows, added, duplicates, errors,
+categories) is printed as JSON. See services/transaction_import.py.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from services.transaction_import import CHUNK_SIZE, FORMATS, SIGNS, import_transactions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Import a CSV/OFX/XLSX bank export")
+    parser.add_argument("user_id")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, help="Default: from the file extension")
+    parser.add_argument("--sign", choices=SIGNS, default="bank",
+                        help="bank: negative amounts are spending (default); plaid: positive are")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def progress(fraction: float, message: str):
+        print(f"[{time.perf_counter() - start:7.1f}s] {fraction:6.1%}  {message}", file=sys.stderr)
+
+    try:
+        summary = import_transactions(args.user_id, args.path, args.format, sign=args.sign,
+                                      chunk_size=args.chunk_size, progress=progress)
+    except (OSError, ValueError) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
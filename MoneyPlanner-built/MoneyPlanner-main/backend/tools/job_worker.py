@@ -0,0 +1,126 @@
+"""Background job worker — runs queued jobs (Plaid sync, disconnect, weekly reviews).
+
+The gunicorn master starts and supervises one of these next to the web
+workers (gunicorn.conf.py, JOB_WORKERS_IN_WEB), so a single web service
+works its own queue. To run workers as a separate service instead, give it
+the same DATA_DIR volume, set JOB_WORKERS_IN_WEB=false on the web service
+and start:
+  cd backend && python -m tools.job_worker --processes 2
+
+Each process claims one job at a time from the SQLite queue
+(services/jobs.py), heartbeats while it runs and exits after its current
+job on SIGTERM/SIGINT. Maintenance (every MAINTENANCE_SECONDS) requeues
+jobs from lost workers, purges old jobs and exports, and queues the weekly
+review batch once each week closes. Processes also check in every
+HEARTBEAT_SECONDS so the web side knows a worker is there (jobs.live_workers).
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+HEARTBEAT_SECONDS = 30
+MAINTENANCE_SECONDS = 60
+
+
+def _work(poll_interval: float, max_jobs: int | None):
+    import app  # noqa: F401 — registers the job handlers
+    from services import jobs
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+
+    worker = f"{os.uname().nodename}:{os.getpid()}"
+
+    def check_in():
+        while not stopping.is_set():
+            jobs.worker_seen(worker)
+            stopping.wait(HEARTBEAT_SECONDS)
+
+    threading.Thread(target=check_in, daemon=True).start()
+    try:
+        _claim_loop(worker, stopping, poll_interval, max_jobs)
+    finally:
+        stopping.set()
+        jobs.worker_gone(worker)
+
+
+def _claim_loop(worker: str, stopping: threading.Event, poll_interval: float, max_jobs: int | None):
+    from services import jobs
+    from services.exports import purge_exports
+    from services.monitoring_service import schedule_weekly_reviews
+
+    done = 0
+    next_maintenance = 0.0
+    while not stopping.is_set() and (max_jobs is None or done < max_jobs):
+        if time.monotonic() >= next_maintenance:
+            requeued = jobs.requeue_stale()
+            if requeued:
+                print(f"[{worker}] requeued {requeued} stale job(s)")
+            jobs.purge_finished()
+            purge_exports()
+            if schedule_weekly_reviews():
+                print(f"[{worker}] queued the weekly review batch")
+            next_maintenance = time.monotonic() + MAINTENANCE_SECONDS
+
+        job = jobs.claim_next(worker)
+        if job is None:
+            stopping.wait(poll_interval)
+            continue
+
+        running = threading.Event()
+        running.set()
+
+        def beat(job_id=job["id"]):
+            while running.is_set():
+                time.sleep(HEARTBEAT_SECONDS)
+                if running.is_set():
+                    jobs.heartbeat(job_id)
+
+        threading.Thread(target=beat, daemon=True).start()
+        start = time.perf_counter()
+        try:
+            ok = jobs.run_job(job)
+        finally:
+            running.clear()
+        done += 1
+        print(f"[{worker}] {job['kind']} {job['id']} attempt {job['attempts']}: "
+              f"{'ok' if ok else 'failed'} in {time.perf_counter() - start:.2f}s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run background jobs")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("JOB_WORKERS", "2")))
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls when idle")
+    parser.add_argument("--max-jobs", type=int, help="Exit after this many jobs (per process)")
+    args = parser.parse_args(argv)
+
+    if args.processes <= 1:
+        _work(args.poll_interval, args.max_jobs)
+        return 0
+
+    procs = [
+        multiprocessing.Process(target=_work, args=(args.poll_interval, args.max_jobs))
+        for _ in range(args.processes)
+    ]
+    for p in procs:
+        p.start()
+
+    def forward(signum, _frame):
+        for p in procs:
+            if p.is_alive():
+                os.kill(p.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for p in procs:
+        p.join()
+    return max((p.exitcode or 0) for p in procs)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+"""Shard migration — moves flat-layout user data into the hashed layout.
+
+Safe to run while the app is serving (each move is a rename; the app also
+migrates any user it touches first). Idempotent:
+  cd backend && python -m tools.migrate_shards
+  python -m tools.migrate_shards --dry-run
+"""
+
+import argparse
+import json
+import os
+import re
+
+from services.persistence import DATA_DIR, LEGACY_FLAT_COLLECTIONS, migrate_user
+
+_FLAT_FILE = re.compile(rf"^({'|'.join(LEGACY_FLAT_COLLECTIONS)})_(.+)\.json$")
+
+
+def legacy_user_ids() -> set[str]:
+    """Users with a top-level directory or top-level per-user files."""
+    user_ids = set()
+    for entry in os.scandir(DATA_DIR):
+        if entry.name.startswith((".", "_")):
+            continue
+        if entry.is_dir():
+            user_ids.add(entry.name)
+        elif m := _FLAT_FILE.match(entry.name):
+            user_ids.add(m.group(2))
+    return user_ids
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Move user data into hashed shard directories")
+    parser.add_argument("--dry-run", action="store_true", help="Only list users still to migrate")
+    args = parser.parse_args(argv)
+
+    user_ids = sorted(legacy_user_ids())
+    if args.dry_run:
+        print(json.dumps({"pending": len(user_ids), "users": user_ids}, indent=2))
+        return 0
+
+    migrated = 0
+    errors = {}
+    for user_id in user_ids:
+        try:
+            migrated += migrate_user(user_id)
+        except OSError as e:
+            errors[user_id] = str(e)
+    print(json.dumps({"users": len(user_ids), "migrated": migrated, "errors": errors}, indent=2))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
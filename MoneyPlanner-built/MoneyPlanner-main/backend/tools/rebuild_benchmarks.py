@@ -0,0 +1,13 @@
+"""Rebuild peer-benchmark sketches from every opted-in user's config.
+
+Sketches are maintained incrementally on each rate change; this full scan is
+only for backfilling existing users or repairing drift:
+  cd backend && python -m tools.rebuild_benchmarks
+"""
+
+import json
+
+from services.accountability_service import rebuild_peer_sketches
+
+if __name__ == "__main__":
+    print(json.dumps(rebuild_peer_sketches(), indent=2))
@@ -0,0 +1,34 @@
+"""Weekly review batch — precomputes every user's review for the last completed week.
+
+The job worker queues this batch itself once each week closes
+(monitoring_service.schedule_weekly_reviews); run it by hand to backfill a
+week or rebuild reviews (--force keeps their ids and acknowledgements):
+  cd backend && python -m tools.weekly_reviews
+"""
+
+import argparse
+import json
+
+from services.monitoring_service import generate_weekly_reviews
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate weekly reviews for all users")
+    parser.add_argument("--week-ending", help="YYYY-MM-DD (default: last completed week)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--user", action="append", dest="users", help="Limit to user id(s)")
+    parser.add_argument("--force", action="store_true", help="Rebuild existing reviews")
+    args = parser.parse_args(argv)
+
+    result = generate_weekly_reviews(
+        user_ids=args.users,
+        week_ending=args.week_ending,
+        max_workers=args.workers,
+        force=args.force,
+    )
+    print(json.dumps(result, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())